@@ -0,0 +1,115 @@
+from PySide6.QtCore import QObject, Signal, QByteArray, QCoreApplication, QCommandLineParser, QCommandLineOption
+from datetime import datetime
+import sys
+import time
+import random
+import typing
+
+from multiserialviewer.serial_data.serialDataProcessor import SerialDataProcessor
+
+
+class ByteLoopProcessor(QObject):
+    """ Previous implementation of SerialDataProcessor.handleRawData, which processes the data byte by byte. """
+    signal_asciiDataAvailable: Signal = Signal(str)
+    signal_deleteLine: Signal = Signal()
+    signal_numberOfNonPrintableChars: Signal = Signal(int)
+
+    def __init__(self, convertToHex: bool, backspaceDeletesLastLine: bool, insertTimestamp: bool, timestampFormat: str):
+        super(ByteLoopProcessor, self).__init__()
+        self.convertToHex = convertToHex
+        self.backspaceDeletesLastLine = backspaceDeletesLastLine
+        self.insertTimestamp = insertTimestamp
+        self.timestampFormat = timestampFormat
+        self.lastReceivedChar = None
+
+    def handleRawData(self, rxTime: datetime, rawData: QByteArray):
+        nonPrintableCharsCount = 0
+        asciiData: str = ''
+        for b in rawData.data():
+            if self.insertTimestamp:
+                if self.lastReceivedChar is not None and (self.lastReceivedChar == 0x0D or self.lastReceivedChar == 0x0A):
+                    asciiData += rxTime.strftime(self.timestampFormat)
+                self.lastReceivedChar = b
+
+            if 32 <= b <= 126 or b == 0x0D or b == 0x0A:
+                asciiData += chr(b)
+            elif self.backspaceDeletesLastLine and b == 0x08:
+                if len(asciiData) > 0:
+                    self.signal_asciiDataAvailable.emit(asciiData)
+                    asciiData = ''
+                self.signal_deleteLine.emit()
+            elif self.convertToHex:
+                nonPrintableCharsCount += 1
+                asciiData += f'[{b:02X}]'
+
+        if len(asciiData) > 0:
+            self.signal_asciiDataAvailable.emit(asciiData)
+        if nonPrintableCharsCount > 0:
+            self.signal_numberOfNonPrintableChars.emit(nonPrintableCharsCount)
+
+
+def createCorpus(chunkSize: int, chunkCount: int) -> list[QByteArray]:
+    rng = random.Random(1)
+    lines = [b'temperature: 25\n', b'voltage=3300mV\r\n', b'adc value: 123\n', b'ERROR: 77\n',
+             b'Some text with a rather long line, as it is typical for log output of a MCU\n',
+             b'\x00\x01\x02\x03\n', b'Progress 10%\b']
+    data = b''.join(rng.choice(lines) for _ in range(chunkSize * chunkCount // 10))
+    return [QByteArray(data[i:i + chunkSize]) for i in range(0, chunkSize * chunkCount, chunkSize)]
+
+
+def connectReceivers(processor: SerialDataProcessor | ByteLoopProcessor):
+    processor.signal_asciiDataAvailable.connect(lambda text: None)
+    processor.signal_deleteLine.connect(lambda: None)
+    processor.signal_numberOfNonPrintableChars.connect(lambda count: None)
+
+
+def measure(corpus: list[QByteArray], handleRawData: typing.Callable) -> float:
+    rxTime = datetime.now()
+    start = time.perf_counter()
+    for chunk in corpus:
+        handleRawData(rxTime, chunk)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    app = QCoreApplication(sys.argv)
+
+    parser = QCommandLineParser()
+    parser.setApplicationDescription("Compares the throughput of SerialDataProcessor with the previous byte loop")
+    parser.addHelpOption()
+    chunkSizeOption = QCommandLineOption(["chunk-size"], "Number of bytes per received chunk", "bytes", "1024")
+    chunkCountOption = QCommandLineOption(["chunk-count"], "Number of chunks to process", "count", "2000")
+    parser.addOption(chunkSizeOption)
+    parser.addOption(chunkCountOption)
+    parser.process(app)
+
+    corpus = createCorpus(int(parser.value(chunkSizeOption)), int(parser.value(chunkCountOption)))
+    corpusSize = sum(chunk.size() for chunk in corpus)
+    print(f'{len(corpus)} chunks, {corpusSize / 1e6:.1f} MB')
+    print(f'{"hex":>5} {"bs":>5} {"time":>5} | {"byte loop":>12} | {"processor":>12} | speedup')
+
+    for convertToHex in [False, True]:
+        for backspaceDeletesLastLine in [False, True]:
+            for insertTimestamp in [False, True]:
+                timestampFormat = '[%H:%M:%S.%f] '
+                loop = ByteLoopProcessor(convertToHex, backspaceDeletesLastLine, insertTimestamp, timestampFormat)
+                connectReceivers(loop)
+                durationLoop = measure(corpus, loop.handleRawData)
+
+                processor = SerialDataProcessor()
+                processor.setConvertNonPrintableCharsToHex(convertToHex)
+                processor.setBackspaceDeletesLastLine(backspaceDeletesLastLine)
+                processor.setShowTimestampAtLineStart(insertTimestamp, timestampFormat)
+                connectReceivers(processor)
+                durationProcessor = measure(corpus, processor.handleRawData)
+
+                print(f'{convertToHex:>5} {backspaceDeletesLastLine:>5} {insertTimestamp:>5} | '
+                      f'{corpusSize / durationLoop / 1e6:>7.2f} MB/s | '
+                      f'{corpusSize / durationProcessor / 1e6:>7.2f} MB/s | '
+                      f'{durationLoop / durationProcessor:>6.1f}x')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PySide6.QtCore import QTimer, Qt
+from PySide6.QtGui import QTextCursor
+from PySide6.QtWidgets import QApplication
+
+from multiserialviewer.application.serialViewerController import SerialViewerController
+from multiserialviewer.gui_viewer.serialViewerWindow import SerialViewerWindow
+from multiserialviewer.icons.iconSet import IconSet
+from multiserialviewer.settings.applicationSettings import ApplicationSettings
+from multiserialviewer.settings.serialViewerSettings import SerialViewerSettings
+from multiserialviewer.settings.watchSettings import WatchSettings
+from multiserialviewer.settings.counterSettings import CounterSettings
+
+
+MARKER = re.compile(r'~(\d+)~')
+
+
+class DisplayedLatency:
+    """ Collects the latency from sending a line (marker '~<send time in ns>~') until it is in the document of the view """
+
+    def __init__(self, view: SerialViewerWindow):
+        self.latenciesMs: list[float] = []
+        self.document = view.textEdit.document()
+        self.document.contentsChange.connect(self.handleContentsChange)
+
+    def handleContentsChange(self, position: int, charsRemoved: int, charsAdded: int):
+        if charsAdded <= 0:
+            return
+        now = time.time_ns()
+        cursor = QTextCursor(self.document)
+        cursor.setPosition(position)
+        cursor.setPosition(min(position + charsAdded, self.document.characterCount() - 1),
+                           QTextCursor.MoveMode.KeepAnchor)
+        for sendTime in MARKER.findall(cursor.selectedText()):
+            self.latenciesMs.append((now - int(sendTime)) / 1e6)
+
+
+class ReceivedBytes:
+    def __init__(self):
+        self.count: int = 0
+
+    def handleRawData(self, rxTime, rawData):
+        self.count += rawData.size()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if len(values) == 0:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Runs serial viewers on pseudo terminals fed by loadGenerator.py '
+                                                 'and reports throughput, latency and lost data.')
+    parser.add_argument('--ports', type=int, default=4, help='number of simultaneous ports')
+    parser.add_argument('--mix', default='mixed', help='traffic mix of loadGenerator.py')
+    parser.add_argument('--line-rate', type=int, help='lines per second and port')
+    parser.add_argument('--line-length', type=int, help='bytes per line')
+    parser.add_argument('--duration', type=float, default=5, help='seconds of generated traffic')
+    parser.add_argument('--offscreen', action='store_true', help='do not show windows (e.g. in CI)')
+    parser.add_argument('--max-p99-ms', type=float, help='fail if the p99 rx-to-screen latency is higher')
+    parser.add_argument('--fail-on-loss', action='store_true', help='fail if bytes are overflowed or lost')
+    args = parser.parse_args()
+
+    if args.offscreen:
+        os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+    app = QApplication(sys.argv[:1])
+
+    generatorCommand = [sys.executable, str(Path(__file__).with_name('loadGenerator.py')), '--wait-for-start',
+                        '--ports', str(args.ports), '--mix', args.mix, '--duration', str(args.duration)]
+    if args.line_rate is not None:
+        generatorCommand += ['--line-rate', str(args.line_rate)]
+    if args.line_length is not None:
+        generatorCommand += ['--line-length', str(args.line_length)]
+    generator = subprocess.Popen(generatorCommand, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    portNames = json.loads(generator.stdout.readline())['ports']
+
+    settingsApplication = ApplicationSettings()
+    settingsApplication.showNonPrintableCharsAsHex = True
+    settingsApplication.backspaceDeletesLastLine = True
+    settingsApplication.showTimestamp = True
+    settingsApplication.timestampFormat = ApplicationSettings.DEFAULT_TIMESTAMP_FORMAT
+
+    iconSet = IconSet('google', '434343')
+    logDir = tempfile.mkdtemp()
+    controllers = []
+    latencies = []
+    receivedBytes = []
+    for portName in portNames:
+        settings = SerialViewerSettings()
+        settings.connection.portName = portName
+        settings.connection.baudrate = 1000000
+        settings.watches = [WatchSettings('temp', '', WatchSettings.VariableType.number, r'(-?\d+\.\d)'),
+                            WatchSettings('state', 'on off idle', WatchSettings.VariableType.word, r'(\w+)'),
+                            WatchSettings('myValue', '', WatchSettings.VariableType.number, r'(-?\d+\.\d+)')]
+        settings.counters = [CounterSettings('ERROR')]
+        view = SerialViewerWindow(portName, iconSet)
+        view.resize(800, 600)
+        view.show()
+        ctrl = SerialViewerController(settings, settingsApplication, view, logDir)
+        latencies.append(DisplayedLatency(view))
+        received = ReceivedBytes()
+        ctrl.receiver.signal_rawDataAvailable.connect(received.handleRawData, type=Qt.ConnectionType.DirectConnection)
+        receivedBytes.append(received)
+        if not ctrl.startCapture():
+            print(f'Failed to open {portName}')
+            return 1
+        controllers.append(ctrl)
+
+    def stopCapture():
+        # the views are deleted when the application quits (they are closed)
+        for controller in controllers:
+            controller.stopCapture()
+            controller.destruct()
+        app.quit()
+
+    startTime = time.monotonic()
+    generator.stdin.write('start\n')
+    generator.stdin.flush()
+    # let the viewers display the remaining data after the generator finished
+    QTimer.singleShot(int((args.duration + 1) * 1000), stopCapture)
+    app.exec()
+    duration = time.monotonic() - startTime
+
+    generatorResult = json.loads(generator.stdout.readline())
+    generator.stdin.write('stop\n')
+    generator.stdin.flush()
+    generator.wait()
+
+    print(f'{args.ports} ports, mix {args.mix}, {args.duration} s')
+    print(f'{"port":<14} {"rx kB/s":>9} {"p50 ms":>8} {"p90 ms":>8} {"p99 ms":>8} {"max ms":>8} {"overflowed":>11} {"lost":>8}')
+    allLatencies = []
+    overflowedTotal = 0
+    lostTotal = 0
+    for index, portName in enumerate(portNames):
+        values = latencies[index].latenciesMs
+        allLatencies += values
+        overflowed = generatorResult['overflowedBytes'][index]
+        lost = generatorResult['writtenBytes'][index] - receivedBytes[index].count
+        overflowedTotal += overflowed
+        lostTotal += lost
+        print(f'{portName:<14} {receivedBytes[index].count / args.duration / 1000:>9.1f} '
+              f'{percentile(values, 0.5):>8.1f} {percentile(values, 0.9):>8.1f} {percentile(values, 0.99):>8.1f} '
+              f'{max(values, default=float("nan")):>8.1f} {overflowed:>11} {lost:>8}')
+    p99 = percentile(allLatencies, 0.99)
+    print(f'{"all":<14} {sum(r.count for r in receivedBytes) / args.duration / 1000:>9.1f} '
+          f'{percentile(allLatencies, 0.5):>8.1f} {percentile(allLatencies, 0.9):>8.1f} {p99:>8.1f} '
+          f'{max(allLatencies, default=float("nan")):>8.1f} {overflowedTotal:>11} {lostTotal:>8}')
+    print(f'{len(allLatencies)} displayed lines measured in {duration:.1f} s')
+
+    if args.fail_on_loss and (overflowedTotal > 0 or lostTotal > 0):
+        return 1
+    if args.max_p99_ms is not None and not p99 <= args.max_p99_ms:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
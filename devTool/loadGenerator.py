@@ -0,0 +1,163 @@
+import json
+import math
+import os
+import random
+import sys
+import time
+import argparse
+
+
+class TrafficMix:
+    """ Describes the generated traffic of one port.
+
+    Every line starts with a marker '~<send time in ns>~ ', which is used to measure the latency
+    until the line is displayed (see benchmarkEndToEnd.py).
+    """
+    def __init__(self, name: str, lineRate: int, lineLength: int,
+                 watchRatio: float = 0.0, noiseRatio: float = 0.0, backspaceRatio: float = 0.0,
+                 sineRatio: float = 0.0):
+        self.name: str = name
+        self.lineRate: int = lineRate  # lines per second
+        self.lineLength: int = lineLength
+        self.watchRatio: float = watchRatio
+        self.noiseRatio: float = noiseRatio
+        self.backspaceRatio: float = backspaceRatio
+        self.sineRatio: float = sineRatio  # 'myValue: <sine wave>' lines (e.g. for the plot)
+
+
+MIXES = {
+    'text': TrafficMix('text', lineRate=1000, lineLength=80),
+    'watch': TrafficMix('watch', lineRate=2000, lineLength=30, watchRatio=0.8),
+    'noise': TrafficMix('noise', lineRate=1000, lineLength=80, noiseRatio=0.2),
+    'backspace': TrafficMix('backspace', lineRate=1000, lineLength=60, backspaceRatio=0.2),
+    'sine': TrafficMix('sine', lineRate=1000, lineLength=30, sineRatio=1.0),
+    'mixed': TrafficMix('mixed', lineRate=1000, lineLength=60, watchRatio=0.3, noiseRatio=0.05, backspaceRatio=0.05),
+}
+
+# control characters except backspace, line feed and carriage return
+NOISE_BYTES = bytes(b for b in range(32) if b not in (0x08, 0x0A, 0x0D))
+SINE_PERIOD_S = 5.0
+
+
+def createLine(rng: random.Random, mix: TrafficMix) -> bytes:
+    marker = f'~{time.time_ns()}~ '.encode()
+    kind = rng.random()
+    if kind < mix.watchRatio:
+        if rng.random() < 0.5:
+            body = f'temp: {rng.uniform(-20, 80):.1f}'.encode()
+        else:
+            body = f'state: {rng.choice(["on", "off", "idle"])}'.encode()
+        return marker + body + b'\n'
+    kind -= mix.watchRatio
+    if kind < mix.noiseRatio:
+        return marker + bytes(rng.choice(NOISE_BYTES) for _ in range(max(1, mix.lineLength // 4))) + b'\n'
+    kind -= mix.noiseRatio
+    if kind < mix.backspaceRatio:
+        # progress output, which is replaced by the next line
+        return marker + f'Progress {rng.randrange(100)}%'.encode() + b'\b'
+    kind -= mix.backspaceRatio
+    if kind < mix.sineRatio:
+        value = 100 * math.sin(2 * math.pi * time.monotonic() / SINE_PERIOD_S) + rng.uniform(-5, 5)
+        return marker + f'myValue: {value:.3f}'.encode() + b'\n'
+
+    text = b'Log message ERROR ' if rng.random() < 0.05 else b'Log message '
+    filler = b'abcdefghijklmnopqrstuvwxyz0123456789 ' * (mix.lineLength // 37 + 1)
+    return marker + (text + filler)[:max(0, mix.lineLength - len(marker) - 1)] + b'\n'
+
+
+class PtyLoadGenerator:
+    """ Creates pseudo terminal pairs and writes generated lines to them (Linux/macOS only).
+
+    The serial viewer opens the slave side (see getPortNames). The master side is written without
+    blocking: if the pty buffer is full (the reader cannot keep up), the line is counted as overflowed.
+    """
+    def __init__(self, portCount: int, mix: TrafficMix, seed: int = 1):
+        import pty
+        import tty
+
+        self.mix: TrafficMix = mix
+        self.rng: random.Random = random.Random(seed)
+        self.masters: list[int] = []
+        self.slaves: list[int] = []
+        for _ in range(portCount):
+            master, slave = pty.openpty()
+            tty.setraw(slave)
+            os.set_blocking(master, False)
+            self.masters.append(master)
+            self.slaves.append(slave)
+
+        self.writtenBytes: list[int] = [0] * portCount
+        self.overflowedBytes: list[int] = [0] * portCount
+        self.generatedLines: list[int] = [0] * portCount
+
+    def getPortNames(self) -> list[str]:
+        return [os.ttyname(slave) for slave in self.slaves]
+
+    def __write(self, index: int, data: bytes):
+        try:
+            written = os.write(self.masters[index], data)
+        except BlockingIOError:
+            written = 0
+        self.writtenBytes[index] += written
+        self.overflowedBytes[index] += len(data) - written
+        self.generatedLines[index] += 1
+
+    def run(self, durationS: float):
+        """ Writes lines with mix.lineRate to every port (until durationS elapsed or forever, if durationS <= 0) """
+        startTime = time.monotonic()
+        while durationS <= 0 or time.monotonic() - startTime < durationS:
+            dueLines = int((time.monotonic() - startTime) * self.mix.lineRate)
+            for index in range(len(self.masters)):
+                while self.generatedLines[index] < dueLines:
+                    self.__write(index, createLine(self.rng, self.mix))
+            time.sleep(0.001)
+
+    def getResult(self) -> dict:
+        return {'writtenBytes': self.writtenBytes, 'overflowedBytes': self.overflowedBytes}
+
+    def close(self):
+        for fd in self.masters + self.slaves:
+            os.close(fd)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Writes generated serial traffic to pseudo terminals. '
+                                                 'Open the printed ports in MultiSerialViewer.')
+    parser.add_argument('--ports', type=int, default=1, help='number of pseudo terminals')
+    parser.add_argument('--mix', choices=MIXES.keys(), default='mixed', help='traffic mix')
+    parser.add_argument('--line-rate', type=int, help='lines per second and port (overrides the mix)')
+    parser.add_argument('--line-length', type=int, help='bytes per line (overrides the mix)')
+    parser.add_argument('--duration', type=float, default=0, help='seconds (0: until Ctrl+C)')
+    parser.add_argument('--wait-for-start', action='store_true',
+                        help='print the ports as JSON, wait for a line on stdin and print the result as JSON')
+    args = parser.parse_args()
+
+    mix = MIXES[args.mix]
+    if args.line_rate is not None:
+        mix.lineRate = args.line_rate
+    if args.line_length is not None:
+        mix.lineLength = args.line_length
+
+    generator = PtyLoadGenerator(args.ports, mix)
+    if args.wait_for_start:
+        print(json.dumps({'ports': generator.getPortNames()}), flush=True)
+        sys.stdin.readline()
+    else:
+        print('\n'.join(generator.getPortNames()), flush=True)
+
+    try:
+        generator.run(args.duration)
+    except KeyboardInterrupt:
+        pass
+    if args.wait_for_start:
+        print(json.dumps(generator.getResult()), flush=True)
+        # keep the ptys open until the reader has received everything
+        sys.stdin.readline()
+    else:
+        print(generator.getResult())
+    generator.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,25 @@
 import sys
+import argparse
 from multiserialviewer import __version__
 from multiserialviewer.application.application import Application
 
 
+def parseArguments(arguments: list[str]) -> tuple[argparse.Namespace, list[str]]:
+    parser = argparse.ArgumentParser(prog='multiserialviewer')
+    parser.add_argument('--replay', metavar='FILE', action='append', default=[],
+                        help='replay a raw data recording (.msvraw) in a serial viewer (can be repeated)')
+    parser.add_argument('--replay-speed', metavar='FACTOR', type=float, default=1.0,
+                        help='replay speed (1: recorded timing, N: N times faster, 0: as fast as possible)')
+    args, qtArguments = parser.parse_known_args(arguments[1:])
+    if args.replay_speed < 0:
+        parser.error('--replay-speed must not be negative')
+    return args, arguments[:1] + qtArguments
+
+
 def main() -> int | str:
+    args, qtArguments = parseArguments(sys.argv)
     Application.setApplicationAttributes()
-    app = Application(__version__, sys.argv)
+    app = Application(__version__, qtArguments, replayFiles=args.replay, replaySpeed=args.replay_speed)
     return app.exec()
 
 
@@ -1,7 +1,8 @@
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Slot, Qt
 from PySide6.QtGui import QGuiApplication
-from platformdirs import user_config_dir
+from platformdirs import user_config_dir, user_log_dir
+from pathlib import PurePath
 import copy
 
 from multiserialviewer.application.serialViewerController import SerialViewerController
@@ -13,20 +14,28 @@ from multiserialviewer.settings.settings import Settings
 from multiserialviewer.settings.serialConnectionSettings import SerialConnectionSettings
 from multiserialviewer.settings.textHighlighterSettings import TextHighlighterSettings
 from multiserialviewer.settings.serialViewerSettings import SerialViewerSettings
+from multiserialviewer.serial_data.rawDataReplaySource import RawDataReplaySource
 
 
 class Application(QApplication):
     NAME = 'MultiSerialViewer'
 
-    def __init__(self, version: str, arguments):
+    # recordings do not contain the baudrate (only used for the bandwidth statistics of a replay)
+    REPLAY_BAUDRATE = 115200
+
+    def __init__(self, version: str, arguments, replayFiles: list[str] | None = None, replaySpeed: float = 1.0):
         super().__init__(arguments)
 
         self.configDir = user_config_dir(appname=Application.NAME, roaming=False, ensure_exists=True, appauthor=False)
         self.settings: Settings = Settings(self.configDir)
         self.settings.loadSettings()
+        # lines removed from the serial viewers and raw data recordings are written to this directory (if enabled)
+        self.logDir = user_log_dir(appname=Application.NAME, ensure_exists=True, appauthor=False)
 
         self.captureActive: bool = False
         self.controllerPool: SerialViewerControllerPool = SerialViewerControllerPool()
+        self.controllerPool.signal_captureStarted.connect(self.handleCaptureStarted)
+        self.controllerPool.signal_startCaptureFinished.connect(self.handleStartCaptureFinished)
 
         colorScheme: Qt.ColorScheme = QGuiApplication.styleHints().colorScheme()
         if colorScheme == Qt.ColorScheme.Dark:
@@ -49,6 +58,8 @@ class Application(QApplication):
         self.initMainWindow()
         self.initSerialViewer()
         self.initCaptureState()
+        for filePath in replayFiles or []:
+            self.createReplayViewer(filePath, replaySpeed)
 
         self.setStyle(ProxyStyle())
         self.mainWindow.show()
@@ -101,8 +112,20 @@ class Application(QApplication):
         self.controllerPool.setHighlighterSettings(self.settings.textHighlighter.entries)
         self.controllerPool.setApplicationSettings(self.settings.application.values)
 
+    def createReplayViewer(self, filePath: str, speed: float):
+        settings = SerialViewerSettings()
+        settings.title = f'Replay {PurePath(filePath).name}'
+        settings.connection.portName = filePath
+        settings.connection.baudrate = Application.REPLAY_BAUDRATE
+
+        ctrl = self.createSerialViewer(settings, RawDataReplaySource(settings.connection, filePath, speed))
+        if not self.captureActive:
+            # the result is handled in handleCaptureStarted
+            ctrl.requestStartCapture()
+
     @Slot(SerialViewerSettings)
-    def createSerialViewer(self, settings: SerialViewerSettings):
+    def createSerialViewer(self, settings: SerialViewerSettings,
+                           receiver: RawDataReplaySource | None = None) -> SerialViewerController:
         if settings.connection.portName in self.controllerPool.getUsedPorts():
             raise Exception(f"{settings.connection.portName} exists already")
 
@@ -114,13 +137,14 @@ class Application(QApplication):
                                                         currentTabName=settings.currentTabName)
         view.setSerialViewerSettings(settings)
 
-        ctrl = SerialViewerController(settings, self.settings.application.values, view)
+        ctrl = SerialViewerController(settings, self.settings.application.values, view, self.logDir, receiver)
         ctrl.signal_deleteController.connect(self.controllerPool.deleteController, type=Qt.ConnectionType.QueuedConnection)
         self.controllerPool.add(ctrl)
 
         if self.captureActive:
-            if not ctrl.startCapture():
-                self.stopCapture()
+            # the result is handled in handleCaptureStarted (allOrNothing only applies to the start of all ports)
+            ctrl.requestStartCapture()
+        return ctrl
 
     @Slot()
     def clearAll(self):
@@ -134,10 +158,18 @@ class Application(QApplication):
             self.startCapture()
 
     def startCapture(self):
-        if self.controllerPool.startCapture():
-            self.captureActive = True
-            self.mainWindow.updateCaptureButton(self.captureActive)
-        else:
+        # the ports are opened concurrently, the result is handled in handleStartCaptureFinished
+        self.captureActive = True
+        self.mainWindow.updateCaptureButton(self.captureActive)
+        self.controllerPool.startCapture(self.settings.application.values.startCaptureAllOrNothing)
+
+    @Slot(str, bool)
+    def handleCaptureStarted(self, portName: str, opened: bool):
+        self.mainWindow.showCapturePortResult(portName, opened, self.controllerPool.getPendingPortCount())
+
+    @Slot(bool)
+    def handleStartCaptureFinished(self, captureActive: bool):
+        if self.captureActive and not captureActive:
             self.stopCapture()
 
     @Slot()
@@ -156,6 +188,9 @@ class Application(QApplication):
 
         ctrl: SerialViewerController
         for ctrl in self.controllerPool.entries():
+            if isinstance(ctrl.receiver, RawDataReplaySource):
+                # replays are started from the command line
+                continue
             settings = SerialViewerSettings()
             settings.title = ctrl.view.windowTitle()
             settings.size = ctrl.view.size()
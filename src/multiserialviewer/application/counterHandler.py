@@ -1,40 +1,128 @@
-from PySide6.QtCore import QObject, Slot
+import typing
+
+from PySide6.QtCore import QObject, Slot, Signal, QTimer, QMetaObject, Qt, QThread
 
 from multiserialviewer.settings.counterSettings import CounterSettings
-from multiserialviewer.serial_data.streamingTextExtractor import StreamingTextExtractor
-from multiserialviewer.serial_data.serialDataProcessor import SerialDataProcessor
-from multiserialviewer.application.counterTableModel import CounterTableModel
+from multiserialviewer.serial_data.streamingMatchEngine import StreamingMatchEngine, StreamingPattern
+from multiserialviewer.application.counterTableModel import CounterTableModel, CounterEntry
+from multiserialviewer.application.entryRegistry import EntryRegistry
 
 
 class CounterHandler(QObject):
-    def __init__(self, settings: list[CounterSettings], dataSource: SerialDataProcessor):
+    """ Counts the matches of the counters in the data processing thread.
+
+    Like WatchHandler, the counted values are published as immutable snapshots (CounterRow) to the
+    CounterTableModel in the GUI thread at most every PUBLISH_INTERVAL_MS. The counters can be created and
+    removed from any thread.
+    """
+    signal_rowsChanged: Signal = Signal(object)
+    # see __callInHandlerThread
+    signal_call: Signal = Signal(object)
+
+    PUBLISH_INTERVAL_MS = 100
+
+    def __init__(self, settings: list[CounterSettings], matchEngine: StreamingMatchEngine):
         super().__init__()
-        self.dataSource: SerialDataProcessor = dataSource
-        self.textExtractors: list[StreamingTextExtractor] = []
+        self.matchEngine: StreamingMatchEngine = matchEngine
+        # the key of a counter is its pattern (see EntryRegistry)
+        self.entries: EntryRegistry = EntryRegistry()
+        self.textExtractors: dict[int, StreamingPattern] = {}
+
+        self.__dirty: bool = False
+        self.__publishTimer: QTimer = QTimer(self)
+        self.__publishTimer.setSingleShot(True)
+        self.__publishTimer.setInterval(CounterHandler.PUBLISH_INTERVAL_MS)
+        self.__publishTimer.timeout.connect(self.__publish)
+
+        # lives in the GUI thread
         self.counterTableModel: CounterTableModel = CounterTableModel()
+        self.signal_rowsChanged.connect(self.counterTableModel.setRows)
+        self.signal_call.connect(self.__call, Qt.ConnectionType.QueuedConnection)
+
+        self.createCounters([counterSettings.pattern for counterSettings in settings])
+
+    def __invokeInHandlerThread(self, methodName: str):
+        if self.thread() == QThread.currentThread() or not self.thread().isRunning():
+            QMetaObject.invokeMethod(self, methodName, Qt.ConnectionType.DirectConnection)
+        else:
+            QMetaObject.invokeMethod(self, methodName, Qt.ConnectionType.BlockingQueuedConnection)
+
+    def __callInHandlerThread(self, function: typing.Callable[[], None]):
+        """ Calls function in the thread of the handler (queued, if called by another thread) """
+        if self.thread() == QThread.currentThread() or not self.thread().isRunning():
+            function()
+        else:
+            self.signal_call.emit(function)
 
-        for counterSettings in settings:
-            self.createCounter(counterSettings.pattern)
+    @Slot(object)
+    def __call(self, function: typing.Callable[[], None]):
+        function()
 
     def getSettings(self) -> list[CounterSettings]:
-        return self.counterTableModel.settings
+        """ Returns the settings of the published counters (called in the GUI thread) """
+        return self.counterTableModel.getSettings()
 
     def clear(self):
-        self.counterTableModel.resetCounters()
+        QMetaObject.invokeMethod(self, '__handleClear', Qt.ConnectionType.QueuedConnection)
+
+    def flush(self):
+        """ Publishes the pending changes now (blocks until they are published) """
+        self.__invokeInHandlerThread('__publish')
+
+    @Slot()
+    def __handleClear(self):
+        for entry in self.entries:
+            entry.value = 0
+        self.__publish()
+
+    @Slot()
+    def __publish(self):
+        self.__publishTimer.stop()
+        self.__dirty = False
+        # a counter row is only a pattern and an int, so all rows are created again
+        self.signal_rowsChanged.emit(tuple(entry.createRow() for entry in self.entries))
+
+    @Slot(str, object)
+    def incrementCounterValue(self, pattern: str, unused: object):
+        entry = self.entries.getByKey(pattern)
+        if entry is not None:
+            entry.increment()
+            if not self.__dirty:
+                self.__dirty = True
+                self.__publishTimer.start()
 
     @Slot(str)
     def createCounter(self, pattern: str):
-        idx = self.counterTableModel.addCounterEntry(pattern)
-        if idx >= 0:
-            textExtractor = StreamingTextExtractor(pattern, pattern)
-            self.dataSource.signal_asciiDataAvailable.connect(textExtractor.processBytesFromStream)
-            textExtractor.signal_textExtracted.connect(self.counterTableModel.incrementCounterValue)
-            self.textExtractors.append(textExtractor)
+        self.createCounters([pattern])
+
+    def createCounters(self, patterns: list[str]):
+        """ Creates all counters and publishes them once (one reset of the model) """
+        self.__callInHandlerThread(lambda: self.__handleCreateCounters(patterns))
+
+    def __handleCreateCounters(self, patterns: list[str]):
+        patterns = [pattern for pattern in dict.fromkeys(patterns) if pattern not in self.entries]
+        entryIds = [self.entries.add(pattern, CounterEntry(pattern)) for pattern in patterns]
+        textExtractors = self.matchEngine.addPatterns([(pattern, pattern) for pattern in patterns])
+        for entryId, textExtractor in zip(entryIds, textExtractors):
+            textExtractor.signal_textExtracted.connect(self.incrementCounterValue)
+            self.textExtractors[entryId] = textExtractor
+        self.__publish()
 
     @Slot(int)
     def removeCounter(self, index: int):
-        if self.counterTableModel.removeCounterEntry(index):
-            textExtractor = self.textExtractors[index]
-            self.dataSource.signal_asciiDataAvailable.disconnect(textExtractor.processBytesFromStream)
-            textExtractor.signal_textExtracted.disconnect(self.counterTableModel.incrementCounterValue)
-            del self.textExtractors[index]
+        self.removeCounters([index])
+
+    @Slot(object)
+    def removeCounters(self, indices: list[int]):
+        """ Removes the counters in the given rows and publishes the remaining counters once """
+        self.__callInHandlerThread(lambda: self.__handleRemoveCounters(indices))
+
+    def __handleRemoveCounters(self, indices: list[int]):
+        textExtractors = []
+        for entryId in self.entries.getIdsOfRows(sorted(set(indices))):
+            textExtractor = self.textExtractors.pop(entryId)
+            textExtractor.signal_textExtracted.disconnect(self.incrementCounterValue)
+            textExtractors.append(textExtractor)
+            self.entries.remove(entryId)
+        self.matchEngine.removePatterns(textExtractors)
+        self.__publish()
@@ -1,42 +1,55 @@
 from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Slot
+from typing import NamedTuple
+
 from multiserialviewer.settings.counterSettings import CounterSettings
 
 
-class CounterTableModel(QAbstractTableModel):
-    class CounterEntry:
-        def __init__(self, pattern: str, initialValue: int = 0):
-            self.pattern: str = pattern
-            self.value: int = initialValue
+class CounterRow(NamedTuple):
+    """ Immutable snapshot of a counter (published by CounterHandler to the CounterTableModel of the GUI) """
+    pattern: str
+    value: int
+
+
+class CounterEntry:
+    def __init__(self, pattern: str, initialValue: int = 0):
+        self.pattern: str = pattern
+        self.value: int = initialValue
+
+    def increment(self):
+        self.value += 1
+
+    def createRow(self) -> CounterRow:
+        return CounterRow(self.pattern, self.value)
 
-        def increment(self):
-            self.value += 1
+
+class CounterTableModel(QAbstractTableModel):
+    """ Shows the counters in the GUI thread. The rows are snapshots published by CounterHandler (see setRows). """
 
     def __init__(self):
         QAbstractTableModel.__init__(self)
 
-        self.settings: list[CounterSettings] = []
-        self.entries: list[CounterTableModel.CounterEntry] = []
-        self.patternToIndex: dict[str, int] = {}
-
-    def __removePatternByIndex(self, index: int):
-        for p, i in self.patternToIndex.items():
-            if i == index:
-                del self.patternToIndex[p]
-                break
-        # adjust indices
-        for p in self.patternToIndex.keys():
-            if self.patternToIndex[p] > index:
-                self.patternToIndex[p] -= 1
-
-    @Slot()
-    def incrementCounterValue(self, pattern: str, unused: object):
-        if pattern in self.patternToIndex:
-            rowIndex = self.patternToIndex[pattern]
-            self.entries[rowIndex].increment()
-            self.dataChanged.emit(self.index(rowIndex, 1), self.index(rowIndex, 1))
+        self.rows: tuple[CounterRow, ...] = ()
+
+    @Slot(object)
+    def setRows(self, rows: tuple[CounterRow, ...]):
+        if [row.pattern for row in rows] != [row.pattern for row in self.rows]:
+            # counters were created or removed
+            self.beginResetModel()
+            self.rows = rows
+            self.endResetModel()
+            return
+
+        changed = [index for index, row in enumerate(rows) if row != self.rows[index]]
+        self.rows = rows
+        if len(changed) > 0:
+            # one merged notification for all changed rows
+            self.dataChanged.emit(self.index(changed[0], 1), self.index(changed[-1], 1))
+
+    def getSettings(self) -> list[CounterSettings]:
+        return [CounterSettings(row.pattern) for row in self.rows]
 
     def rowCount(self, parent=QModelIndex()):
-        return len(self.entries)
+        return len(self.rows)
 
     def columnCount(self, parent=QModelIndex()):
         return 2  # pattern and value
@@ -55,38 +68,7 @@ class CounterTableModel(QAbstractTableModel):
 
         if role == Qt.ItemDataRole.DisplayRole:
             if column == 0:
-                return self.entries[row].pattern
+                return self.rows[row].pattern
             elif column == 1:
-                return str(self.entries[row].value)
+                return str(self.rows[row].value)
         return None
-
-    def resetCounters(self):
-        for idx, entry in enumerate(self.entries):
-            entry.value = 0
-            self.dataChanged.emit(self.index(idx, 1), self.index(idx, 1))
-
-    def addCounterEntry(self, pattern) -> int:
-        rowIdx = -1
-        if pattern not in self.patternToIndex.keys():
-            rowIdx = len(self.settings)
-            self.beginInsertRows(QModelIndex(), rowIdx, rowIdx)
-            self.patternToIndex[pattern] = rowIdx
-            self.settings.append(CounterSettings(pattern))
-            self.entries.append(CounterTableModel.CounterEntry(pattern))
-            self.endInsertRows()
-
-            assert len(self.entries) == len(self.settings)
-        return rowIdx
-
-    def removeCounterEntry(self, index: int) -> bool:
-        assert len(self.entries) == len(self.settings)
-
-        if index < len(self.settings):
-            self.beginRemoveRows(QModelIndex(), index, index)
-            del self.settings[index]
-            del self.entries[index]
-            self.__removePatternByIndex(index)
-            self.endRemoveRows()
-            return True
-        else:
-            return False
@@ -0,0 +1,65 @@
+import typing
+
+
+class EntryRegistry:
+    """ Entries (e.g. watches or counters) with a unique key and a stable id.
+
+    The ids are assigned when an entry is added and never reused or renumbered, so other data of an
+    entry (e.g. its text extractor or its published row) can be kept in dicts keyed by the id. The order
+    of iteration is the order in which the entries were added (the rows of the table models). Adding,
+    removing and the lookup by key or id are O(1).
+    """
+
+    def __init__(self):
+        self.__nextId: int = 0
+        self.__entries: dict[int, typing.Any] = {}
+        self.__keys: dict[int, str] = {}
+        self.__keyToId: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        return iter(self.__entries.values())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__keyToId
+
+    def add(self, key: str, entry: typing.Any) -> int:
+        """ Adds the entry and returns its id (the key must not be used yet) """
+        if key in self.__keyToId:
+            raise KeyError(f"'{key}' is already registered")
+        entryId = self.__nextId
+        self.__nextId += 1
+        self.__entries[entryId] = entry
+        self.__keys[entryId] = key
+        self.__keyToId[key] = entryId
+        return entryId
+
+    def remove(self, entryId: int) -> typing.Any:
+        entry = self.__entries.pop(entryId)
+        del self.__keyToId[self.__keys.pop(entryId)]
+        return entry
+
+    def clear(self):
+        self.__entries.clear()
+        self.__keys.clear()
+        self.__keyToId.clear()
+
+    def getId(self, key: str) -> int | None:
+        return self.__keyToId.get(key)
+
+    def get(self, entryId: int) -> typing.Any:
+        return self.__entries.get(entryId)
+
+    def getByKey(self, key: str) -> typing.Any:
+        entryId = self.__keyToId.get(key)
+        return None if entryId is None else self.__entries[entryId]
+
+    def getIds(self) -> list[int]:
+        return list(self.__entries.keys())
+
+    def getIdsOfRows(self, rows: typing.Iterable[int]) -> list[int]:
+        """ Returns the ids of the entries at the given positions (rows of a table model), invalid rows are ignored """
+        ids = self.getIds()
+        return [ids[row] for row in rows if 0 <= row < len(ids)]
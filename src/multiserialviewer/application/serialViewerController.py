@@ -1,11 +1,18 @@
-from PySide6.QtCore import QObject, Slot, Signal, QThread
+from PySide6.QtCore import QObject, Slot, Signal, QThread, Qt
+from pathlib import PurePath
 
 from multiserialviewer.settings.serialViewerSettings import SerialViewerSettings
 from multiserialviewer.settings.applicationSettings import ApplicationSettings
 from multiserialviewer.gui_viewer.serialViewerWindow import SerialViewerWindow
 from multiserialviewer.serial_data.serialDataReceiver import SerialDataReceiver
+from multiserialviewer.serial_data.rawDataRecorder import RawDataRecorder
+from multiserialviewer.serial_data.rawDataReplaySource import RawDataReplaySource
+from multiserialviewer.serial_data.textSpillWriter import TextSpillWriter
 from multiserialviewer.serial_data.serialDataProcessor import SerialDataProcessor
 from multiserialviewer.serial_data.serialDataStatistics import SerialDataStatistics
+from multiserialviewer.serial_data.streamingMatchEngine import StreamingMatchEngine
+from multiserialviewer.serial_data.workerThreadPool import WorkerThreadPool, Worker
+from multiserialviewer.serial_data.portFileHelper import getFileBaseName
 from multiserialviewer.application.counterHandler import CounterHandler
 from multiserialviewer.application.watchHandler import WatchHandler
 from multiserialviewer.application.statisticsHandler import StatisticsHandler
@@ -13,78 +20,204 @@ from multiserialviewer.application.statisticsHandler import StatisticsHandler
 
 class SerialViewerController(QObject):
     signal_deleteController: Signal = Signal(str)
+    # results of requestStartCapture and requestStopCapture (port name, opened)
+    signal_captureStarted: Signal = Signal(str, bool)
+    signal_captureStopped: Signal = Signal(str)
 
-    def __init__(self, settings: SerialViewerSettings, settingsApplication: ApplicationSettings, view: SerialViewerWindow):
+    MAX_PENDING_REPLAY_CHUNKS = 64
+
+    def __init__(self, settings: SerialViewerSettings, settingsApplication: ApplicationSettings, view: SerialViewerWindow,
+                 logDir: str, receiver: SerialDataReceiver | RawDataReplaySource | None = None):
         super(SerialViewerController, self).__init__()
+        self.__logDir: str = logDir
+        self.__destructed: bool = False
 
-        self.dataProcessingThread: QThread = QThread(self)
-        self.dataProcessingThread.setObjectName('SerialData thread')
-        self.statsThread: QThread = QThread(self)
-        self.statsThread.setObjectName('statsThread thread')
+        # the serial port is read in its own thread (not disturbed by painting and layout in the GUI thread)
+        self.receiverThread: QThread = QThread(self)
+        self.receiverThread.setObjectName('SerialReceiver thread')
+        self.recorderThread: QThread = QThread(self)
+        self.recorderThread.setObjectName('RawDataRecorder thread')
 
-        self.receiver: SerialDataReceiver = SerialDataReceiver(settings.connection)
+        # the receiver can be replaced (e.g. by a RawDataReplaySource)
+        if receiver is None:
+            receiver = SerialDataReceiver(settings.connection)
+        self.receiver: SerialDataReceiver | RawDataReplaySource = receiver
+        self.recorder: RawDataRecorder = RawDataRecorder(self.__logDir, getFileBaseName(self.getPortName()))
+        self.setRecordingEnabled(settingsApplication.recordRawData)
+        # lines removed from the view are written in the recorder thread as well
+        self.spillWriter: TextSpillWriter = TextSpillWriter(
+            str(PurePath(self.__logDir, getFileBaseName(self.getPortName()) + '.log')))
         self.processor: SerialDataProcessor = SerialDataProcessor()
         self.processor.setConvertNonPrintableCharsToHex(settingsApplication.showNonPrintableCharsAsHex)
         self.processor.setBackspaceDeletesLastLine(settingsApplication.backspaceDeletesLastLine)
-        self.processor.setShowTimestampAtLineStart(settingsApplication.showTimestamp, settingsApplication.timestampFormat)
+        self.processor.setShowTimestampAtLineStart(settingsApplication.showTimestamp, settingsApplication.timestampFormat,
+                                                   settingsApplication.timestampMode)
         self.statistics: SerialDataStatistics = SerialDataStatistics(settings.connection)
 
-        self.counterHandler: CounterHandler = CounterHandler(settings.counters, self.processor)
-        self.watchHandler: WatchHandler = WatchHandler(settings.watches, self.processor)
+        # the received data is processed by a thread shared with other ports (see WorkerThreadPool)
+        self.worker: Worker = WorkerThreadPool.instance().acquire(self.getPortName())
+        # all watches and counters share one engine, so the received text is searched only once
+        self.matchEngine: StreamingMatchEngine = StreamingMatchEngine(self.worker.deadlineScheduler)
+        self.counterHandler: CounterHandler = CounterHandler(settings.counters, self.matchEngine)
+        self.watchHandler: WatchHandler = WatchHandler(settings.watches, self.matchEngine,
+                                                       settingsApplication.watchHistorySize, settingsApplication.watchMaxWords)
         self.statisticsHandler: StatisticsHandler = StatisticsHandler(self.statistics)
 
-        self.processor.moveToThread(self.dataProcessingThread)
-        self.statistics.moveToThread(self.statsThread)
-        self.counterHandler.moveToThread(self.dataProcessingThread)
-        self.watchHandler.moveToThread(self.dataProcessingThread)
-        self.statisticsHandler.moveToThread(self.statsThread)
+        self.receiver.moveToThread(self.receiverThread)
+        self.recorder.moveToThread(self.recorderThread)
+        self.spillWriter.moveToThread(self.recorderThread)
+        self.processor.moveToThread(self.worker.workerThread)
+        self.matchEngine.moveToThread(self.worker.workerThread)
+        self.counterHandler.moveToThread(self.worker.workerThread)
+        self.watchHandler.moveToThread(self.worker.workerThread)
 
-        self.dataProcessingThread.start()
-        self.dataProcessingThread.setPriority(QThread.Priority.NormalPriority)
-        self.statsThread.start()
-        self.statsThread.setPriority(QThread.Priority.TimeCriticalPriority)
+        self.receiverThread.start()
+        self.receiverThread.setPriority(QThread.Priority.HighPriority)
+        self.recorderThread.start()
 
         self.view: SerialViewerWindow = view
+        self.view.textEdit.signal_textRemoved.connect(self.spillWriter.writeText)
+        self.spillWriter.signal_errorOccurred.connect(self.handleSpillWriterError)
+        self.setScrollbackLimit(settingsApplication.scrollbackMaxLines, settingsApplication.scrollbackMaxCharacters,
+                                settingsApplication.scrollbackSpillToDisk)
         # counter
         self.view.counterWidget.setCounterTableModel(self.counterHandler.counterTableModel)
         self.view.counterWidget.signal_createCounter.connect(self.counterHandler.createCounter)
-        self.view.counterWidget.signal_removeCounter.connect(self.counterHandler.removeCounter)
+        self.view.counterWidget.signal_removeCounters.connect(self.counterHandler.removeCounters)
         # watch
         self.view.watchWidget.setWatchTableModel(self.watchHandler.watchTableModel)
         self.view.watchWidget.signal_createWatch.connect(self.watchHandler.createWatch)
-        self.view.watchWidget.signal_removeWatch.connect(self.watchHandler.removeWatchByIndex)
+        self.view.watchWidget.signal_removeWatches.connect(self.watchHandler.removeWatchesByIndex)
+        # plot
+        self.view.plotWidget.setHistoryCapacity(settingsApplication.watchHistorySize)
+        self.view.plotWidget.setWatchTableModel(self.watchHandler.watchTableModel)
+        self.watchHandler.signal_samplesAvailable.connect(self.view.plotWidget.addSamples)
+        self.watchHandler.signal_historyAvailable.connect(self.view.plotWidget.setSamples)
+        self.view.plotWidget.canvas.signal_samplesRequested.connect(self.watchHandler.requestSamples)
         # stats
+        self.statisticsHandler.setProcessor(self.processor, self.worker.name)
         self.view.statisticsWidget.setStatisticsTableModel(self.statisticsHandler.statisticsTableModel)
 
         self.view.textEdit.signal_createCounterFromSelectedText.connect(self.view.setCounterPatternToCreate)
         self.view.textEdit.signal_createWatchFromSelectedText.connect(self.view.createWatchFromText)
         self.view.signal_closed.connect(self.onViewClosed)
 
-        self.processor.signal_asciiDataAvailable.connect(self.view.appendData)
-        self.processor.signal_deleteLine.connect(self.view.deleteLastLine)
+        # received text is staged directly (in the data processing thread) and displayed by the view
+        # with a limited frame rate. This way, the event queue of the GUI thread does not grow.
+        self.processor.signal_asciiDataAvailable.connect(self.view.stagingBuffer.appendText,
+                                                         type=Qt.ConnectionType.DirectConnection)
+        self.processor.signal_deleteLine.connect(self.view.stagingBuffer.deleteLastLine,
+                                                 type=Qt.ConnectionType.DirectConnection)
+        self.view.signal_stagedTextFlushed.connect(self.statisticsHandler.handleStagedTextFlushed)
+        self.matchEngine.setRxTimeSource(self.processor.getRxTime)
+        self.processor.signal_asciiDataAvailable.connect(self.matchEngine.processBytesFromStream)
         self.processor.signal_numberOfNonPrintableChars.connect(self.statisticsHandler.handleInvalidByteCounter)
+        if isinstance(self.receiver, SerialDataReceiver):
+            # a replay has no byte timing, the lines of a chunk get the rx time of the chunk
+            self.receiver.signal_lineTimestampsAvailable.connect(self.processor.handleLineTimestamps,
+                                                                 type=Qt.ConnectionType.DirectConnection)
+        self.setLineTimestampsEnabled(settingsApplication.showTimestamp)
         self.receiver.signal_rawDataAvailable.connect(self.processor.handleRawData)
-        self.receiver.signal_rawDataAvailable.connect(self.statistics.handleRawData)
+        if isinstance(self.receiver, RawDataReplaySource):
+            # the replay is paused, while the worker has not processed MAX_PENDING_REPLAY_CHUNKS chunks
+            self.receiver.setMaxPendingChunks(SerialViewerController.MAX_PENDING_REPLAY_CHUNKS)
+            self.processor.signal_rawDataProcessed.connect(self.receiver.handleChunkProcessed)
+            self.processor.setRawDataProcessedEnabled(True)
+        # the statistics only store the rx time and size of the chunk (in the receiver thread)
+        self.receiver.signal_rawDataAvailable.connect(self.statistics.handleRawData,
+                                                      type=Qt.ConnectionType.DirectConnection)
+        self.receiver.signal_errorOccurred.connect(self.handleReceiverError)
+        self.receiver.signal_portOpened.connect(self.__handlePortOpened)
+        self.receiver.signal_portClosed.connect(self.__handlePortClosed)
+        # the recorder only stages the data in the receiver thread, it is written in the recorder thread
+        self.receiver.signal_rawDataAvailable.connect(self.recorder.handleRawData,
+                                                      type=Qt.ConnectionType.DirectConnection)
+        self.recorder.signal_errorOccurred.connect(self.handleRecorderError)
 
     def getPortName(self) -> str:
         return self.receiver.getSettings().portName
 
+    def setProcessingSettings(self, settingsApplication: ApplicationSettings):
+        """ The processor is changed in the thread of the worker (between two chunks) """
+        convertToHex = settingsApplication.showNonPrintableCharsAsHex
+        backspaceDeletesLastLine = settingsApplication.backspaceDeletesLastLine
+        timestampSettings = (settingsApplication.showTimestamp, settingsApplication.timestampFormat,
+                             settingsApplication.timestampMode)
+
+        def apply():
+            self.processor.setConvertNonPrintableCharsToHex(convertToHex)
+            self.processor.setBackspaceDeletesLastLine(backspaceDeletesLastLine)
+            self.processor.setShowTimestampAtLineStart(*timestampSettings)
+        self.worker.postToThread(apply)
+
+    def setRecordingEnabled(self, state: bool):
+        """ A replay (RawDataReplaySource) is not recorded again """
+        self.recorder.setEnabled(state and isinstance(self.receiver, SerialDataReceiver))
+
+    def setLineTimestampsEnabled(self, state: bool):
+        """ The timestamps of the lines are estimated from their position in the received chunk """
+        if isinstance(self.receiver, SerialDataReceiver):
+            self.receiver.setLineTimestampsEnabled(state)
+
+    def setScrollbackLimit(self, maxLines: int, maxCharacters: int, spillToDisk: bool):
+        self.spillWriter.setEnabled(spillToDisk)
+        self.view.textEdit.setScrollbackLimit(maxLines, maxCharacters, spillToDisk)
+
     def startCapture(self) -> bool:
-        opened, msg = self.receiver.openPort()
-        if opened:
-            self.showStartMessage(f'Opened {self.receiver.getSettings().portName}')
-            return True
-        else:
-            self.showErrorMessage(f'Failed to open {self.receiver.getSettings().portName} ({msg})')
-            return False
+        # queued before the data of the port, so the elapsed time starts with its first data
+        self.worker.postToThread(self.processor.restartElapsedTime)
+        return self.__showOpenResult(*self.receiver.openPort())
 
     def stopCapture(self):
         if self.receiver.portIsOpen():
             self.receiver.closePort()
             self.showStopMessage(f'Closed {self.receiver.getSettings().portName}')
 
+    def requestStartCapture(self):
+        """ Opens the port without blocking the GUI thread, the result is emitted with signal_captureStarted """
+        self.worker.postToThread(self.processor.restartElapsedTime)
+        self.receiver.requestOpenPort()
+
+    def requestStopCapture(self):
+        """ Closes the port without blocking the GUI thread (signal_captureStopped is emitted, if it was open) """
+        self.receiver.requestClosePort()
+
+    def __showOpenResult(self, opened: bool, msg: str) -> bool:
+        if opened:
+            self.showStartMessage(f'Opened {self.receiver.getSettings().portName}')
+        else:
+            self.showErrorMessage(f'Failed to open {self.receiver.getSettings().portName} ({msg})')
+        return opened
+
+    @Slot(bool, str)
+    def __handlePortOpened(self, opened: bool, msg: str):
+        # the result of a request can still be queued, when the controller is deleted
+        if self.__destructed:
+            return
+        self.__showOpenResult(opened, msg)
+        self.signal_captureStarted.emit(self.getPortName(), opened)
+
+    @Slot()
+    def __handlePortClosed(self):
+        if self.__destructed:
+            return
+        self.showStopMessage(f'Closed {self.receiver.getSettings().portName}')
+        self.signal_captureStopped.emit(self.getPortName())
+
+    @Slot(str)
+    def handleReceiverError(self, msg: str):
+        self.showErrorMessage(f'Error on {self.receiver.getSettings().portName} ({msg})')
+
+    @Slot(str)
+    def handleRecorderError(self, msg: str):
+        self.showErrorMessage(f'Recording of {self.receiver.getSettings().portName}: {msg}')
+
+    @Slot(str)
+    def handleSpillWriterError(self, msg: str):
+        self.showErrorMessage(msg)
+
     def clearAll(self):
-        self.processor.clear()
+        self.worker.postToThread(self.processor.clear)
         self.view.clear()
         self.counterHandler.clear()
         self.watchHandler.clear()
@@ -101,16 +234,21 @@ class SerialViewerController(QObject):
         self.view.appendStopMessage(text)
 
     def destruct(self):
+        self.__destructed = True
         self.receiver.closePort()
 
-        if self.dataProcessingThread.isRunning():
-            self.dataProcessingThread.quit()
-            self.dataProcessingThread.wait()
-        if self.statsThread.isRunning():
-            self.statsThread.quit()
-            self.statsThread.wait()
-
-        self.statistics.deleteLater()
+        if self.receiverThread.isRunning():
+            self.receiverThread.quit()
+            self.receiverThread.wait()
+        self.recorder.close()
+        self.spillWriter.close()
+        if self.recorderThread.isRunning():
+            self.recorderThread.quit()
+            self.recorderThread.wait()
+        # the events of the worker thread are processed in order, so the data still queued for this port is
+        # processed before the objects are detached
+        self.worker.detach(self.matchEngine, [self.processor, self.matchEngine, self.counterHandler, self.watchHandler])
+        WorkerThreadPool.instance().release(self.worker, self.getPortName())
 
     @Slot()
     def onViewClosed(self):
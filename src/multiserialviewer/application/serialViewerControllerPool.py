@@ -1,4 +1,4 @@
-from PySide6.QtCore import QObject, Slot, Qt
+from PySide6.QtCore import QObject, Slot, Signal, Qt
 
 from multiserialviewer.application.serialViewerController import SerialViewerController
 from multiserialviewer.settings.applicationSettings import ApplicationSettings
@@ -6,9 +6,23 @@ from multiserialviewer.settings.textHighlighterSettings import TextHighlighterSe
 
 
 class SerialViewerControllerPool(QObject):
+    """ The ports are opened and closed concurrently: every port is opened in its receiver thread and the
+    result is reported with signal_captureStarted as soon as it is available (e.g. some USB adapters take
+    hundreds of ms to open). signal_startCaptureFinished is emitted, when all ports were tried.
+    """
+    signal_captureStarted: Signal = Signal(str, bool)
+    signal_captureStopped: Signal = Signal(str)
+    # True, if the capture is active (no port failed with allOrNothing, otherwise at least one port opened or no ports)
+    signal_startCaptureFinished: Signal = Signal(bool)
+
     def __init__(self):
         super(SerialViewerControllerPool, self).__init__()
         self.__controller: list[SerialViewerController] = []
+        # state of the running startCapture
+        self.__pendingPorts: set[str] = set()
+        self.__openedPorts: list[str] = []
+        self.__failedPorts: list[str] = []
+        self.__allOrNothing: bool = False
 
     def entries(self):
         return self.__controller
@@ -25,29 +39,72 @@ class SerialViewerControllerPool(QObject):
 
     def setApplicationSettings(self, values: ApplicationSettings):
         for ctrl in self.__controller:
-            ctrl.processor.setConvertNonPrintableCharsToHex(values.showNonPrintableCharsAsHex)
-            ctrl.processor.setBackspaceDeletesLastLine(values.backspaceDeletesLastLine)
-            ctrl.processor.setShowTimestampAtLineStart(values.showTimestamp, values.timestampFormat)
+            ctrl.setProcessingSettings(values)
+            ctrl.setLineTimestampsEnabled(values.showTimestamp)
+            ctrl.setScrollbackLimit(values.scrollbackMaxLines, values.scrollbackMaxCharacters, values.scrollbackSpillToDisk)
+            ctrl.setRecordingEnabled(values.recordRawData)
+            ctrl.watchHandler.setHistoryCapacity(values.watchHistorySize)
+            ctrl.watchHandler.setMaxWords(values.watchMaxWords)
+            ctrl.view.plotWidget.setHistoryCapacity(values.watchHistorySize)
+
+    def getPendingPortCount(self) -> int:
+        """ Number of ports, which are still being opened by startCapture """
+        return len(self.__pendingPorts)
 
     def add(self, ctrl: SerialViewerController):
         self.__controller.append(ctrl)
+        ctrl.signal_captureStarted.connect(self.__handleCaptureStarted)
+        ctrl.signal_captureStopped.connect(self.signal_captureStopped)
 
     def resetReceivedData(self):
         for ctrl in self.__controller:
             ctrl.clearAll()
 
-    def startCapture(self) -> bool:
-        startedCount = 0
-        ctrl: SerialViewerController
-        for ctrl in self.__controller:
-            if ctrl.startCapture():
-                startedCount += 1
+    def startCapture(self, allOrNothing: bool = True):
+        """ Opens all ports concurrently without blocking. With allOrNothing, the opened ports are closed
+        again, if one of the ports cannot be opened.
+        """
+        self.__pendingPorts = set(self.getUsedPorts())
+        self.__openedPorts = []
+        self.__failedPorts = []
+        self.__allOrNothing = allOrNothing
 
-        return startedCount == self.count()
+        if len(self.__pendingPorts) == 0:
+            # ports added later are started by the application
+            self.signal_startCaptureFinished.emit(True)
+            return
+        ctrl: SerialViewerController
+        for ctrl in list(self.__controller):
+            ctrl.requestStartCapture()
 
     def stopCapture(self):
+        """ Closes all ports concurrently without blocking (a running startCapture is cancelled) """
+        self.__pendingPorts.clear()
         for ctrl in self.__controller:
-            ctrl.stopCapture()
+            ctrl.requestStopCapture()
+
+    @Slot(str, bool)
+    def __handleCaptureStarted(self, portName: str, opened: bool):
+        # not pending e.g. if the capture was stopped meanwhile
+        pending = portName in self.__pendingPorts
+        if pending:
+            self.__pendingPorts.remove(portName)
+            if opened:
+                self.__openedPorts.append(portName)
+            else:
+                self.__failedPorts.append(portName)
+        self.signal_captureStarted.emit(portName, opened)
+        if pending:
+            self.__finishStartCapture()
+
+    def __finishStartCapture(self):
+        if len(self.__pendingPorts) > 0:
+            return
+        if self.__allOrNothing and len(self.__failedPorts) > 0:
+            self.stopCapture()
+            self.signal_startCaptureFinished.emit(False)
+        else:
+            self.signal_startCaptureFinished.emit(len(self.__openedPorts) > 0 or len(self.__failedPorts) == 0)
 
     @Slot()
     def deleteController(self, portName):
@@ -55,9 +112,13 @@ class SerialViewerControllerPool(QObject):
             if ctrl.getPortName() == portName:
                 ctrl.destruct()
                 self.__controller.remove(ctrl)
+                if portName in self.__pendingPorts:
+                    self.__pendingPorts.remove(portName)
+                    self.__finishStartCapture()
                 break
 
     def deleteAll(self):
+        self.__pendingPorts.clear()
         for ctrl in self.__controller:
             ctrl.destruct()
         self.__controller = []
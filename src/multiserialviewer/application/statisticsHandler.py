@@ -1,36 +1,58 @@
-from PySide6.QtCore import QObject, Slot
+from PySide6.QtCore import QObject, Slot, QTimer, QElapsedTimer
 
 from multiserialviewer.serial_data.serialDataStatistics import SerialDataStatistics
+from multiserialviewer.serial_data.serialDataProcessor import SerialDataProcessor
 from multiserialviewer.application.statisticsTableModel import StatisticsTableModel
 
 
 class StatisticsHandler(QObject):
+    """ Shows the statistics in the GUI thread. The throughput and the usage of the processing thread are
+    calculated every REFRESH_INTERVAL_MS (see SerialDataStatistics.getThroughput), the other values are
+    updated when they change.
+    """
+    REFRESH_INTERVAL_MS = 500
+
     def __init__(self, statisticsSource: SerialDataStatistics):
         super().__init__()
         self.statisticsSource: SerialDataStatistics = statisticsSource
         self.statisticsTableModel: StatisticsTableModel = StatisticsTableModel()
-
-
-        self.statisticsSource.signal_curUsageChanged.connect(self.handleCurUsageChanged)
-        self.statisticsSource.signal_maxUsageChanged.connect(self.handleMaxUsageChanged)
-        self.statisticsSource.signal_receivedBytesIncremented.connect(self.handleReceivedBytesIncremented)
+        self.processor: SerialDataProcessor | None = None
+        self.__processingTimeNs: int = 0
+        self.__processingTimeElapsed: QElapsedTimer = QElapsedTimer()
+
+        self.__refreshTimer: QTimer = QTimer(self)
+        self.__refreshTimer.setInterval(StatisticsHandler.REFRESH_INTERVAL_MS)
+        self.__refreshTimer.timeout.connect(self.refreshThroughput)
+        self.__refreshTimer.start()
+
+    def setProcessor(self, processor: SerialDataProcessor, threadName: str):
+        """ The usage of the (shared) processing thread by this port is shown """
+        self.processor = processor
+        self.__processingTimeNs = processor.getProcessingTimeNs()
+        self.__processingTimeElapsed.start()
+        self.statisticsTableModel.setProcessingThreadName(threadName)
 
     def clear(self):
         self.statisticsTableModel.reset()
 
-    @Slot(int)
-    def handleCurUsageChanged(self, usageInPercent: int):
-        self.statisticsTableModel.setCurrentUsage(usageInPercent)
-
-    @Slot(int)
-    def handleMaxUsageChanged(self, usageInPercent: int):
-        self.statisticsTableModel.setMaxUsage(usageInPercent)
-
-    @Slot(int)
-    def handleReceivedBytesIncremented(self, count: int):
-        self.statisticsTableModel.setReceivedByteCount(count)
+    @Slot()
+    def refreshThroughput(self):
+        throughput = self.statisticsSource.getThroughput()
+        self.statisticsTableModel.setThroughput(throughput, self.statisticsSource.getMaxUsage(),
+                                                self.statisticsSource.getReceivedBytes())
+        if self.processor is not None:
+            processingTimeNs = self.processor.getProcessingTimeNs()
+            elapsedNs = self.__processingTimeElapsed.nsecsElapsed()
+            if elapsedNs > 0:
+                self.statisticsTableModel.setProcessingUsage(100.0 * (processingTimeNs - self.__processingTimeNs) / elapsedNs)
+            self.__processingTimeNs = processingTimeNs
+            self.__processingTimeElapsed.restart()
 
     @Slot(int)
     def handleInvalidByteCounter(self, count: int):
         self.statisticsTableModel.handleInvalidByteCount(count)
 
+    @Slot(int, float)
+    def handleStagedTextFlushed(self, chunkCount: int, durationInMs: float):
+        self.statisticsTableModel.setDisplayQueueDepth(chunkCount)
+        self.statisticsTableModel.setDisplayUpdateTime(durationInMs)
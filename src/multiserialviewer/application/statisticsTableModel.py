@@ -1,37 +1,62 @@
 from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
 
+from multiserialviewer.serial_data.serialDataStatistics import SerialDataStatistics, Throughput
+
 
 class StatisticsTableModel(QAbstractTableModel):
     class DataEntry:
-        def __init__(self, name: str):
+        def __init__(self, name: str, unit: str = ''):
             self.name: str = name
-            self.value: int = 0
+            self.unit: str = unit
+            self.value: int | float = 0
 
 
     def __init__(self):
         QAbstractTableModel.__init__(self)
 
         self.entries: list[StatisticsTableModel.DataEntry] = []
-        self.entries.append(StatisticsTableModel.DataEntry('Current bandwidth usage'))
-        self.entries.append(StatisticsTableModel.DataEntry('Max bandwidth usage'))
+        for windowSeconds in SerialDataStatistics.WINDOWS_S:
+            self.entries.append(StatisticsTableModel.DataEntry(f'Bandwidth usage ({windowSeconds} s)', ' %'))
+        self.entries.append(StatisticsTableModel.DataEntry(f'Max bandwidth usage ({SerialDataStatistics.WINDOWS_S[0]} s)', ' %'))
+        for windowSeconds in SerialDataStatistics.WINDOWS_S:
+            self.entries.append(StatisticsTableModel.DataEntry(f'Received bytes/s ({windowSeconds} s)'))
         self.entries.append(StatisticsTableModel.DataEntry('Bytes received'))
+        self.throughputEntryCount: int = len(self.entries)
+        self.invalidByteCountIndex: int = len(self.entries)
         self.entries.append(StatisticsTableModel.DataEntry('Non-printable bytes'))
+        self.entries.append(StatisticsTableModel.DataEntry('Display queue (chunks per update)'))
+        self.entries.append(StatisticsTableModel.DataEntry('Display update time', ' ms'))
+        self.processingUsageIndex: int = len(self.entries)
+        self.entries.append(StatisticsTableModel.DataEntry('Processing thread usage', ' %'))
 
-    def setCurrentUsage(self, usage: int):
-        self.entries[0].value = usage
-        self.dataChanged.emit(self.index(0, 1), self.index(0, 1))
+    def setThroughput(self, throughput: list[Throughput], maxUsage: float, receivedBytes: int):
+        values = [round(entry.usagePercent, 1) for entry in throughput]
+        values.append(round(maxUsage, 1))
+        values += [round(entry.bytesPerSecond) for entry in throughput]
+        values.append(receivedBytes)
+        for index, value in enumerate(values):
+            self.entries[index].value = value
+        self.dataChanged.emit(self.index(0, 1), self.index(self.throughputEntryCount - 1, 1))
 
-    def setMaxUsage(self, usage: int):
-        self.entries[1].value = usage
-        self.dataChanged.emit(self.index(1, 1), self.index(1, 1))
+    def handleInvalidByteCount(self, count: int):
+        self.__setValue(self.invalidByteCountIndex, self.entries[self.invalidByteCountIndex].value + count)
 
-    def setReceivedByteCount(self, count: int):
-        self.entries[2].value = count
-        self.dataChanged.emit(self.index(2, 1), self.index(2, 1))
+    def setDisplayQueueDepth(self, chunkCount: int):
+        self.__setValue(self.invalidByteCountIndex + 1, chunkCount)
 
-    def handleInvalidByteCount(self, count: int):
-        self.entries[3].value += count
-        self.dataChanged.emit(self.index(3, 1), self.index(3, 1))
+    def setDisplayUpdateTime(self, durationInMs: float):
+        self.__setValue(self.invalidByteCountIndex + 2, round(durationInMs, 1))
+
+    def setProcessingThreadName(self, threadName: str):
+        self.entries[self.processingUsageIndex].name = f'Processing thread usage ({threadName})'
+        self.dataChanged.emit(self.index(self.processingUsageIndex, 0), self.index(self.processingUsageIndex, 0))
+
+    def setProcessingUsage(self, usage: float):
+        self.__setValue(self.processingUsageIndex, round(usage, 1))
+
+    def __setValue(self, index: int, value: int | float):
+        self.entries[index].value = value
+        self.dataChanged.emit(self.index(index, 1), self.index(index, 1))
 
     def rowCount(self, parent=QModelIndex()):
         return len(self.entries)
@@ -50,10 +75,7 @@ class StatisticsTableModel(QAbstractTableModel):
             if column == 0:
                 return self.entries[row].name
             elif column == 1:
-                if row < 2:
-                    return str(self.entries[row].value) + ' %'
-                else:
-                    return str(self.entries[row].value)
+                return str(self.entries[row].value) + self.entries[row].unit
         return None
 
     def reset(self):
@@ -1,75 +1,228 @@
 import re
+import typing
 
-from PySide6.QtCore import QObject, Slot
+from PySide6.QtCore import QObject, Slot, Signal, QTimer, QMetaObject, Qt, QThread
 
 from multiserialviewer.settings.watchSettings import WatchSettings
-from multiserialviewer.serial_data.streamingTextExtractor import StreamingTextExtractor
-from multiserialviewer.serial_data.serialDataProcessor import SerialDataProcessor
-from multiserialviewer.application.watchTableModel import WatchTableModel, WatchEntryNumber, WatchEntryWord
+from multiserialviewer.serial_data.streamingMatchEngine import StreamingMatchEngine, StreamingPattern
+from multiserialviewer.application.watchTableModel import WatchTableModel, WatchEntryNumber, WatchEntryWord, WatchRow
+from multiserialviewer.application.watchHistory import WatchHistory
+from multiserialviewer.application.entryRegistry import EntryRegistry
 
 
 class WatchHandler(QObject):
-    def __init__(self, settings: list[WatchSettings], dataSource: SerialDataProcessor):
+    """ Keeps the values of the watches in the data processing thread.
+
+    The watches can be created and removed from any thread, the changes are done in the thread of the handler.
+
+    Every match only updates the plain Python entry. The changed entries are published as immutable
+    snapshots (WatchRow) to the WatchTableModel in the GUI thread at most every PUBLISH_INTERVAL_MS,
+    so the model is never changed or read by two threads. The new samples of the number watches are
+    published at the same time (signal_samplesAvailable: dict of name -> (times, values)) e.g. for plotting.
+    The samples of the histories are published again on request (see requestSamples).
+    """
+    signal_rowsChanged: Signal = Signal(object)
+    signal_samplesAvailable: Signal = Signal(object)
+    signal_historyAvailable: Signal = Signal(object)
+    # see __callInHandlerThread
+    signal_call: Signal = Signal(object)
+
+    PUBLISH_INTERVAL_MS = 100
+
+    def __init__(self, settings: list[WatchSettings], matchEngine: StreamingMatchEngine,
+                 historyCapacity: int = WatchHistory.DEFAULT_CAPACITY, maxWords: int = WatchEntryWord.DEFAULT_MAX_WORDS):
         super().__init__()
-        self.dataSource: SerialDataProcessor = dataSource
-        self.textExtractors: list[StreamingTextExtractor] = []
+        self.matchEngine: StreamingMatchEngine = matchEngine
+        self.historyCapacity: int = historyCapacity
+        self.maxWords: int = maxWords
+        # the data of a watch is kept by its stable id (see EntryRegistry), the key is the name of the watch
+        self.entries: EntryRegistry = EntryRegistry()
+        self.textExtractors: dict[int, StreamingPattern] = {}
+
+        self.__rows: dict[int, WatchRow] = {}
+        self.__dirtyIds: set[int] = set()
+        # name -> history.getAppendedCount() when the samples were published last time
+        self.__publishedSampleCounts: dict[str, int] = {}
+        self.__publishTimer: QTimer = QTimer(self)
+        self.__publishTimer.setSingleShot(True)
+        self.__publishTimer.setInterval(WatchHandler.PUBLISH_INTERVAL_MS)
+        self.__publishTimer.timeout.connect(self.__publish)
+
+        # lives in the GUI thread
         self.watchTableModel: WatchTableModel = WatchTableModel()
+        self.signal_rowsChanged.connect(self.watchTableModel.setRows)
+        self.signal_call.connect(self.__call, Qt.ConnectionType.QueuedConnection)
 
-        for watchSettings in settings:
-            self.createWatch(watchSettings.name, watchSettings.description, watchSettings.variableType.name, watchSettings.pattern)
+        self.createWatches(settings)
 
-    def getSettings(self) -> list[WatchSettings]:
-        assert len(self.textExtractors) == len(self.watchTableModel.entries)
+    def __invokeInHandlerThread(self, methodName: str):
+        if self.thread() == QThread.currentThread() or not self.thread().isRunning():
+            QMetaObject.invokeMethod(self, methodName, Qt.ConnectionType.DirectConnection)
+        else:
+            QMetaObject.invokeMethod(self, methodName, Qt.ConnectionType.BlockingQueuedConnection)
 
-        settings: list[WatchSettings] = []
-        for index, entry in enumerate(self.watchTableModel.entries):
-            assert isinstance(entry, (WatchEntryNumber, WatchEntryWord))
-            assert entry.name == self.textExtractors[index].name
+    def __callInHandlerThread(self, function: typing.Callable[[], None]):
+        """ Calls function in the thread of the handler (queued, if called by another thread) """
+        if self.thread() == QThread.currentThread() or not self.thread().isRunning():
+            function()
+        else:
+            self.signal_call.emit(function)
 
-            if isinstance(self.watchTableModel.entries[index], WatchEntryNumber):
-                settings.append(WatchSettings(entry.name, '', WatchSettings.VariableType.number, entry.pattern))
-            elif isinstance(self.watchTableModel.entries[index], WatchEntryWord):
-                settings.append(WatchSettings(entry.name, entry.description, WatchSettings.VariableType.word, entry.pattern))
+    @Slot(object)
+    def __call(self, function: typing.Callable[[], None]):
+        function()
 
-        return settings
+    def getSettings(self) -> list[WatchSettings]:
+        """ Returns the settings of the published watches (called in the GUI thread) """
+        return self.watchTableModel.getSettings()
 
     def clear(self):
-        self.watchTableModel.reset()
+        QMetaObject.invokeMethod(self, '__handleClear', Qt.ConnectionType.QueuedConnection)
+
+    def flush(self):
+        """ Publishes the pending changes now (blocks until they are published) """
+        self.__invokeInHandlerThread('__publish')
+
+    def setHistoryCapacity(self, capacity: int):
+        """ Changes the number of values kept in the history of every number watch """
+        if capacity != self.historyCapacity:
+            self.historyCapacity = capacity
+            self.__invokeInHandlerThread('__applyHistoryCapacity')
+
+    def setMaxWords(self, maxWords: int):
+        """ Changes the number of different words tracked by every word watch """
+        if maxWords != self.maxWords:
+            self.maxWords = maxWords
+            self.__invokeInHandlerThread('__applyMaxWords')
+
+    @Slot()
+    def __handleClear(self):
+        for entry in self.entries:
+            entry.reset()
+        self.__publishedSampleCounts.clear()
+        self.__dirtyIds.update(self.entries.getIds())
+        self.__publish()
+
+    @Slot()
+    def __applyHistoryCapacity(self):
+        for entry in self.entries:
+            if isinstance(entry, WatchEntryNumber):
+                entry.history.setCapacity(self.historyCapacity)
+
+    @Slot()
+    def __applyMaxWords(self):
+        for entry in self.entries:
+            if isinstance(entry, WatchEntryWord):
+                entry.setMaxWords(self.maxWords)
+
+    @Slot()
+    def __publish(self):
+        self.__publishTimer.stop()
+        samples = {}
+        for entryId in self.__dirtyIds:
+            entry = self.entries.get(entryId)
+            self.__rows[entryId] = entry.createRow()
+            if isinstance(entry, WatchEntryNumber):
+                times, values = entry.history.getSamplesSince(self.__publishedSampleCounts.get(entry.name, 0))
+                self.__publishedSampleCounts[entry.name] = entry.history.getAppendedCount()
+                if len(times) > 0:
+                    samples[entry.name] = (times, values)
+        self.__dirtyIds.clear()
+        self.signal_rowsChanged.emit(tuple(self.__rows.values()))
+        if len(samples) > 0:
+            self.signal_samplesAvailable.emit(samples)
+
+    @Slot(object)
+    def requestSamples(self, startTime: float | None):
+        """ Publishes the samples of all number watches since startTime (None: all samples) by signal_historyAvailable.
+
+        The pending changes are published before, so the following signal_samplesAvailable only contain newer samples.
+        """
+        self.__publish()
+        samples = {}
+        for entry in self.entries:
+            if isinstance(entry, WatchEntryNumber):
+                samples[entry.name] = entry.history.getSamplesNotBefore(startTime)
+        self.signal_historyAvailable.emit(samples)
+
+    @Slot(str, object)
+    def setWatchValue(self, name: str, value: list[str]):
+        entryId = self.entries.getId(name)
+        if entryId is not None:
+            self.entries.get(entryId).setValue(value[0], self.matchEngine.getRxTime())
+            self.__dirtyIds.add(entryId)
+            if not self.__publishTimer.isActive():
+                self.__publishTimer.start()
 
     @staticmethod
     def __createWatchPattern(variableName: str, pattern: str) -> str:
         return re.escape(variableName) + r"[\s:=]+" + pattern
 
-    @Slot(str)
+    def __addWatches(self, settings: list[WatchSettings]):
+        # an existing watch with the same name is replaced
+        settingsByName = {watchSettings.name: watchSettings for watchSettings in settings}
+        self.__removeWatches([self.entries.getId(name) for name in settingsByName if name in self.entries])
+
+        addedIds = []
+        watchPatterns = []
+        for watchSettings in settingsByName.values():
+            if watchSettings.variableType == WatchSettings.VariableType.number:
+                entry = WatchEntryNumber(watchSettings.name, watchSettings.pattern, self.historyCapacity)
+            elif watchSettings.variableType == WatchSettings.VariableType.word:
+                entry = WatchEntryWord(watchSettings.name, watchSettings.description, watchSettings.pattern,
+                                       self.maxWords)
+            else:
+                continue
+
+            entryId = self.entries.add(watchSettings.name, entry)
+            self.__rows[entryId] = entry.createRow()
+            addedIds.append(entryId)
+            watchPatterns.append((watchSettings.name, self.__createWatchPattern(watchSettings.name, watchSettings.pattern)))
+
+        for entryId, textExtractor in zip(addedIds, self.matchEngine.addPatterns(watchPatterns)):
+            textExtractor.signal_textExtracted.connect(self.setWatchValue)
+            self.textExtractors[entryId] = textExtractor
+
+    def __removeWatches(self, entryIds: list[int]):
+        textExtractors = []
+        for entryId in entryIds:
+            textExtractor = self.textExtractors.pop(entryId)
+            textExtractor.signal_textExtracted.disconnect(self.setWatchValue)
+            textExtractors.append(textExtractor)
+            self.__publishedSampleCounts.pop(self.entries.remove(entryId).name, None)
+            del self.__rows[entryId]
+            self.__dirtyIds.discard(entryId)
+        self.matchEngine.removePatterns(textExtractors)
+
+    @Slot(str, str, str, str)
     def createWatch(self, variableName: str, description: str, variableType: str, pattern: str):
-        varTypeSettings = WatchSettings.VariableType[variableType]
-
-        self.removeWatchByVariableName(variableName)
-
-        idx = -1
-        if varTypeSettings == WatchSettings.VariableType.number:
-            entry = WatchEntryNumber(variableName, pattern)
-            idx = self.watchTableModel.addWatchEntry(entry)
-        elif varTypeSettings == WatchSettings.VariableType.word:
-            entry = WatchEntryWord(variableName, description, pattern)
-            idx = self.watchTableModel.addWatchEntry(entry)
+        self.createWatches([WatchSettings(variableName, description, WatchSettings.VariableType[variableType], pattern)])
 
-        if idx >= 0:
-            watchPattern = self.__createWatchPattern(variableName, pattern)
-            textExtractor = StreamingTextExtractor(variableName, watchPattern)
-            self.dataSource.signal_asciiDataAvailable.connect(textExtractor.processBytesFromStream)
-            textExtractor.signal_textExtracted.connect(self.watchTableModel.setWatchValue)
-            self.textExtractors.append(textExtractor)
+    def createWatches(self, settings: list[WatchSettings]):
+        """ Creates all watches and publishes them once (one reset of the model) """
+        self.__callInHandlerThread(lambda: self.__handleCreateWatches(settings))
 
     def removeWatchByVariableName(self, variableName: str):
-        index = self.watchTableModel.getWatchIndex(variableName)
-        if index >= 0:
-            self.removeWatchByIndex(index)
+        self.__callInHandlerThread(lambda: self.__handleRemoveWatchByVariableName(variableName))
 
     @Slot(int)
     def removeWatchByIndex(self, index: int):
-        if self.watchTableModel.removeWatchEntry(index):
-            textExtractor = self.textExtractors[index]
-            self.dataSource.signal_asciiDataAvailable.disconnect(textExtractor.processBytesFromStream)
-            textExtractor.signal_textExtracted.disconnect(self.watchTableModel.setWatchValue)
-            del self.textExtractors[index]
+        self.removeWatchesByIndex([index])
+
+    @Slot(object)
+    def removeWatchesByIndex(self, indices: list[int]):
+        """ Removes the watches in the given rows and publishes the remaining watches once """
+        self.__callInHandlerThread(lambda: self.__handleRemoveWatchesByIndex(indices))
+
+    def __handleCreateWatches(self, settings: list[WatchSettings]):
+        self.__addWatches(settings)
+        self.__publish()
+
+    def __handleRemoveWatchByVariableName(self, variableName: str):
+        if variableName in self.entries:
+            self.__removeWatches([self.entries.getId(variableName)])
+            self.__publish()
+
+    def __handleRemoveWatchesByIndex(self, indices: list[int]):
+        self.__removeWatches(self.entries.getIdsOfRows(sorted(set(indices))))
+        self.__publish()
@@ -0,0 +1,146 @@
+from array import array
+import math
+
+
+class WatchHistory:
+    """ Fixed capacity ring buffer of the (time, value) samples of a numeric watch.
+
+    The samples are stored in two array('d'), which grow up to the capacity, so the memory is bounded
+    (16 bytes per sample) and append is O(1). The times must not decrease (seconds, e.g. time.time()), which allows finding
+    the start of a time window with a binary search. When the buffer is full, the oldest sample is replaced.
+    """
+    DEFAULT_CAPACITY = 100000
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self.__capacity: int = capacity
+        self.__times: array = array('d')
+        self.__values: array = array('d')
+        # physical index of the oldest sample
+        self.__start: int = 0
+        self.__size: int = 0
+        # number of samples appended since the creation (or clear), also counts the replaced ones
+        self.__appendedCount: int = 0
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def getCapacity(self) -> int:
+        return self.__capacity
+
+    def getAppendedCount(self) -> int:
+        return self.__appendedCount
+
+    def append(self, time: float, value: float):
+        if self.__size < self.__capacity:
+            # not full yet, so the oldest sample is at index 0
+            self.__times.append(time)
+            self.__values.append(value)
+            self.__size += 1
+        else:
+            self.__times[self.__start] = time
+            self.__values[self.__start] = value
+            self.__start = (self.__start + 1) % self.__capacity
+        self.__appendedCount += 1
+
+    def clear(self):
+        self.__times = array('d')
+        self.__values = array('d')
+        self.__start = 0
+        self.__size = 0
+        self.__appendedCount = 0
+
+    def setCapacity(self, capacity: int):
+        """ Changes the capacity, the newest samples are kept """
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        times, values = self.getSamples()
+        keep = min(len(times), capacity)
+        self.__capacity = capacity
+        self.__times = times[len(times) - keep:]
+        self.__values = values[len(values) - keep:]
+        self.__start = 0
+        self.__size = keep
+
+    def __slice(self, buffer: array, first: int, last: int) -> array:
+        """ Returns the samples first..last-1 (logical indices, 0 is the oldest sample) """
+        begin = (self.__start + first) % self.__capacity
+        end = begin + (last - first)
+        if end <= self.__capacity:
+            return buffer[begin:end]
+        return buffer[begin:] + buffer[:end - self.__capacity]
+
+    def __firstIndexNotBefore(self, time: float) -> int:
+        low, high = 0, self.__size
+        while low < high:
+            middle = (low + high) // 2
+            if self.__times[(self.__start + middle) % self.__capacity] < time:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def __windowStart(self, seconds: float | None) -> int:
+        if seconds is None or self.__size == 0:
+            return 0
+        return self.__firstIndexNotBefore(self.getLastTime() - seconds)
+
+    def getFirstTime(self) -> float | None:
+        return self.__times[self.__start] if self.__size > 0 else None
+
+    def getLastTime(self) -> float | None:
+        return self.__times[(self.__start + self.__size - 1) % self.__capacity] if self.__size > 0 else None
+
+    def getSamples(self, seconds: float | None = None) -> tuple[array, array]:
+        """ Returns the times and values of the last seconds (relative to the newest sample) or of all samples """
+        first = self.__windowStart(seconds)
+        return self.__slice(self.__times, first, self.__size), self.__slice(self.__values, first, self.__size)
+
+    def getSamplesNotBefore(self, time: float | None) -> tuple[array, array]:
+        """ Returns the times and values of the samples since time (all samples if None) """
+        first = 0 if time is None else self.__firstIndexNotBefore(time)
+        return self.__slice(self.__times, first, self.__size), self.__slice(self.__values, first, self.__size)
+
+    def getSamplesSince(self, appendedCount: int) -> tuple[array, array]:
+        """ Returns the samples appended after getAppendedCount() returned appendedCount (as far as still stored) """
+        newSamples = min(self.__size, max(0, self.__appendedCount - appendedCount))
+        return (self.__slice(self.__times, self.__size - newSamples, self.__size),
+                self.__slice(self.__values, self.__size - newSamples, self.__size))
+
+    def getValues(self, seconds: float | None = None) -> array:
+        return self.__slice(self.__values, self.__windowStart(seconds), self.__size)
+
+    def mean(self, seconds: float | None = None) -> float | None:
+        values = self.getValues(seconds)
+        return math.fsum(values) / len(values) if len(values) > 0 else None
+
+    def stddev(self, seconds: float | None = None) -> float | None:
+        """ Population standard deviation """
+        values = self.getValues(seconds)
+        if len(values) == 0:
+            return None
+        mean = math.fsum(values) / len(values)
+        return math.sqrt(math.fsum((value - mean) ** 2 for value in values) / len(values))
+
+    def percentile(self, percent: float, seconds: float | None = None) -> float | None:
+        """ Percentile with linear interpolation between the closest ranks (like numpy.percentile) """
+        values = sorted(self.getValues(seconds))
+        if len(values) == 0:
+            return None
+        position = (len(values) - 1) * percent / 100
+        lower = math.floor(position)
+        upper = min(lower + 1, len(values) - 1)
+        return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+    def rateOfChange(self, seconds: float | None = None) -> float | None:
+        """ Change of the value per second between the first and the last sample of the window """
+        first = self.__windowStart(seconds)
+        if self.__size - first < 2:
+            return None
+        firstIndex = (self.__start + first) % self.__capacity
+        lastIndex = (self.__start + self.__size - 1) % self.__capacity
+        duration = self.__times[lastIndex] - self.__times[firstIndex]
+        if duration <= 0:
+            return None
+        return (self.__values[lastIndex] - self.__values[firstIndex]) / duration
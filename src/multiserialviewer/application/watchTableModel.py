@@ -1,17 +1,35 @@
 from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Slot
-from typing import Optional
+from typing import Optional, NamedTuple
+import heapq
+import time
+
+from multiserialviewer.settings.watchSettings import WatchSettings
+from multiserialviewer.application.watchHistory import WatchHistory
+
+
+class WatchRow(NamedTuple):
+    """ Immutable snapshot of a watch entry (published by WatchHandler to the WatchTableModel of the GUI) """
+    name: str
+    description: str
+    variableType: WatchSettings.VariableType
+    pattern: str
+    value: str
+    tooltipPrimary: str
+    tooltipSecondary: str
 
 
 class WatchEntryNumber:
-    def __init__(self, variableName: str, pattern: str):
+    def __init__(self, variableName: str, pattern: str, historyCapacity: int = WatchHistory.DEFAULT_CAPACITY):
         self.name: str = variableName
         self.pattern: str = pattern
         self.value: Optional[float | None] = None
         self.minValue: Optional[float | None] = None
         self.maxValue: Optional[float | None] = None
         self.updateCount: int = 0
+        # (rx time, value) of the last historyCapacity values
+        self.history: WatchHistory = WatchHistory(historyCapacity)
 
-    def setValue(self, value: str):
+    def setValue(self, value: str, rxTime: float | None = None):
         try:
             self.value = float(value)
         except ValueError:
@@ -20,6 +38,13 @@ class WatchEntryNumber:
             self.minValue = self.value if self.minValue is None else min(self.minValue, self.value)
             self.maxValue = self.value if self.maxValue is None else max(self.maxValue, self.value)
             self.updateCount += 1
+            if rxTime is None:
+                rxTime = time.time()
+            lastTime = self.history.getLastTime()
+            if lastTime is not None and rxTime < lastTime:
+                # the times of the history must not decrease (e.g. the system clock was set back)
+                rxTime = lastTime
+            self.history.append(rxTime, self.value)
 
     def getValue(self):
         return '' if self.value is None else str(self.value)
@@ -29,6 +54,7 @@ class WatchEntryNumber:
         self.minValue = None
         self.maxValue = None
         self.updateCount = 0
+        self.history.clear()
 
     def getTooltipPrimary(self):
         if self.updateCount > 0:
@@ -44,29 +70,70 @@ class WatchEntryNumber:
             toolTips.append(f"Max: {str(self.maxValue)}")
         return '\n'.join(toolTips)
 
+    def createRow(self) -> WatchRow:
+        return WatchRow(self.name, '', WatchSettings.VariableType.number, self.pattern,
+                        self.getValue(), self.getTooltipPrimary(), self.getTooltipSecondary())
+
+
+class WordStatistics:
+    def __init__(self, time: float):
+        self.count: int = 0
+        self.firstSeen: float = time
+        self.lastSeen: float = time
+
 
 class WatchEntryWord:
-    def __init__(self, variableName: str, description: str, pattern: str):
+    """ Tracks the received words of a watch (e.g. the states of a state machine).
+
+    Per word the number of receptions and the time it was seen first and last is kept, in the order of
+    the first reception. Only the first maxWords different words are tracked; further words are only
+    counted in droppedWordCount. Changes from one word to another are counted in transitionCounts
+    ((from, to) -> count), so the statistics of a state machine are available without processing the trace again.
+    """
+    DEFAULT_MAX_WORDS = 100
+    TOOLTIP_MAX_TRANSITIONS = 5
+
+    def __init__(self, variableName: str, description: str, pattern: str, maxWords: int = DEFAULT_MAX_WORDS):
         self.name: str = variableName
         self.description: str = description
         self.pattern: str = pattern
+        self.maxWords: int = maxWords
         self.value: Optional[str | None] = None
-        self.receivedWords: list[str] = []
         self.updateCount: int = 0
-
-    def setValue(self, value: str):
+        self.receivedWords: dict[str, WordStatistics] = {}
+        self.droppedWordCount: int = 0
+        self.transitionCounts: dict[tuple[str, str], int] = {}
+
+    def setValue(self, value: str, rxTime: float | None = None):
+        now = time.time() if rxTime is None else rxTime
+        statistics = self.receivedWords.get(value)
+        if statistics is None and len(self.receivedWords) < self.maxWords:
+            statistics = WordStatistics(now)
+            self.receivedWords[value] = statistics
+        if statistics is not None:
+            statistics.count += 1
+            statistics.lastSeen = now
+            if self.value != value and self.value in self.receivedWords:
+                transition = (self.value, value)
+                self.transitionCounts[transition] = self.transitionCounts.get(transition, 0) + 1
+        else:
+            self.droppedWordCount += 1
         self.value = value
-        if value not in self.receivedWords:
-            self.receivedWords.append(value)
         self.updateCount += 1
 
+    def setMaxWords(self, maxWords: int):
+        """ The words tracked already are kept, the limit applies to the words received first after the change """
+        self.maxWords = maxWords
+
     def getValue(self):
         return '' if self.value is None else self.value
 
     def reset(self):
         self.value = None
-        self.receivedWords = []
         self.updateCount = 0
+        self.receivedWords = {}
+        self.droppedWordCount = 0
+        self.transitionCounts = {}
 
     def getTooltipPrimary(self):
         hint = f"Recognized words: {self.description}"
@@ -76,38 +143,52 @@ class WatchEntryWord:
             return hint
 
     def getTooltipSecondary(self):
-        if len(self.receivedWords) > 0:
-            words = ', '.join(self.receivedWords)
-            return f"Received words '{words}'"
-        else:
+        if len(self.receivedWords) == 0:
             return ""
+        words = ', '.join(f"{word} ({statistics.count})" for word, statistics in self.receivedWords.items())
+        toolTips = [f"Received words '{words}'"]
+        if self.droppedWordCount > 0:
+            toolTips.append(f"Not tracked (more than {self.maxWords} words): {self.droppedWordCount}")
+        if len(self.transitionCounts) > 0:
+            transitions = heapq.nlargest(WatchEntryWord.TOOLTIP_MAX_TRANSITIONS, self.transitionCounts.items(),
+                                         key=lambda item: item[1])
+            toolTips.append('Transitions: ' + ', '.join(f"{first} -> {second} ({count})"
+                                                        for (first, second), count in transitions))
+        return '\n'.join(toolTips)
+
+    def createRow(self) -> WatchRow:
+        return WatchRow(self.name, self.description, WatchSettings.VariableType.word, self.pattern,
+                        self.getValue(), self.getTooltipPrimary(), self.getTooltipSecondary())
+
 
 class WatchTableModel(QAbstractTableModel):
+    """ Shows the watches in the GUI thread. The rows are snapshots published by WatchHandler (see setRows). """
+
     def __init__(self):
         QAbstractTableModel.__init__(self)
 
-        self.entries: list[WatchEntryNumber | WatchEntryWord] = []
-        self.nameToIndex: dict[str, int] = {}
-
-    def __removeNameByIndex(self, index: int):
-        for p, i in self.nameToIndex.items():
-            if i == index:
-                del self.nameToIndex[p]
-                break
-        # adjust indices
-        for p in self.nameToIndex.keys():
-            if self.nameToIndex[p] > index:
-                self.nameToIndex[p] -= 1
-
-    @Slot()
-    def setWatchValue(self, name: str, value: list[str]):
-        if name in self.nameToIndex:
-            rowIndex = self.nameToIndex[name]
-            self.entries[rowIndex].setValue(value[0])
-            self.dataChanged.emit(self.index(rowIndex, 1), self.index(rowIndex, 1))
+        self.rows: tuple[WatchRow, ...] = ()
+
+    @Slot(object)
+    def setRows(self, rows: tuple[WatchRow, ...]):
+        if [row.name for row in rows] != [row.name for row in self.rows]:
+            # watches were created or removed
+            self.beginResetModel()
+            self.rows = rows
+            self.endResetModel()
+            return
+
+        changed = [index for index, row in enumerate(rows) if row != self.rows[index]]
+        self.rows = rows
+        if len(changed) > 0:
+            # one merged notification for all changed rows (the tooltip of the name shows the update count)
+            self.dataChanged.emit(self.index(changed[0], 0), self.index(changed[-1], 1))
+
+    def getSettings(self) -> list[WatchSettings]:
+        return [WatchSettings(row.name, row.description, row.variableType, row.pattern) for row in self.rows]
 
     def rowCount(self, parent=QModelIndex()):
-        return len(self.entries)
+        return len(self.rows)
 
     def columnCount(self, parent=QModelIndex()):
         return 2  # name and value
@@ -126,46 +207,13 @@ class WatchTableModel(QAbstractTableModel):
 
         if role == Qt.ItemDataRole.DisplayRole:
             if column == 0:
-                return self.entries[row].name
+                return self.rows[row].name
             elif column == 1:
-                return self.entries[row].getValue()
+                return self.rows[row].value
 
         if role == Qt.ItemDataRole.ToolTipRole:
             if column == 0:
-                return self.entries[row].getTooltipPrimary()
+                return self.rows[row].tooltipPrimary
             elif column == 1:
-                return self.entries[row].getTooltipSecondary()
+                return self.rows[row].tooltipSecondary
         return None
-
-    def reset(self):
-        for idx, entry in enumerate(self.entries):
-            entry.reset()
-        self.dataChanged.emit(self.index(0, 1), self.index(len(self.entries)-1, 1))
-
-    def addWatchEntry(self, entry: WatchEntryNumber | WatchEntryWord) -> int:
-        rowIdx = -1
-
-        if entry.name not in self.nameToIndex.keys():
-            rowIdx = len(self.entries)
-            self.beginInsertRows(QModelIndex(), rowIdx, rowIdx)
-            self.nameToIndex[entry.name] = rowIdx
-            self.entries.append(entry)
-            self.endInsertRows()
-
-        return rowIdx
-
-    def getWatchIndex(self, variableName: str) -> int:
-        if variableName in self.nameToIndex.keys():
-            return self.nameToIndex[variableName]
-        else:
-            return -1
-
-    def removeWatchEntry(self, index: int) -> bool:
-        if index < len(self.entries):
-            self.beginRemoveRows(QModelIndex(), index, index)
-            self.__removeNameByIndex(index)
-            del self.entries[index]
-            self.endRemoveRows()
-            return True
-        else:
-            return False
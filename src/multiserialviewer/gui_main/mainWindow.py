@@ -109,6 +109,7 @@ class MainWindow(QMainWindow):
         view = SerialViewerWindow(view_title, self.iconSet)
         view.setHighlighterSettings(highlighterSettings)
         view.signal_createTextHighlightEntry.connect(self.signal_createTextHighlightEntry)
+        view.signal_rehighlightProgress.connect(lambda percent: self.showRehighlightProgress(view.windowTitle(), percent))
 
         if size:
             view.resize(size)
@@ -148,6 +149,19 @@ class MainWindow(QMainWindow):
             self.actions['capture'].setIcon(self.iconSet.getCaptureStartIcon())
             self.actions['capture'].setText('Start Capture')
 
+    def showCapturePortResult(self, portName: str, opened: bool, pendingCount: int):
+        result = 'Opened' if opened else 'Failed to open'
+        if pendingCount > 0:
+            self.statusBar().showMessage(f'{result} {portName} ({pendingCount} ports pending)')
+        else:
+            self.statusBar().showMessage(f'{result} {portName}', 2000)
+
+    def showRehighlightProgress(self, viewTitle: str, percent: int):
+        if percent < 100:
+            self.statusBar().showMessage(f'Highlighting {viewTitle}: {percent} %')
+        else:
+            self.statusBar().showMessage(f'Highlighting {viewTitle}: done', 2000)
+
     def closeEvent(self, event):
         self.signal_aboutToBeClosed.emit()
         event.accept()
@@ -26,6 +26,7 @@ class SettingsDialog(QDialog):
         self.__init(self.settings)
 
         self.widget.ed_timestampFormat.textChanged.connect(self.validateTimestampFormat)
+        self.widget.cb_timestampMode.currentIndexChanged.connect(self.updateEnableState_timestampFormat)
 
         #
         # text highlighter
@@ -69,6 +70,10 @@ class SettingsDialog(QDialog):
     def __init(self, settings: Settings):
         self.widget.cb_restoreCaptureState.setCheckState(
             Qt.CheckState.Checked if settings.application.values.restoreCaptureState else Qt.CheckState.Unchecked)
+        self.widget.cb_startCaptureAllOrNothing.setCheckState(
+            Qt.CheckState.Checked if settings.application.values.startCaptureAllOrNothing else Qt.CheckState.Unchecked)
+        self.widget.cb_recordRawData.setCheckState(
+            Qt.CheckState.Checked if settings.application.values.recordRawData else Qt.CheckState.Unchecked)
         self.widget.cb_showNonPrintableAsHex.setCheckState(
             Qt.CheckState.Checked if settings.application.values.showNonPrintableCharsAsHex else Qt.CheckState.Unchecked)
         self.widget.cb_backspaceDeletesLastLine.setCheckState(
@@ -76,9 +81,22 @@ class SettingsDialog(QDialog):
 
         self.widget.cb_showTimestamp.setCheckState(
             Qt.CheckState.Checked if settings.application.values.showTimestamp else Qt.CheckState.Unchecked)
+        self.widget.cb_timestampMode.clear()
+        self.widget.cb_timestampMode.addItem("Time of day", userData=ApplicationSettings.TimestampMode.timeOfDay)
+        self.widget.cb_timestampMode.addItem("Elapsed ms", userData=ApplicationSettings.TimestampMode.elapsedMs)
+        if (index := self.widget.cb_timestampMode.findData(settings.application.values.timestampMode)) >= 0:
+            self.widget.cb_timestampMode.setCurrentIndex(index)
+        self.updateEnableState_timestampFormat()
         self.widget.ed_timestampFormat.setPlaceholderText(ApplicationSettings.DEFAULT_TIMESTAMP_FORMAT)
         self.widget.ed_timestampFormat.setText(settings.application.values.timestampFormat)
 
+        self.widget.sb_scrollbackMaxLines.setValue(settings.application.values.scrollbackMaxLines)
+        self.widget.sb_scrollbackMaxCharacters.setValue(settings.application.values.scrollbackMaxCharacters)
+        self.widget.sb_watchHistorySize.setValue(settings.application.values.watchHistorySize)
+        self.widget.sb_watchMaxWords.setValue(settings.application.values.watchMaxWords)
+        self.widget.cb_scrollbackSpillToDisk.setCheckState(
+            Qt.CheckState.Checked if settings.application.values.scrollbackSpillToDisk else Qt.CheckState.Unchecked)
+
         self.tableModel = TextHighlighterTableModel(settings.textHighlighter.entries)
         self.widget.tableView.setModel(self.tableModel)
         selectionModel: QItemSelectionModel = self.widget.tableView.selectionModel()
@@ -95,10 +113,13 @@ class SettingsDialog(QDialog):
     @Slot()
     def applyChanges(self):
         self.settings.application.values.restoreCaptureState = self.widget.cb_restoreCaptureState.checkState() == Qt.CheckState.Checked
+        self.settings.application.values.startCaptureAllOrNothing = self.widget.cb_startCaptureAllOrNothing.checkState() == Qt.CheckState.Checked
+        self.settings.application.values.recordRawData = self.widget.cb_recordRawData.checkState() == Qt.CheckState.Checked
         self.settings.application.values.showNonPrintableCharsAsHex = self.widget.cb_showNonPrintableAsHex.checkState() == Qt.CheckState.Checked
         self.settings.application.values.backspaceDeletesLastLine = self.widget.cb_backspaceDeletesLastLine.checkState() == Qt.CheckState.Checked
 
         self.settings.application.values.showTimestamp = self.widget.cb_showTimestamp.checkState() == Qt.CheckState.Checked
+        self.settings.application.values.timestampMode = self.widget.cb_timestampMode.currentData()
         try:
             timestampFormat = self.widget.ed_timestampFormat.text()
             datetime.strftime(datetime.now(), timestampFormat)
@@ -108,9 +129,22 @@ class SettingsDialog(QDialog):
         except ValueError:
             self.settings.application.values.timestampFormat = ApplicationSettings.DEFAULT_TIMESTAMP_FORMAT
 
+        self.settings.application.values.scrollbackMaxLines = self.widget.sb_scrollbackMaxLines.value()
+        self.settings.application.values.scrollbackMaxCharacters = self.widget.sb_scrollbackMaxCharacters.value()
+        self.settings.application.values.watchHistorySize = self.widget.sb_watchHistorySize.value()
+        self.settings.application.values.watchMaxWords = self.widget.sb_watchMaxWords.value()
+        self.settings.application.values.scrollbackSpillToDisk = self.widget.cb_scrollbackSpillToDisk.checkState() == Qt.CheckState.Checked
+
         self.settings.textHighlighter.entries = self.tableModel.settings
         self.accept()
 
+    @Slot()
+    def updateEnableState_timestampFormat(self):
+        # the format is only used for the time of day
+        enabled = self.widget.cb_timestampMode.currentData() == ApplicationSettings.TimestampMode.timeOfDay
+        self.widget.ed_timestampFormat.setEnabled(enabled)
+        self.widget.lb_validationResult.setEnabled(enabled)
+
     @Slot(str)
     def validateTimestampFormat(self, timestampFormat: str):
         try:
@@ -6,7 +6,7 @@ import re
 
 class CounterWidget(QWidget):
     signal_createCounter: Signal = Signal(str)
-    signal_removeCounter: Signal = Signal(int)
+    signal_removeCounters: Signal = Signal(object)
 
     def __init__(self, parent: QWidget | None):
         super().__init__(parent)
@@ -60,6 +60,6 @@ class CounterWidget(QWidget):
     @Slot()
     def handleDeleteSelectedButtonClick(self):
         selected_model_indices = [modelIndex.row() for modelIndex in self.widget.tableView.selectionModel().selectedRows()]
-
-        for index in sorted(selected_model_indices, reverse=True):
-            self.signal_removeCounter.emit(index)
+        if len(selected_model_indices) > 0:
+            # removed at once (one reset of the model)
+            self.signal_removeCounters.emit(sorted(selected_model_indices))
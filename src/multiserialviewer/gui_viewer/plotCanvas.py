@@ -0,0 +1,279 @@
+from PySide6.QtCore import Qt, QPointF, QRectF, Signal
+from PySide6.QtGui import QPainter, QPen, QColor, QPaintEvent
+from PySide6.QtWidgets import QWidget
+from array import array
+from bisect import bisect_left
+import math
+
+from multiserialviewer.application.watchHistory import WatchHistory
+
+
+class PlotSeries:
+    """ Min/max decimation of the samples of a number watch for a PlotCanvas.
+
+    The time axis is divided into buckets of bucketSeconds (aligned to multiples of bucketSeconds). Per
+    bucket the first, min, max and last value is kept, which is enough to draw the signal without losing
+    peaks (min/max downsampling). The samples themselves are not kept (the history is kept by the WatchHandler):
+    new samples only update the last bucket or append new ones, and wider buckets are built by merging the
+    buckets. Narrower buckets or buckets before the covered time need the samples again (see needsSamples).
+    """
+    # the bucket width is doubled, if there are more buckets (e.g. while the canvas is hidden)
+    MAX_BUCKETS = 4096
+
+    def __init__(self, capacity: int = WatchHistory.DEFAULT_CAPACITY):
+        # samples, which are aggregated with the next update (the bucket width is not known yet)
+        self.pending: WatchHistory = WatchHistory(capacity)
+        self.firstTime: float | None = None
+        self.lastTime: float | None = None
+
+        self.__bucketSeconds: float = 0.0
+        # all samples since this time are aggregated (or pending)
+        self.__coveredTime: float = -math.inf
+        self.bucketIndices: array = array('q')
+        self.firsts: array = array('d')
+        self.mins: array = array('d')
+        self.maxs: array = array('d')
+        self.lasts: array = array('d')
+
+    def getBucketSeconds(self) -> float:
+        return self.__bucketSeconds
+
+    def hasSamples(self) -> bool:
+        return self.lastTime is not None
+
+    def addSamples(self, times: array, values: array):
+        if len(times) == 0:
+            return
+        if self.firstTime is None:
+            self.firstTime = times[0]
+        self.lastTime = times[-1]
+        if self.__bucketSeconds > 0:
+            self.__aggregate(times, values)
+            while len(self.bucketIndices) > PlotSeries.MAX_BUCKETS:
+                self.__mergeBuckets(2)
+        else:
+            for index in range(len(times)):
+                self.pending.append(times[index], values[index])
+
+    def setSamples(self, times: array, values: array, startTime: float | None):
+        """ Replaces the buckets by the samples since startTime (None: all samples) """
+        self.clear()
+        self.__coveredTime = -math.inf if startTime is None else startTime
+        self.addSamples(times, values)
+
+    def clear(self):
+        self.pending.clear()
+        self.firstTime = None
+        self.lastTime = None
+        self.__bucketSeconds = 0.0
+        self.__coveredTime = -math.inf
+        self.__clearBuckets()
+
+    def __clearBuckets(self):
+        self.bucketIndices = array('q')
+        self.firsts = array('d')
+        self.mins = array('d')
+        self.maxs = array('d')
+        self.lasts = array('d')
+
+    def __aggregate(self, times: array, values: array):
+        bucketSeconds = self.__bucketSeconds
+        position = 0
+        while position < len(times):
+            bucketIndex = math.floor(times[position] / bucketSeconds)
+            # times are sorted, so the samples of a bucket are found with a binary search
+            end = bisect_left(times, (bucketIndex + 1) * bucketSeconds, position)
+            end = max(end, position + 1)
+            segment = values[position:end]
+            if len(self.bucketIndices) > 0 and self.bucketIndices[-1] == bucketIndex:
+                self.mins[-1] = min(self.mins[-1], min(segment))
+                self.maxs[-1] = max(self.maxs[-1], max(segment))
+                self.lasts[-1] = segment[-1]
+            else:
+                self.bucketIndices.append(bucketIndex)
+                self.firsts.append(segment[0])
+                self.mins.append(min(segment))
+                self.maxs.append(max(segment))
+                self.lasts.append(segment[-1])
+            position = end
+
+    def __mergeBuckets(self, factor: int):
+        """ Multiplies the bucket width by factor (the buckets are aligned, so factor buckets become one) """
+        bucketIndices, firsts, mins, maxs, lasts = array('q'), array('d'), array('d'), array('d'), array('d')
+        for bucket in range(len(self.bucketIndices)):
+            bucketIndex = self.bucketIndices[bucket] // factor
+            if len(bucketIndices) > 0 and bucketIndices[-1] == bucketIndex:
+                mins[-1] = min(mins[-1], self.mins[bucket])
+                maxs[-1] = max(maxs[-1], self.maxs[bucket])
+                lasts[-1] = self.lasts[bucket]
+            else:
+                bucketIndices.append(bucketIndex)
+                firsts.append(self.firsts[bucket])
+                mins.append(self.mins[bucket])
+                maxs.append(self.maxs[bucket])
+                lasts.append(self.lasts[bucket])
+        self.bucketIndices, self.firsts, self.mins, self.maxs, self.lasts = bucketIndices, firsts, mins, maxs, lasts
+        self.__bucketSeconds *= factor
+
+    def __dropBucketsBefore(self, startTime: float):
+        first = bisect_left(self.bucketIndices, math.floor(startTime / self.__bucketSeconds))
+        if first > 0:
+            for buffer in (self.bucketIndices, self.firsts, self.mins, self.maxs, self.lasts):
+                del buffer[:first]
+            self.__coveredTime = max(self.__coveredTime, math.floor(startTime / self.__bucketSeconds) * self.__bucketSeconds)
+
+    def needsSamples(self, bucketSeconds: float, startTime: float | None) -> bool:
+        """ Returns True, if the buckets from startTime (None: all) of bucketSeconds can not be built without the samples """
+        if startTime is None:
+            notCovered = self.__coveredTime > -math.inf
+        else:
+            notCovered = startTime < self.__coveredTime
+        narrower = len(self.bucketIndices) > 0 and bucketSeconds < self.__bucketSeconds
+        return notCovered or narrower
+
+    def updateBuckets(self, bucketSeconds: float, startTime: float):
+        """ Brings the buckets up to the bucket width and drops the buckets before startTime.
+
+        Narrower buckets can not be built from the buckets, they are kept until the samples are set again.
+        """
+        if len(self.bucketIndices) == 0:
+            self.__bucketSeconds = bucketSeconds
+        elif bucketSeconds > self.__bucketSeconds:
+            self.__mergeBuckets(round(bucketSeconds / self.__bucketSeconds))
+        if len(self.pending) > 0:
+            times, values = self.pending.getSamples()
+            self.pending.clear()
+            self.__aggregate(times, values)
+        self.__dropBucketsBefore(startTime)
+
+
+class PlotCanvas(QWidget):
+    """ Draws PlotSeries over time (the newest sample is at the right border).
+
+    If the buckets of a series can not be built without the samples, the samples of the time range are requested
+    with signal_samplesRequested (start time, None: all samples) and set with setSamples.
+    """
+    signal_samplesRequested: Signal = Signal(object)
+
+    COLORS = ['#1f77b4', '#d62728', '#2ca02c', '#ff7f0e', '#9467bd', '#8c564b', '#e377c2', '#17becf']
+    MARGIN = 6
+
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.series: dict[str, PlotSeries] = {}
+        self.visibleSeries: list[str] = []
+        # None: all samples
+        self.windowSeconds: float | None = 60.0
+        self.setMinimumHeight(150)
+
+        self.__samplesRequested: bool = False
+        self.__requestedStartTime: float | None = None
+        # the series were changed while samples were requested (e.g. cleared), the samples are requested again
+        self.__samplesOutdated: bool = False
+
+    @staticmethod
+    def getBucketSeconds(windowSeconds: float, width: int) -> float:
+        """ Returns the bucket width: at least one pixel, rounded up to a power of two (stable while the window scrolls) """
+        return 2.0 ** math.ceil(math.log2(max(windowSeconds, 1e-6) / max(width, 1)))
+
+    def invalidateSamples(self):
+        """ Requests the samples again with the next redraw (e.g. the history was changed) """
+        self.__samplesOutdated = True
+
+    def clear(self):
+        for series in self.series.values():
+            series.clear()
+        if self.__samplesRequested:
+            self.invalidateSamples()
+
+    def setSamples(self, samples: dict):
+        """ Sets the requested samples of all series (dict of name -> (times, values)) """
+        self.__samplesRequested = False
+        for name, series in self.series.items():
+            times, values = samples.get(name, (array('d'), array('d')))
+            series.setSamples(times, values, self.__requestedStartTime)
+
+    def __requestSamples(self, startTime: float | None):
+        self.__samplesRequested = True
+        self.__samplesOutdated = False
+        self.__requestedStartTime = startTime
+        self.signal_samplesRequested.emit(startTime)
+
+    def __getTimeRange(self, series: list[PlotSeries]) -> tuple[float, float] | None:
+        lastTimes = [s.lastTime for s in series if s.hasSamples()]
+        if len(lastTimes) == 0:
+            return None
+        endTime = max(lastTimes)
+        if self.windowSeconds is not None:
+            return endTime - self.windowSeconds, endTime
+        firstTimes = [s.firstTime for s in series if s.hasSamples()]
+        return min(firstTimes), endTime
+
+    def paintEvent(self, event: QPaintEvent):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().base())
+        series = [self.series[name] for name in self.visibleSeries if name in self.series]
+        timeRange = self.__getTimeRange(series)
+        if timeRange is None:
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, 'No values')
+            return
+
+        fontHeight = self.fontMetrics().height()
+        plotRect = QRectF(self.rect()).adjusted(PlotCanvas.MARGIN, PlotCanvas.MARGIN + fontHeight,
+                                                 -PlotCanvas.MARGIN, -PlotCanvas.MARGIN - fontHeight)
+        startTime, endTime = timeRange
+        duration = max(endTime - startTime, 1e-6)
+        bucketSeconds = PlotCanvas.getBucketSeconds(duration, int(plotRect.width()))
+
+        if not self.__samplesRequested:
+            windowStartTime = None if self.windowSeconds is None else startTime
+            if self.__samplesOutdated or any(s.needsSamples(bucketSeconds, windowStartTime) for s in series):
+                self.__requestSamples(None if windowStartTime is None else
+                                      math.floor(windowStartTime / bucketSeconds) * bucketSeconds)
+
+        minValue, maxValue = math.inf, -math.inf
+        for s in series:
+            s.updateBuckets(bucketSeconds, startTime)
+            if len(s.mins) > 0:
+                minValue = min(minValue, min(s.mins))
+                maxValue = max(maxValue, max(s.maxs))
+        if minValue == maxValue:
+            minValue -= 1
+            maxValue += 1
+
+        painter.setPen(self.palette().mid().color())
+        painter.drawRect(plotRect)
+        painter.setPen(self.palette().text().color())
+        painter.drawText(QRectF(plotRect.left(), plotRect.bottom(), plotRect.width(), fontHeight),
+                         Qt.AlignmentFlag.AlignLeft, f'-{duration:.4g} s')
+        painter.drawText(QRectF(plotRect.left(), plotRect.bottom(), plotRect.width(), fontHeight),
+                         Qt.AlignmentFlag.AlignRight, 'latest')
+        painter.drawText(QRectF(plotRect.left(), 0, plotRect.width(), fontHeight + PlotCanvas.MARGIN),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignBottom, f'{maxValue:.6g}')
+
+        xScale = plotRect.width() / duration
+        yScale = plotRect.height() / (maxValue - minValue)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        legendX = plotRect.right()
+        for index, name in enumerate(name for name in self.visibleSeries if name in self.series):
+            s = self.series[name]
+            color = QColor(PlotCanvas.COLORS[index % len(PlotCanvas.COLORS)])
+            painter.setPen(QPen(color, 1))
+            points = []
+            # wider than bucketSeconds, while the samples for narrower buckets are requested
+            seriesBucketSeconds = s.getBucketSeconds()
+            for bucket in range(len(s.bucketIndices)):
+                x = plotRect.left() + ((s.bucketIndices[bucket] + 0.5) * seriesBucketSeconds - startTime) * xScale
+                for value in (s.firsts[bucket], s.mins[bucket], s.maxs[bucket], s.lasts[bucket]):
+                    points.append(QPointF(x, plotRect.bottom() - (value - minValue) * yScale))
+            if len(points) > 0:
+                painter.drawPolyline(points)
+
+            textWidth = self.fontMetrics().horizontalAdvance(name)
+            legendX -= textWidth
+            painter.drawText(QRectF(legendX, 0, textWidth, fontHeight + PlotCanvas.MARGIN),
+                             Qt.AlignmentFlag.AlignBottom, name)
+            legendX -= PlotCanvas.MARGIN
+        painter.setPen(self.palette().text().color())
+        painter.drawText(QRectF(plotRect.left(), plotRect.bottom() - fontHeight, plotRect.width(), fontHeight),
+                         Qt.AlignmentFlag.AlignLeft, f'{minValue:.6g}')
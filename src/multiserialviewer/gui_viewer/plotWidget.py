@@ -0,0 +1,126 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QListWidgetItem
+from PySide6.QtCore import Qt, Slot, QTimer
+
+from multiserialviewer.ui_files.uiFileHelper import createWidgetFromUiFile
+from multiserialviewer.gui_viewer.plotCanvas import PlotCanvas, PlotSeries
+from multiserialviewer.application.watchHistory import WatchHistory
+from multiserialviewer.settings.watchSettings import WatchSettings
+
+
+class PlotWidget(QWidget):
+    """ Plots the values of the number watches over time.
+
+    The samples are published by WatchHandler (see addSamples) and decimated in a PlotSeries per watch.
+    The samples needed again (e.g. for a larger time window) are requested by canvas.signal_samplesRequested.
+    The canvas is redrawn with at most MAX_REDRAW_RATE frames per second.
+    """
+    # None: all values (of the history)
+    TIME_WINDOWS = {'10 s': 10.0, '1 min': 60.0, '10 min': 600.0, '1 h': 3600.0, 'All': None}
+    DEFAULT_TIME_WINDOW = '1 min'
+    MAX_REDRAW_RATE = 20
+
+    def __init__(self, parent: QWidget | None):
+        super().__init__(parent)
+        self.widget = createWidgetFromUiFile("plotWidget.ui")
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0,0,0,0)
+        layout.addWidget(self.widget)
+
+        self.canvas: PlotCanvas = self.widget.plotCanvas
+        self.historyCapacity: int = WatchHistory.DEFAULT_CAPACITY
+        self.__watchTableModel = None
+        self.__hiddenWatches: set[str] = set()
+
+        self.__redrawTimer: QTimer = QTimer(self)
+        self.__redrawTimer.setSingleShot(True)
+        self.__redrawTimer.setInterval(1000 // PlotWidget.MAX_REDRAW_RATE)
+        self.__redrawTimer.timeout.connect(self.canvas.update)
+
+        self.widget.cb_timeWindow.addItems(list(PlotWidget.TIME_WINDOWS.keys()))
+        self.widget.cb_timeWindow.currentTextChanged.connect(self.handleTimeWindowChanged)
+        self.widget.cb_timeWindow.setCurrentText(PlotWidget.DEFAULT_TIME_WINDOW)
+        self.widget.lw_watches.itemChanged.connect(self.handleWatchItemChanged)
+
+    def setWatchTableModel(self, model):
+        self.__watchTableModel = model
+        model.modelReset.connect(self.updateWatchList)
+        self.updateWatchList()
+
+    def setHistoryCapacity(self, capacity: int):
+        if capacity != self.historyCapacity:
+            self.historyCapacity = capacity
+            for series in self.canvas.series.values():
+                series.pending.setCapacity(capacity)
+            # the plot shows the samples of the history
+            self.canvas.invalidateSamples()
+            self.scheduleRedraw()
+
+    @Slot()
+    def updateWatchList(self):
+        names = [row.name for row in self.__watchTableModel.rows
+                 if row.variableType == WatchSettings.VariableType.number]
+
+        for name in list(self.canvas.series.keys()):
+            if name not in names:
+                del self.canvas.series[name]
+        self.__hiddenWatches &= set(names)
+
+        listWidget = self.widget.lw_watches
+        listWidget.blockSignals(True)
+        listWidget.clear()
+        for name in names:
+            item = QListWidgetItem(name, listWidget)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Unchecked if name in self.__hiddenWatches else Qt.CheckState.Checked)
+        listWidget.blockSignals(False)
+        self.__updateVisibleSeries()
+
+    def __updateVisibleSeries(self):
+        listWidget = self.widget.lw_watches
+        self.canvas.visibleSeries = [listWidget.item(row).text() for row in range(listWidget.count())
+                                     if listWidget.item(row).checkState() == Qt.CheckState.Checked]
+        self.scheduleRedraw()
+
+    @Slot(QListWidgetItem)
+    def handleWatchItemChanged(self, item: QListWidgetItem):
+        if item.checkState() == Qt.CheckState.Checked:
+            self.__hiddenWatches.discard(item.text())
+        else:
+            self.__hiddenWatches.add(item.text())
+        self.__updateVisibleSeries()
+
+    @Slot(str)
+    def handleTimeWindowChanged(self, text: str):
+        self.canvas.windowSeconds = PlotWidget.TIME_WINDOWS[text]
+        self.scheduleRedraw()
+
+    @Slot(object)
+    def addSamples(self, samples: dict):
+        """ Adds the new samples of the number watches (dict of name -> (times, values)) """
+        for name, (times, values) in samples.items():
+            series = self.canvas.series.get(name)
+            if series is None:
+                series = PlotSeries(self.historyCapacity)
+                self.canvas.series[name] = series
+            series.addSamples(times, values)
+        self.scheduleRedraw()
+
+    @Slot(object)
+    def setSamples(self, samples: dict):
+        """ Sets the samples requested by canvas.signal_samplesRequested (dict of name -> (times, values)) """
+        for name in samples:
+            if name not in self.canvas.series:
+                self.canvas.series[name] = PlotSeries(self.historyCapacity)
+        self.canvas.setSamples(samples)
+        self.scheduleRedraw()
+
+    @Slot()
+    def scheduleRedraw(self):
+        if not self.__redrawTimer.isActive():
+            self.__redrawTimer.start()
+
+    @Slot()
+    def clear(self):
+        self.canvas.clear()
+        self.scheduleRedraw()
@@ -13,10 +13,60 @@ class SerialViewerTextEdit(QTextEdit):
     signal_createCounterFromSelectedText: Signal = Signal(str)
     signal_mousePressed: Signal = Signal(QPoint)
     signal_wheelEvent: Signal = Signal(QPoint)
+    # text of the lines removed by the scrollback limit (only emitted, if enabled by setScrollbackLimit)
+    signal_textRemoved: Signal = Signal(str)
 
     def __init__(self, parent: QWidget):
         super(SerialViewerTextEdit, self).__init__(parent)
         self.iconSet: typing.Optional[IconSet] = None
+        self.__maxLines: int = 0
+        self.__maxCharacters: int = 0
+        self.__emitRemovedText: bool = False
+
+    def setScrollbackLimit(self, maxLines: int, maxCharacters: int = 0, emitRemovedText: bool = False):
+        """ Limits the number of lines and characters kept in the document (0 means unlimited). If emitRemovedText
+        is set, the text of the removed lines is emitted with signal_textRemoved. """
+        self.__maxLines = maxLines
+        self.__maxCharacters = maxCharacters
+        self.__emitRemovedText = emitRemovedText
+        self.__removeOldestLines()
+
+    def __getScrollbackCutPosition(self) -> int:
+        # text is removed in batches (10% of the limit), so this is not done for every received line
+        document = self.document()
+        position = 0
+        if self.__maxLines > 0 and document.blockCount() > self.__maxLines + self.__maxLines // 10:
+            position = document.findBlockByNumber(document.blockCount() - self.__maxLines).position()
+        if self.__maxCharacters > 0 and document.characterCount() > self.__maxCharacters + self.__maxCharacters // 10:
+            characterPosition = document.characterCount() - self.__maxCharacters
+            block = document.findBlock(characterPosition)
+            # whole lines are removed, only a line longer than the limit (e.g. no line breaks received) is cut
+            if block.position() < characterPosition and block.next().isValid():
+                characterPosition = block.next().position()
+            position = max(position, characterPosition)
+        return position
+
+    def __removeOldestLines(self):
+        position = self.__getScrollbackCutPosition()
+        if position <= 0:
+            return
+
+        document = self.document()
+        cursor: QTextCursor = QTextCursor(document)
+        cursor.setPosition(position)
+        table = cursor.currentTable()
+        if table is not None:
+            # do not cut a start/stop/error message in half
+            cursor.setPosition(table.lastPosition() + 1)
+        removedHeight = document.documentLayout().blockBoundingRect(cursor.block()).top()
+        cursor.setPosition(0, QTextCursor.MoveMode.KeepAnchor)
+        if self.__emitRemovedText:
+            self.signal_textRemoved.emit(cursor.selection().toPlainText())
+        cursor.removeSelectedText()
+
+        # keep the currently visible text in place (if autoscroll is not active)
+        scrollBar = self.verticalScrollBar()
+        scrollBar.setValue(scrollBar.value() - int(removedHeight))
 
     def __getHtmlMessage(self, imagePath: str, message: str) -> str:
         return ('<table border=0 cellspacing=10><tr>'
@@ -31,19 +81,16 @@ class SerialViewerTextEdit(QTextEdit):
     def __getHtmlStopMessage(self, message: str) -> str:
         return self.__getHtmlMessage(self.iconSet.getCaptureStopIconPath(), message)
 
-    def appendData(self, data: str, scrollToBottom: bool):
+    def appendData(self, data: str, scrollToBottom: bool, deleteLastLineFirst: bool = False):
         cursor: QTextCursor = QTextCursor(self.document())
+        cursor.beginEditBlock()
         cursor.movePosition(QTextCursor.MoveOperation.End)
+        if deleteLastLineFirst:
+            cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock, QTextCursor.MoveMode.KeepAnchor)
+            cursor.removeSelectedText()
         cursor.insertText(data)
-
-        if scrollToBottom:
-            self.scrollToBottom()
-
-    def deleteLastLine(self, scrollToBottom: bool):
-        cursor: QTextCursor = QTextCursor(self.document())
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock, QTextCursor.MoveMode.KeepAnchor)
-        cursor.removeSelectedText()
+        self.__removeOldestLines()
+        cursor.endEditBlock()
 
         if scrollToBottom:
             self.scrollToBottom()
@@ -52,6 +99,7 @@ class SerialViewerTextEdit(QTextEdit):
         cursor: QTextCursor = QTextCursor(self.document())
         cursor.movePosition(QTextCursor.MoveOperation.End)
         cursor.insertHtml(self.__getHtmlErrorMessage(message))
+        self.__removeOldestLines()
 
         if scrollToBottom:
             self.scrollToBottom()
@@ -60,6 +108,7 @@ class SerialViewerTextEdit(QTextEdit):
         cursor: QTextCursor = QTextCursor(self.document())
         cursor.movePosition(QTextCursor.MoveOperation.End)
         cursor.insertHtml(self.__getHtmlStartMessage(message))
+        self.__removeOldestLines()
 
         if scrollToBottom:
             self.scrollToBottom()
@@ -68,6 +117,7 @@ class SerialViewerTextEdit(QTextEdit):
         cursor: QTextCursor = QTextCursor(self.document())
         cursor.movePosition(QTextCursor.MoveOperation.End)
         cursor.insertHtml(self.__getHtmlStopMessage(message))
+        self.__removeOldestLines()
 
         if scrollToBottom:
             self.scrollToBottom()
@@ -75,6 +125,12 @@ class SerialViewerTextEdit(QTextEdit):
     def scrollToBottom(self):
         self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
 
+    def getVisibleBlockRange(self) -> typing.Tuple[int, int]:
+        firstBlockNumber = self.cursorForPosition(QPoint(0, 0)).blockNumber()
+        lastBlockNumber = self.cursorForPosition(QPoint(self.viewport().width() - 1,
+                                                        self.viewport().height() - 1)).blockNumber()
+        return firstBlockNumber, lastBlockNumber
+
     def setIconSet(self, iconSet: IconSet):
         self.iconSet = iconSet
 
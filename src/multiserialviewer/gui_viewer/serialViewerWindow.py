@@ -1,4 +1,4 @@
-from PySide6.QtCore import Qt, Slot, Signal
+from PySide6.QtCore import Qt, Slot, Signal, QTimer, QElapsedTimer
 from PySide6.QtGui import QTextCursor
 from PySide6.QtWidgets import QMdiSubWindow, QTabWidget, QScrollArea, QFrame, QSplitter, QTabBar
 from typing import List
@@ -10,11 +10,13 @@ from multiserialviewer.gui_viewer.searchWidget import SearchWidget
 from multiserialviewer.gui_viewer.counterWidget import CounterWidget
 from multiserialviewer.gui_viewer.watchWidget import WatchWidget
 from multiserialviewer.gui_viewer.statisticsWidget import StatisticsWidget
+from multiserialviewer.gui_viewer.plotWidget import PlotWidget
 from multiserialviewer.gui_viewer.serialViewerSettingsWidget import SerialViewerSettingsWidget
 from multiserialviewer.icons.iconSet import IconSet
 from multiserialviewer.settings.serialViewerSettings import SerialViewerSettings
 from multiserialviewer.gui_viewer.autoscrollHandler import AutoscrollHandler
 from multiserialviewer.gui_viewer.searchHandler import SearchHandler
+from multiserialviewer.gui_viewer.textStagingBuffer import TextStagingBuffer
 
 
 class SerialViewerWindow(QMdiSubWindow):
@@ -22,6 +24,11 @@ class SerialViewerWindow(QMdiSubWindow):
     signal_createTextHighlightEntry = Signal(str)
     signal_createWatchFromSelectedText = Signal(str)
     signal_createCounter = Signal(str)
+    signal_stagedTextFlushed = Signal(int, float)
+    signal_rehighlightProgress = Signal(int)
+
+    # received text is displayed with this maximum rate (frames per second)
+    MAX_DISPLAY_UPDATE_RATE = 30
 
     def __init__(self, windowTitle: str, iconSet: IconSet):
         super().__init__()
@@ -48,12 +55,21 @@ class SerialViewerWindow(QMdiSubWindow):
         self.highlighter = TextHighlighter()
         self.highlighter.setDocument(self.textEdit.document())
 
+        self.stagingBuffer: TextStagingBuffer = TextStagingBuffer()
+        self.__flushTimer: QTimer = QTimer(self)
+        self.__flushTimer.setSingleShot(True)
+        self.__flushTimer.timeout.connect(self.flushStagedText)
+        self.__timeSinceLastFlush: QElapsedTimer = QElapsedTimer()
+        self.__timeSinceLastFlush.start()
+
         # connections
         self.textEdit.signal_createTextHighlightEntry.connect(self.signal_createTextHighlightEntry)
         self.textEdit.signal_createWatchFromSelectedText.connect(self.signal_createWatchFromSelectedText)
         self.textEdit.signal_createCounterFromSelectedText.connect(self.signal_createCounter)
         self.search.signal_foundString.connect(self.autoscroll.deactivateAutoscroll)
         self.settingsWidget.widget.ed_name.textChanged.connect(self.setWindowName)
+        self.stagingBuffer.signal_dataPending.connect(self.scheduleFlush)
+        self.highlighter.signal_rehighlightProgress.connect(self.signal_rehighlightProgress)
 
     def __populateTabWidget(self, tabWidget: QTabWidget):
         widgetMinimumWidth = 400
@@ -98,6 +114,16 @@ class SerialViewerWindow(QMdiSubWindow):
         self.statisticsScrollArea.setWidget(self.statisticsWidget)
         tabWidget.addTab(self.statisticsScrollArea, self.iconSet.getStatsIcon(), "Statistics")
 
+        # plot
+        self.plotScrollArea = QScrollArea(None)
+        self.plotScrollArea.setFrameShape(QFrame.Shape.NoFrame)
+        self.plotScrollArea.setWidgetResizable(True)
+
+        self.plotWidget: PlotWidget = PlotWidget(self.plotScrollArea)
+        self.plotWidget.setMinimumWidth(widgetMinimumWidth)
+        self.plotScrollArea.setWidget(self.plotWidget)
+        tabWidget.addTab(self.plotScrollArea, self.iconSet.getPlotIcon(), "Plot")
+
         # settings
         self.settingsScrollArea = QScrollArea(None)
         self.settingsScrollArea.setFrameShape(QFrame.Shape.NoFrame)
@@ -143,7 +169,9 @@ class SerialViewerWindow(QMdiSubWindow):
 
     @Slot()
     def clear(self):
+        self.stagingBuffer.clear()
         self.textEdit.clear()
+        self.plotWidget.clear()
 
     @Slot()
     def selectTab_Watch(self):
@@ -155,29 +183,49 @@ class SerialViewerWindow(QMdiSubWindow):
 
     def setHighlighterSettings(self, settings: List[TextHighlighterSettings]):
         self.highlighter.setSettings(settings)
-        self.highlighter.rehighlight()
+        self.highlighter.rehighlightIncrementally(*self.textEdit.getVisibleBlockRange())
 
     def setSerialViewerSettings(self, settings: SerialViewerSettings):
         self.settingsWidget.setSerialViewerSettings(settings)
 
     @Slot()
     def appendData(self, data: str):
-        self.textEdit.appendData(data, self.autoscroll.autoscrollIsActive())
+        self.stagingBuffer.appendText(data)
 
     @Slot()
     def deleteLastLine(self):
-        self.textEdit.deleteLastLine(self.autoscroll.autoscrollIsActive())
+        self.stagingBuffer.deleteLastLine()
+
+    @Slot()
+    def scheduleFlush(self):
+        if not self.__flushTimer.isActive():
+            frameInterval = 1000 // SerialViewerWindow.MAX_DISPLAY_UPDATE_RATE
+            self.__flushTimer.start(max(0, frameInterval - self.__timeSinceLastFlush.elapsed()))
+
+    @Slot()
+    def flushStagedText(self):
+        self.__flushTimer.stop()
+        deleteLastLineFirst, data, chunkCount = self.stagingBuffer.takeAll()
+        if chunkCount > 0:
+            duration = QElapsedTimer()
+            duration.start()
+            self.textEdit.appendData(data, self.autoscroll.autoscrollIsActive(), deleteLastLineFirst)
+            self.signal_stagedTextFlushed.emit(chunkCount, duration.nsecsElapsed() / 1e6)
+        self.__timeSinceLastFlush.restart()
 
     @Slot()
     def appendErrorMessage(self, message: str):
+        self.flushStagedText()
         self.textEdit.appendErrorMessage(message, self.autoscroll.autoscrollIsActive())
 
     @Slot()
     def appendStartMessage(self, message: str):
+        self.flushStagedText()
         self.textEdit.appendStartMessage(message, self.autoscroll.autoscrollIsActive())
 
     @Slot()
     def appendStopMessage(self, message: str):
+        self.flushStagedText()
         self.textEdit.appendStopMessage(message, self.autoscroll.autoscrollIsActive())
 
     @Slot()
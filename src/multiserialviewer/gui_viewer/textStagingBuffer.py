@@ -0,0 +1,63 @@
+from PySide6.QtCore import QObject, Signal, Slot
+import threading
+
+
+class TextStagingBuffer(QObject):
+    """ Collects received text and delete-line requests until the view applies them in a single update.
+
+    appendText and deleteLastLine may be called from the data processing thread (direct connection).
+    signal_dataPending is only emitted when the buffer changes from empty to non-empty, so the GUI
+    thread gets at most one pending event per viewer, no matter how many chunks are received.
+    """
+    signal_dataPending: Signal = Signal()
+
+    def __init__(self):
+        super(TextStagingBuffer, self).__init__()
+        self.__lock = threading.Lock()
+        self.__deleteLastLineFirst: bool = False
+        self.__text: list[str] = []
+        self.__chunkCount: int = 0
+
+    def __markPending(self) -> bool:
+        wasEmpty = self.__chunkCount == 0
+        self.__chunkCount += 1
+        return wasEmpty
+
+    @Slot(str)
+    def appendText(self, text: str):
+        with self.__lock:
+            self.__text.append(text)
+            notify = self.__markPending()
+        if notify:
+            self.signal_dataPending.emit()
+
+    @Slot()
+    def deleteLastLine(self):
+        with self.__lock:
+            # the chunks are searched from the end, only the chunk with the last linebreak is truncated
+            while len(self.__text) > 0:
+                chunk = self.__text[-1]
+                lastLinebreak = max(chunk.rfind('\n'), chunk.rfind('\r'))
+                if lastLinebreak >= 0:
+                    # the last line is part of the staged text
+                    self.__text[-1] = chunk[:lastLinebreak + 1]
+                    break
+                del self.__text[-1]
+            else:
+                # the last line was (partly) displayed already
+                self.__deleteLastLineFirst = True
+            notify = self.__markPending()
+        if notify:
+            self.signal_dataPending.emit()
+
+    def takeAll(self) -> tuple[bool, str, int]:
+        """ Returns (deleteLastLineFirst, text, number of staged chunks) and empties the buffer """
+        with self.__lock:
+            staged = (self.__deleteLastLineFirst, ''.join(self.__text), self.__chunkCount)
+            self.__deleteLastLineFirst = False
+            self.__text = []
+            self.__chunkCount = 0
+        return staged
+
+    def clear(self):
+        self.takeAll()
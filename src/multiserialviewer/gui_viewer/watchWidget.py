@@ -6,7 +6,7 @@ import re
 
 class WatchWidget(QWidget):
     signal_createWatch: Signal = Signal(str, str, str, str)
-    signal_removeWatch: Signal = Signal(int)
+    signal_removeWatches: Signal = Signal(object)
 
     CB_TEXT_NUMBER = 'Number'
     CB_TEXT_WORDS = 'Set of words'
@@ -107,6 +107,6 @@ class WatchWidget(QWidget):
     @Slot()
     def handleDeleteSelectedButtonClick(self):
         selected_model_indices = [modelIndex.row() for modelIndex in self.widget.tableView.selectionModel().selectedRows()]
-
-        for index in sorted(selected_model_indices, reverse=True):
-            self.signal_removeWatch.emit(index)
+        if len(selected_model_indices) > 0:
+            # removed at once (one reset of the model)
+            self.signal_removeWatches.emit(sorted(selected_model_indices))
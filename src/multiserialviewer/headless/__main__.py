@@ -0,0 +1,32 @@
+import sys
+import argparse
+from multiserialviewer.headless.headlessApplication import HeadlessApplication
+
+
+def parseArguments(arguments: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='multiserialviewer-headless',
+                                     description='Captures the serial ports of the MultiSerialViewer settings '
+                                                 'without a GUI. Stop with Ctrl+C.')
+    parser.add_argument('--config-dir', metavar='DIR', default=None,
+                        help='directory with multiserialviewer.ini (default: settings of the GUI application)')
+    parser.add_argument('--output-dir', metavar='DIR', default=None,
+                        help='write received text and watch values to files in DIR (default: stdout)')
+    parser.add_argument('--counter-interval', metavar='SECONDS', type=float, default=60,
+                        help='write the counter values every SECONDS (0: only on exit)')
+    return parser.parse_args(arguments[1:])
+
+
+def main() -> int | str:
+    args = parseArguments(sys.argv)
+    app = HeadlessApplication(sys.argv[:1], configDir=args.config_dir, outputDir=args.output_dir,
+                              counterIntervalS=args.counter_interval)
+    if len(app.controllers) == 0:
+        return 'No serial ports configured'
+    if not app.startCapture():
+        app.onAboutToQuit()
+        return 'No serial port could be opened'
+    return app.exec()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
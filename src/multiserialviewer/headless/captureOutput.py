@@ -0,0 +1,66 @@
+from PySide6.QtCore import QObject, Slot
+from datetime import datetime
+from pathlib import Path
+import sys
+import typing
+
+
+class CaptureOutput(QObject):
+    """ Writes the received text and the watch values of one serial port to files or to stdout.
+
+    Files: <baseName>.log contains the received text, <baseName>_values.log the watch and counter values.
+    stdout: every line is prefixed with the port name, so the lines of different ports are not mixed.
+    """
+    def __init__(self, portName: str, fileBaseName: str, outputDir: typing.Optional[str] = None):
+        super(CaptureOutput, self).__init__()
+        self.__portName: str = portName
+        self.__partialLine: str = ''
+
+        self.__textFile: typing.Optional[typing.TextIO] = None
+        self.__valueFile: typing.Optional[typing.TextIO] = None
+        if outputDir is not None:
+            self.__textFile = open(Path(outputDir, fileBaseName + '.log'), 'a', encoding='utf-8')
+            self.__valueFile = open(Path(outputDir, fileBaseName + '_values.log'), 'a', encoding='utf-8')
+
+    def __writeValueLine(self, line: str):
+        line = f'{datetime.now():%Y-%m-%d %H:%M:%S.%f} {line}\n'
+        if self.__valueFile is not None:
+            self.__valueFile.write(line)
+        else:
+            sys.stdout.write(f'[{self.__portName}] {line}')
+
+    @Slot(str)
+    def writeText(self, text: str):
+        if self.__textFile is not None:
+            self.__textFile.write(text)
+        else:
+            lines = (self.__partialLine + text).split('\n')
+            self.__partialLine = lines.pop()
+            for line in lines:
+                sys.stdout.write(f'[{self.__portName}] {line}\n')
+
+    @Slot(str, object)
+    def writeWatchValue(self, name: str, groups: list):
+        self.__writeValueLine(f'watch {name} = {groups[0] if len(groups) > 0 else ""}')
+
+    def writeCounterValues(self, counters: list[tuple[str, int]]):
+        for pattern, value in counters:
+            self.__writeValueLine(f'counter {pattern} = {value}')
+
+    def writeMessage(self, message: str):
+        self.__writeValueLine(message)
+
+    def flush(self):
+        for file in (self.__textFile, self.__valueFile, sys.stdout):
+            if file is not None:
+                file.flush()
+
+    def close(self):
+        if self.__partialLine:
+            self.writeText('\n')
+        self.flush()
+        for file in (self.__textFile, self.__valueFile):
+            if file is not None:
+                file.close()
+        self.__textFile = None
+        self.__valueFile = None
@@ -0,0 +1,62 @@
+from PySide6.QtCore import QCoreApplication, QTimer, Slot
+from platformdirs import user_config_dir, user_log_dir
+import signal
+
+from multiserialviewer.settings.settings import Settings
+from multiserialviewer.headless.headlessController import HeadlessController
+
+
+class HeadlessApplication(QCoreApplication):
+    """ Captures all serial ports of the settings without a GUI (no widgets are imported) """
+    # same as Application.NAME (application.py is not imported, because it requires QtWidgets)
+    NAME = 'MultiSerialViewer'
+    FLUSH_INTERVAL_MS = 1000
+
+    def __init__(self, arguments, configDir: str | None = None, outputDir: str | None = None,
+                 counterIntervalS: float = 0):
+        super().__init__(arguments)
+
+        if configDir is None:
+            configDir = user_config_dir(appname=HeadlessApplication.NAME, roaming=False, ensure_exists=True, appauthor=False)
+        self.settings: Settings = Settings(configDir)
+        self.settings.loadSettings()
+        self.logDir = user_log_dir(appname=HeadlessApplication.NAME, ensure_exists=True, appauthor=False)
+
+        self.controllers: list[HeadlessController] = []
+        for serialViewerSettings in self.settings.serialViewer.entries:
+            self.controllers.append(HeadlessController(serialViewerSettings, self.settings.application.values,
+                                                       self.logDir, outputDir))
+
+        self.flushTimer: QTimer = QTimer(self)
+        self.flushTimer.timeout.connect(self.flushOutput)
+        self.flushTimer.start(HeadlessApplication.FLUSH_INTERVAL_MS)
+        self.counterTimer: QTimer = QTimer(self)
+        self.counterTimer.timeout.connect(self.writeCounterValues)
+        if counterIntervalS > 0:
+            self.counterTimer.start(int(counterIntervalS * 1000))
+
+        # the Python signal handler is only called when the interpreter runs (the flush timer does this)
+        signal.signal(signal.SIGINT, lambda signum, frame: self.quit())
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.quit())
+        self.aboutToQuit.connect(self.onAboutToQuit)
+
+    def startCapture(self) -> bool:
+        """ Returns True if at least one port was opened """
+        openedPorts = [ctrl.startCapture() for ctrl in self.controllers]
+        return any(openedPorts)
+
+    @Slot()
+    def flushOutput(self):
+        for ctrl in self.controllers:
+            ctrl.output.flush()
+
+    @Slot()
+    def writeCounterValues(self):
+        for ctrl in self.controllers:
+            ctrl.writeCounterValues()
+
+    @Slot()
+    def onAboutToQuit(self):
+        for ctrl in self.controllers:
+            ctrl.destruct()
+        self.controllers = []
@@ -0,0 +1,115 @@
+from PySide6.QtCore import QObject, Slot, QThread, Qt, QCoreApplication
+
+from multiserialviewer.settings.serialViewerSettings import SerialViewerSettings
+from multiserialviewer.settings.applicationSettings import ApplicationSettings
+from multiserialviewer.serial_data.serialDataReceiver import SerialDataReceiver
+from multiserialviewer.serial_data.serialDataProcessor import SerialDataProcessor
+from multiserialviewer.serial_data.rawDataRecorder import RawDataRecorder
+from multiserialviewer.serial_data.streamingMatchEngine import StreamingMatchEngine
+from multiserialviewer.serial_data.workerThreadPool import WorkerThreadPool, Worker
+from multiserialviewer.serial_data.portFileHelper import getFileBaseName
+from multiserialviewer.application.counterHandler import CounterHandler
+from multiserialviewer.application.watchHandler import WatchHandler
+from multiserialviewer.headless.captureOutput import CaptureOutput
+
+
+class HeadlessController(QObject):
+    """ Captures one serial port like SerialViewerController, but writes to a CaptureOutput instead of a view """
+
+    def __init__(self, settings: SerialViewerSettings, settingsApplication: ApplicationSettings, logDir: str,
+                 outputDir: str | None = None):
+        super(HeadlessController, self).__init__()
+
+        self.receiverThread: QThread = QThread(self)
+        self.receiverThread.setObjectName('SerialReceiver thread')
+        self.recorderThread: QThread = QThread(self)
+        self.recorderThread.setObjectName('RawDataRecorder thread')
+
+        self.receiver: SerialDataReceiver = SerialDataReceiver(settings.connection)
+        self.recorder: RawDataRecorder = RawDataRecorder(logDir, getFileBaseName(self.getPortName()))
+        self.recorder.setEnabled(settingsApplication.recordRawData)
+        self.processor: SerialDataProcessor = SerialDataProcessor()
+        self.processor.setConvertNonPrintableCharsToHex(settingsApplication.showNonPrintableCharsAsHex)
+        # lines cannot be deleted from the output
+        self.processor.setBackspaceDeletesLastLine(False)
+        self.processor.setShowTimestampAtLineStart(settingsApplication.showTimestamp, settingsApplication.timestampFormat,
+                                                   settingsApplication.timestampMode)
+
+        self.worker: Worker = WorkerThreadPool.instance().acquire(self.getPortName())
+        self.matchEngine: StreamingMatchEngine = StreamingMatchEngine(self.worker.deadlineScheduler)
+        self.counterHandler: CounterHandler = CounterHandler(settings.counters, self.matchEngine)
+        self.watchHandler: WatchHandler = WatchHandler(settings.watches, self.matchEngine,
+                                                       settingsApplication.watchHistorySize, settingsApplication.watchMaxWords)
+        self.output: CaptureOutput = CaptureOutput(self.getPortName(), getFileBaseName(self.getPortName()), outputDir)
+
+        self.receiver.moveToThread(self.receiverThread)
+        self.recorder.moveToThread(self.recorderThread)
+        self.processor.moveToThread(self.worker.workerThread)
+        self.matchEngine.moveToThread(self.worker.workerThread)
+        self.counterHandler.moveToThread(self.worker.workerThread)
+        self.watchHandler.moveToThread(self.worker.workerThread)
+
+        self.receiverThread.start()
+        self.receiverThread.setPriority(QThread.Priority.HighPriority)
+        self.recorderThread.start()
+
+        self.receiver.signal_lineTimestampsAvailable.connect(self.processor.handleLineTimestamps,
+                                                             type=Qt.ConnectionType.DirectConnection)
+        self.receiver.setLineTimestampsEnabled(settingsApplication.showTimestamp)
+        self.receiver.signal_rawDataAvailable.connect(self.processor.handleRawData)
+        self.receiver.signal_rawDataAvailable.connect(self.recorder.handleRawData,
+                                                      type=Qt.ConnectionType.DirectConnection)
+        self.receiver.signal_errorOccurred.connect(self.handleError)
+        self.recorder.signal_errorOccurred.connect(self.handleError)
+        self.matchEngine.setRxTimeSource(self.processor.getRxTime)
+        self.processor.signal_asciiDataAvailable.connect(self.matchEngine.processBytesFromStream)
+        self.processor.signal_asciiDataAvailable.connect(self.output.writeText)
+        for textExtractor in self.watchHandler.textExtractors.values():
+            textExtractor.signal_textExtracted.connect(self.output.writeWatchValue)
+
+    def getPortName(self) -> str:
+        return self.receiver.getSettings().portName
+
+    def startCapture(self) -> bool:
+        # queued before the data of the port, so the elapsed time starts with its first data
+        self.worker.postToThread(self.processor.restartElapsedTime)
+        opened, msg = self.receiver.openPort()
+        if opened:
+            self.output.writeMessage(f'Opened {self.getPortName()}')
+        else:
+            self.output.writeMessage(f'Failed to open {self.getPortName()} ({msg})')
+        return opened
+
+    def stopCapture(self):
+        if self.receiver.portIsOpen():
+            self.receiver.closePort()
+            self.output.writeMessage(f'Closed {self.getPortName()}')
+
+    def writeCounterValues(self):
+        counters = [(row.pattern, row.value) for row in self.counterHandler.counterTableModel.rows]
+        self.output.writeCounterValues(counters)
+
+    @Slot(str)
+    def handleError(self, msg: str):
+        self.output.writeMessage(f'Error on {self.getPortName()} ({msg})')
+
+    def destruct(self):
+        self.stopCapture()
+
+        if self.receiverThread.isRunning():
+            self.receiverThread.quit()
+            self.receiverThread.wait()
+        # publishes the counters after the data which is still queued in the processing thread
+        self.counterHandler.flush()
+        self.watchHandler.flush()
+        self.worker.detach(self.matchEngine, [self.processor, self.matchEngine, self.counterHandler, self.watchHandler])
+        WorkerThreadPool.instance().release(self.worker, self.getPortName())
+        self.recorder.close()
+        if self.recorderThread.isRunning():
+            self.recorderThread.quit()
+            self.recorderThread.wait()
+
+        # output of the processing thread which is still queued
+        QCoreApplication.processEvents()
+        self.writeCounterValues()
+        self.output.close()
@@ -63,3 +63,6 @@ class IconSet:
 
     def getStatsIcon(self) -> QIcon:
         return QIcon(str(self.icons_dir_name.joinpath('stats.png')))
+
+    def getPlotIcon(self) -> QIcon:
+        return QIcon(str(self.icons_dir_name.joinpath('plot.png')))
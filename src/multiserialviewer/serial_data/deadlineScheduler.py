@@ -0,0 +1,80 @@
+from PySide6.QtCore import QObject, QTimer, QElapsedTimer, Slot
+import heapq
+import itertools
+import typing
+
+
+class DeadlineScheduler(QObject):
+    """ Calls functions after a delay, using a single timer for all functions (e.g. of a processing thread).
+
+    Rescheduling a function does not restart the timer. Deadlines are stored in a heap and the
+    timer is armed for the earliest one. Heap entries of rescheduled or canceled functions are
+    not removed immediately, but skipped (or requeued) when they expire.
+    """
+    def __init__(self, parent: QObject | None = None):
+        super(DeadlineScheduler, self).__init__(parent)
+
+        self.__clock: QElapsedTimer = QElapsedTimer()
+        self.__clock.start()
+        # current deadline of every scheduled function
+        self.__deadlines: dict[typing.Callable[[], None], int] = {}
+        # (deadline, sequence number, function)
+        self.__heap: list[tuple[int, int, typing.Callable[[], None]]] = []
+        # deadline of the valid heap entry of every function (older entries are skipped)
+        self.__queued: dict[typing.Callable[[], None], int] = {}
+        self.__sequence = itertools.count()
+
+        self.__timer: QTimer = QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.timeout.connect(self.processExpiredDeadlines)
+        self.__timerDeadline: int = 0
+
+    def schedule(self, function: typing.Callable[[], None], delayMs: int):
+        """ Calls function after delayMs. An already scheduled call of function is replaced. """
+        deadline = self.__clock.elapsed() + delayMs
+        self.__deadlines[function] = deadline
+        if function not in self.__queued or deadline < self.__queued[function]:
+            self.__push(function, deadline)
+        self.__startTimer(deadline)
+
+    def __push(self, function: typing.Callable[[], None], deadline: int):
+        self.__queued[function] = deadline
+        heapq.heappush(self.__heap, (deadline, next(self.__sequence), function))
+
+    def cancel(self, function: typing.Callable[[], None]):
+        self.__deadlines.pop(function, None)
+
+    def isScheduled(self, function: typing.Callable[[], None]) -> bool:
+        return function in self.__deadlines
+
+    def __startTimer(self, deadline: int):
+        if not self.__timer.isActive() or deadline < self.__timerDeadline:
+            self.__timerDeadline = deadline
+            self.__timer.start(max(0, deadline - self.__clock.elapsed()))
+
+    @Slot()
+    def processExpiredDeadlines(self):
+        now = self.__clock.elapsed()
+        expired = []
+        while len(self.__heap) > 0 and self.__heap[0][0] <= now:
+            queuedDeadline, _, function = heapq.heappop(self.__heap)
+            if self.__queued.get(function) != queuedDeadline:
+                # replaced by an entry with an earlier deadline
+                continue
+            del self.__queued[function]
+
+            deadline = self.__deadlines.get(function)
+            if deadline is None:
+                # canceled
+                pass
+            elif deadline > now:
+                # rescheduled
+                self.__push(function, deadline)
+            else:
+                del self.__deadlines[function]
+                expired.append(function)
+
+        if len(self.__heap) > 0:
+            self.__startTimer(self.__heap[0][0])
+        for function in expired:
+            function()
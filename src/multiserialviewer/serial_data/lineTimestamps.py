@@ -0,0 +1,49 @@
+from array import array
+from datetime import datetime, timedelta
+import re
+
+from multiserialviewer.serial_data.serialDataProcessor import SerialDataProcessor
+
+
+class LineTimestamps:
+    """ Estimated receive times of the lines starting in a chunk of received data.
+
+    The serial port is read in chunks (e.g. 4 KB at once), so all lines of a chunk have the same rx time.
+    The time of a byte is estimated from its position in the chunk: the last byte was received at the time
+    of the read, every byte before it one frame duration (see Translator.frameDurationNs) earlier, but not
+    before the previous read. The times are nanoseconds of time.perf_counter_ns (monotonic, high resolution).
+    Only lines whose first byte is in the chunk are contained (a line continued from the previous chunk is not).
+    Lines end like in SerialDataProcessor (after every '\r' and '\n').
+    """
+    LINE_END_REGEX: re.Pattern = re.compile(b'[' + re.escape(SerialDataProcessor.LINEBREAK_CHARS) + b']')
+
+    def __init__(self, rxTime: datetime, rxTimeNs: int, chunkSize: int,
+                 lineStarts: array = None, startTimesNs: array = None):
+        self.rxTime: datetime = rxTime
+        # time of the read (perf_counter_ns)
+        self.rxTimeNs: int = rxTimeNs
+        self.chunkSize: int = chunkSize
+        # position of the first byte of every line in the chunk
+        self.lineStarts: array = lineStarts if lineStarts is not None else array('I')
+        # estimated time of the first byte of every line (perf_counter_ns)
+        self.startTimesNs: array = startTimesNs if startTimesNs is not None else array('q')
+
+    def __len__(self) -> int:
+        return len(self.lineStarts)
+
+    def getStartTimes(self) -> dict[int, datetime]:
+        """ Returns the estimated rx time of every line start (position in the chunk) """
+        return {pos: self.rxTime - timedelta(microseconds=(self.rxTimeNs - startTimeNs) / 1000)
+                for pos, startTimeNs in zip(self.lineStarts, self.startTimesNs)}
+
+    @staticmethod
+    def estimate(data: bytes, rxTime: datetime, rxTimeNs: int, frameDurationNs: int,
+                 firstByteStartsLine: bool, previousRxTimeNs: int = 0) -> 'LineTimestamps':
+        lineStarts = array('I', [0] if firstByteStartsLine and len(data) > 0 else [])
+        lineStarts.extend(match.end() for match in LineTimestamps.LINE_END_REGEX.finditer(data)
+                          if match.end() < len(data))
+
+        lastPos = len(data) - 1
+        startTimesNs = array('q', (max(previousRxTimeNs, rxTimeNs - (lastPos - pos) * frameDurationNs)
+                                   for pos in lineStarts))
+        return LineTimestamps(rxTime, rxTimeNs, len(data), lineStarts, startTimesNs)
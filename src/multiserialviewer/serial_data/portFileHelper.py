@@ -0,0 +1,6 @@
+import re
+
+
+def getFileBaseName(portName: str) -> str:
+    """ Returns the name of the files of a port (without suffix), e.g. /dev/ttyUSB0 -> dev_ttyUSB0 """
+    return re.sub(r'[^\w.-]', '_', portName.strip('/\\'))
@@ -0,0 +1,190 @@
+from PySide6.QtCore import QObject, Signal, Slot, QByteArray, QTimer, QMetaObject, Qt, QThread
+from datetime import datetime, timedelta
+from pathlib import Path
+import struct
+import threading
+import time
+import typing
+
+
+class RawDataFile:
+    """ Append-only binary file with the received chunks of a serial port.
+
+    The file starts with MAGIC, followed by one record per chunk: rx time (microseconds since
+    the epoch, int64), length of the data (uint32) and the data itself. Little endian.
+    """
+    MAGIC = b'MSVRAW\x00\x01'
+    RECORD_HEADER = struct.Struct('<qI')
+    FILE_SUFFIX = '.msvraw'
+
+    @staticmethod
+    def encodeRecord(rxTime: datetime, data: bytes) -> bytes:
+        microseconds = round(rxTime.timestamp() * 1000000)
+        return RawDataFile.RECORD_HEADER.pack(microseconds, len(data)) + data
+
+    @staticmethod
+    def readRecords(path: str) -> typing.Iterator[tuple[datetime, bytes]]:
+        """ Yields (rx time, data) of every record. An incomplete last record (e.g. still being written) is ignored. """
+        with open(path, 'rb') as file:
+            if file.read(len(RawDataFile.MAGIC)) != RawDataFile.MAGIC:
+                raise ValueError(f'{path} is not a raw data file')
+            while True:
+                header = file.read(RawDataFile.RECORD_HEADER.size)
+                if len(header) < RawDataFile.RECORD_HEADER.size:
+                    break
+                microseconds, length = RawDataFile.RECORD_HEADER.unpack(header)
+                data = file.read(length)
+                if len(data) < length:
+                    break
+                rxTime = datetime.fromtimestamp(microseconds // 1000000) + timedelta(microseconds=microseconds % 1000000)
+                yield rxTime, data
+
+
+class RawDataRecorder(QObject):
+    """ Records the received chunks of a serial port to raw data files (see RawDataFile).
+
+    handleRawData is called in the receiver thread (direct connection) and only appends the encoded
+    chunk to a pending buffer. The buffer is written to disk in the thread of the recorder. If the
+    writer cannot keep up, the pending buffer is limited to MAX_PENDING_BYTES and further chunks are
+    dropped, so the receiver is never blocked. A new file is started when the current file reaches
+    MAX_FILE_SIZE or MAX_FILE_DURATION_S.
+    """
+    signal_errorOccurred: Signal = Signal(str)
+
+    MAX_PENDING_BYTES = 4 * 1024 * 1024
+    FLUSH_INTERVAL_MS = 200
+    MAX_FILE_SIZE = 64 * 1024 * 1024
+    MAX_FILE_DURATION_S = 60 * 60
+
+    def __init__(self, directory: str, fileBaseName: str):
+        super(RawDataRecorder, self).__init__()
+        self.__directory: str = directory
+        self.__fileBaseName: str = fileBaseName
+
+        self.__lock = threading.Lock()
+        self.__enabled: bool = False
+        self.__pending: list[bytes] = []
+        self.__pendingSize: int = 0
+        self.__droppedBytes: int = 0
+        self.__dropping: bool = False
+
+        # only used in the thread of the recorder
+        self.__file: typing.Optional[typing.BinaryIO] = None
+        self.__filePath: typing.Optional[str] = None
+        self.__fileSize: int = 0
+        self.__fileStartTime: float = 0.0
+
+        self.__flushTimer = QTimer(self)
+        self.__flushTimer.setInterval(RawDataRecorder.FLUSH_INTERVAL_MS)
+        self.__flushTimer.timeout.connect(self.__writePendingData)
+
+    def __invokeInRecorderThread(self, methodName: str):
+        if self.thread() == QThread.currentThread() or not self.thread().isRunning():
+            QMetaObject.invokeMethod(self, methodName, Qt.ConnectionType.DirectConnection)
+        else:
+            QMetaObject.invokeMethod(self, methodName, Qt.ConnectionType.BlockingQueuedConnection)
+
+    def setEnabled(self, enabled: bool):
+        with self.__lock:
+            self.__enabled = enabled
+        if enabled:
+            self.__invokeInRecorderThread('__startFlushTimer')
+        else:
+            self.close()
+
+    def isEnabled(self) -> bool:
+        return self.__enabled
+
+    def getFilePath(self) -> typing.Optional[str]:
+        return self.__filePath
+
+    def getDroppedBytes(self) -> int:
+        return self.__droppedBytes
+
+    @Slot(datetime, QByteArray)
+    def handleRawData(self, rxTime: datetime, rawData: QByteArray):
+        if not self.__enabled:
+            return
+
+        record = RawDataFile.encodeRecord(rxTime, rawData.data())
+        with self.__lock:
+            if self.__pendingSize + len(record) <= RawDataRecorder.MAX_PENDING_BYTES:
+                self.__pending.append(record)
+                self.__pendingSize += len(record)
+                return
+            startedDropping = not self.__dropping
+            self.__dropping = True
+            self.__droppedBytes += rawData.size()
+        if startedDropping:
+            self.signal_errorOccurred.emit('Recording cannot keep up, received data is dropped')
+
+    def close(self):
+        """ Writes the pending data and closes the file (blocks until this is done in the thread of the recorder). """
+        self.__invokeInRecorderThread('__closeFile')
+
+    def __takePending(self) -> list[bytes]:
+        with self.__lock:
+            pending = self.__pending
+            self.__pending = []
+            self.__pendingSize = 0
+            self.__dropping = False
+        return pending
+
+    def __openNewFile(self):
+        name = f'{self.__fileBaseName}_{datetime.now():%Y%m%d_%H%M%S}'
+        path = Path(self.__directory, name + RawDataFile.FILE_SUFFIX)
+        index = 1
+        while path.exists():
+            path = Path(self.__directory, f'{name}_{index}{RawDataFile.FILE_SUFFIX}')
+            index += 1
+
+        self.__file = open(path, 'wb')
+        self.__file.write(RawDataFile.MAGIC)
+        self.__filePath = str(path)
+        self.__fileSize = len(RawDataFile.MAGIC)
+        self.__fileStartTime = time.monotonic()
+
+    def __fileIsFull(self) -> bool:
+        return (self.__fileSize >= RawDataRecorder.MAX_FILE_SIZE or
+                time.monotonic() - self.__fileStartTime >= RawDataRecorder.MAX_FILE_DURATION_S)
+
+    @Slot()
+    def __writePendingData(self):
+        pending = self.__takePending()
+        if len(pending) == 0:
+            return
+
+        try:
+            for record in pending:
+                if self.__file is not None and self.__fileIsFull():
+                    self.__releaseFile()
+                if self.__file is None:
+                    self.__openNewFile()
+                self.__file.write(record)
+                self.__fileSize += len(record)
+            self.__file.flush()
+        except OSError as e:
+            with self.__lock:
+                self.__enabled = False
+            self.__flushTimer.stop()
+            self.__takePending()
+            self.__releaseFile()
+            self.signal_errorOccurred.emit(f'Recording stopped ({e})')
+
+    def __releaseFile(self):
+        if self.__file is not None:
+            try:
+                self.__file.close()
+            except OSError:
+                pass
+            self.__file = None
+
+    @Slot()
+    def __startFlushTimer(self):
+        self.__flushTimer.start()
+
+    @Slot()
+    def __closeFile(self):
+        self.__flushTimer.stop()
+        self.__writePendingData()
+        self.__releaseFile()
@@ -0,0 +1,184 @@
+from PySide6.QtCore import QObject, Signal, Slot, QByteArray, QTimer, QElapsedTimer, QMetaObject, Qt, QThread
+from PySide6.QtSerialPort import QSerialPort
+from datetime import datetime
+import typing
+
+from multiserialviewer.settings.serialConnectionSettings import SerialConnectionSettings
+from multiserialviewer.serial_data.rawDataRecorder import RawDataFile
+
+
+class RawDataReplaySource(QObject):
+    """ Replays a raw data file (see RawDataFile) instead of receiving data from a serial port.
+
+    Has the same interface as SerialDataReceiver, so it can be used by SerialViewerController
+    instead of a real port. The chunks are emitted with their recorded rx time, either with the
+    recorded timing (speed 1.0), N times faster (speed N) or as fast as possible (AS_FAST_AS_POSSIBLE).
+    When the end of the file is reached, the source stays open (like a port without data).
+
+    The replay can be faster than the processing of the chunks. With setMaxPendingChunks, the replay pauses
+    while this number of emitted chunks was not acknowledged (handleChunkProcessed) by the consumer.
+    """
+    signal_rawDataAvailable: Signal = Signal(datetime, QByteArray)
+    signal_errorOccurred: Signal = Signal(str)
+    # results of requestOpenPort and requestClosePort
+    signal_portOpened: Signal = Signal(bool, str)
+    signal_portClosed: Signal = Signal()
+
+    AS_FAST_AS_POSSIBLE = 0.0
+    # maximum duration of emitting chunks without returning to the event loop
+    SLICE_DURATION_MS = 10
+
+    def __init__(self, settings: SerialConnectionSettings, filePath: str, speed: float = 1.0):
+        super(RawDataReplaySource, self).__init__()
+
+        self.__settings = settings
+        self.__filePath: str = filePath
+        self.__speed: float = speed
+        self.__portIsOpen: bool = False
+        self.__openResult: tuple[bool, str] = (False, QSerialPort.SerialPortError.NoError.name)
+
+        self.__records: typing.Optional[typing.Iterator[tuple[datetime, bytes]]] = None
+        self.__nextRecord: typing.Optional[tuple[datetime, bytes]] = None
+        self.__firstRxTime: typing.Optional[datetime] = None
+        self.__replayTime: QElapsedTimer = QElapsedTimer()
+        # emitted chunks, which were not acknowledged yet (see setMaxPendingChunks)
+        self.__pendingChunks: int = 0
+        self.__maxPendingChunks: int | None = None
+
+        self.__timer: QTimer = QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.__timer.timeout.connect(self.__replayDueRecords)
+
+    def __invokeInSourceThread(self, methodName: str):
+        if self.thread() == QThread.currentThread() or not self.thread().isRunning():
+            QMetaObject.invokeMethod(self, methodName, Qt.ConnectionType.DirectConnection)
+        else:
+            QMetaObject.invokeMethod(self, methodName, Qt.ConnectionType.BlockingQueuedConnection)
+
+    def __postToSourceThread(self, methodName: str):
+        if self.thread() == QThread.currentThread() or not self.thread().isRunning():
+            QMetaObject.invokeMethod(self, methodName, Qt.ConnectionType.DirectConnection)
+        else:
+            QMetaObject.invokeMethod(self, methodName, Qt.ConnectionType.QueuedConnection)
+
+    def requestOpenPort(self):
+        """ Like openPort, but does not wait for the result (see signal_portOpened) """
+        self.__postToSourceThread('__handleOpenPortRequest')
+
+    def requestClosePort(self):
+        """ Like closePort, but does not wait. signal_portClosed is emitted, if the port was open. """
+        self.__postToSourceThread('__handleClosePortRequest')
+
+    def openPort(self) -> tuple[bool, str]:
+        """ Starts the replay from the beginning of the file """
+        self.__invokeInSourceThread('__handleOpenPort')
+        return self.__openResult
+
+    def closePort(self):
+        self.__invokeInSourceThread('__handleClosePort')
+
+    def portIsOpen(self):
+        return self.__portIsOpen
+
+    def getSettings(self) -> SerialConnectionSettings:
+        return self.__settings
+
+    def getFilePath(self) -> str:
+        return self.__filePath
+
+    def setMaxPendingChunks(self, maxPendingChunks: int | None):
+        """ Every emitted chunk must be acknowledged with handleChunkProcessed (None: no limit) """
+        self.__maxPendingChunks = maxPendingChunks
+
+    def getPendingChunkCount(self) -> int:
+        return self.__pendingChunks
+
+    @Slot()
+    def handleChunkProcessed(self):
+        """ Acknowledges an emitted chunk (must be called in the thread of the source, e.g. queued connection) """
+        self.__pendingChunks -= 1
+        if (self.__maxPendingChunks is not None and self.__pendingChunks == self.__maxPendingChunks // 2 and
+                self.__portIsOpen and not self.__timer.isActive()):
+            # the replay was paused, it is continued when half of the pending chunks are processed
+            self.__scheduleNextRecord()
+
+    def __isPaused(self) -> bool:
+        return self.__maxPendingChunks is not None and self.__pendingChunks >= self.__maxPendingChunks
+
+    def isFinished(self) -> bool:
+        return self.__portIsOpen and self.__nextRecord is None
+
+    @Slot()
+    def __handleOpenPort(self):
+        if self.__portIsOpen:
+            self.__openResult = (True, QSerialPort.SerialPortError.NoError.name)
+            return
+
+        try:
+            self.__records = RawDataFile.readRecords(self.__filePath)
+            self.__nextRecord = next(self.__records, None)
+        except OSError:
+            self.__openResult = (False, QSerialPort.SerialPortError.DeviceNotFoundError.name)
+            return
+        except ValueError:
+            self.__openResult = (False, QSerialPort.SerialPortError.OpenError.name)
+            return
+
+        self.__firstRxTime = self.__nextRecord[0] if self.__nextRecord is not None else None
+        self.__replayTime.start()
+        self.__portIsOpen = True
+        self.__openResult = (True, QSerialPort.SerialPortError.NoError.name)
+        self.__scheduleNextRecord()
+
+    @Slot()
+    def __handleOpenPortRequest(self):
+        self.__handleOpenPort()
+        self.signal_portOpened.emit(*self.__openResult)
+
+    @Slot()
+    def __handleClosePortRequest(self):
+        wasOpen = self.__portIsOpen
+        self.__handleClosePort()
+        if wasOpen:
+            self.signal_portClosed.emit()
+
+    @Slot()
+    def __handleClosePort(self):
+        self.__timer.stop()
+        if self.__records is not None:
+            self.__records.close()
+        self.__records = None
+        self.__nextRecord = None
+        self.__portIsOpen = False
+
+    def __getDueTimeMs(self, rxTime: datetime) -> float:
+        return (rxTime - self.__firstRxTime).total_seconds() * 1000 / self.__speed
+
+    def __scheduleNextRecord(self):
+        if self.__nextRecord is None or self.__isPaused():
+            # end of the file or continued by handleChunkProcessed
+            return
+        if self.__speed == RawDataReplaySource.AS_FAST_AS_POSSIBLE:
+            self.__timer.start(0)
+        else:
+            self.__timer.start(max(0, int(self.__getDueTimeMs(self.__nextRecord[0]) - self.__replayTime.elapsed())))
+
+    @Slot()
+    def __replayDueRecords(self):
+        sliceDuration = QElapsedTimer()
+        sliceDuration.start()
+        while (self.__nextRecord is not None and not self.__isPaused() and
+               sliceDuration.elapsed() < RawDataReplaySource.SLICE_DURATION_MS):
+            rxTime, data = self.__nextRecord
+            if (self.__speed != RawDataReplaySource.AS_FAST_AS_POSSIBLE and
+                    self.__getDueTimeMs(rxTime) > self.__replayTime.elapsed()):
+                break
+            self.__pendingChunks += 1
+            self.signal_rawDataAvailable.emit(rxTime, QByteArray(data))
+            try:
+                self.__nextRecord = next(self.__records, None)
+            except OSError as e:
+                self.__nextRecord = None
+                self.signal_errorOccurred.emit(f'Replay stopped ({e})')
+        self.__scheduleNextRecord()
@@ -1,11 +1,40 @@
 from PySide6.QtCore import Signal, Slot, QObject, QByteArray
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timedelta
+import re
+import time
+import typing
+
+from multiserialviewer.settings.applicationSettings import ApplicationSettings
+
+if typing.TYPE_CHECKING:
+    from multiserialviewer.serial_data.lineTimestamps import LineTimestamps
 
 
 class SerialDataProcessor(QObject):
     signal_asciiDataAvailable: Signal = Signal(str)
     signal_deleteLine: Signal = Signal()
     signal_numberOfNonPrintableChars: Signal = Signal(int)
+    # emitted after every chunk, if enabled (see setRawDataProcessedEnabled)
+    signal_rawDataProcessed: Signal = Signal()
+
+    LINEBREAK_CHARS: bytes = b'\r\n'
+    DELETE_LINE_CHAR: bytes = b'\b'
+    # everything except 32..126 and '\n' (0x0A), '\r' (0x0D)
+    NON_PRINTABLE_CHARS: bytes = bytes(range(0, 0x0A)) + bytes(range(0x0B, 0x0D)) + bytes(range(0x0E, 32)) + bytes(range(127, 256))
+
+    # lookup tables and regular expressions used to convert a whole chunk at once (instead of byte by byte)
+    NON_PRINTABLE_CHAR_REGEX: re.Pattern = re.compile(rb'[^\x20-\x7E\r\n]')
+    HEX_REPLACEMENTS: dict[bytes, bytes] = {bytes([b]): f'[{b:02X}]'.encode() for b in NON_PRINTABLE_CHARS}
+    LINE_SPLIT_REGEX: re.Pattern = re.compile(r'(?<=[\r\n])')
+    LINEBREAK_REGEX: re.Pattern = re.compile(rb'[\r\n]')
+
+    # timestamp of TimestampMode.elapsedMs (preformatted with str.format instead of strftime)
+    ELAPSED_MS_FORMAT: str = '[{:>10.3f}] '
+    # %f (but not %%f) of the timestamp format, replaced by MICROSECOND_MARK (see __formatTimeOfDay)
+    MICROSECOND_DIRECTIVE_REGEX: re.Pattern = re.compile(r'(%%)|%f')
+    MICROSECOND_MARK: str = '\ue000'
+    MAX_PENDING_LINE_TIMESTAMPS = 1024
 
     def __init__(self):
         super(SerialDataProcessor, self).__init__()
@@ -13,8 +42,36 @@ class SerialDataProcessor(QObject):
         self.__backspaceDeletesLastLine: bool = False
         self.__insertTimestampAtLineStart: bool = True
         self.__timestampFormat: str = ""
+        self.__timestampMode: ApplicationSettings.TimestampMode = ApplicationSettings.TimestampMode.timeOfDay
+        # rx time of the first data of the capture (TimestampMode.elapsedMs)
+        self.__captureStartTime: datetime | None = None
+
+        # the rendered timestamp is reused as long as the rx time does not change the result
+        self.__cachedTimestampKey: datetime | None = None
+        self.__cachedTimestamp: str = ""
+        # the timestamp of the current second, split at the microseconds
+        self.__cachedSecond: datetime | None = None
+        self.__cachedSecondParts: list[str] = []
 
         self.__lastReceivedChar: int | None = None
+        # estimated rx times of the lines of the received chunks, not processed yet (see handleLineTimestamps)
+        self.__lineTimestamps: deque['LineTimestamps'] = deque(maxlen=SerialDataProcessor.MAX_PENDING_LINE_TIMESTAMPS)
+        self.__rawDataProcessedEnabled: bool = False
+        # rx time of the chunk, which is processed (see getRxTime)
+        self.__rxTime: datetime | None = None
+        # time spent in handleRawData (including the directly connected receivers, e.g. the match engine)
+        self.__processingTimeNs: int = 0
+
+    def setRawDataProcessedEnabled(self, state: bool):
+        """ signal_rawDataProcessed is only emitted if needed (e.g. for the flow control of a RawDataReplaySource) """
+        self.__rawDataProcessedEnabled = state
+
+    def getRxTime(self) -> float | None:
+        """ Returns the rx time (seconds since the epoch) of the chunk, whose text is emitted """
+        return self.__rxTime.timestamp() if self.__rxTime is not None else None
+
+    def getProcessingTimeNs(self) -> int:
+        return self.__processingTimeNs
 
     @Slot()
     def setConvertNonPrintableCharsToHex(self, state: bool):
@@ -25,54 +82,159 @@ class SerialDataProcessor(QObject):
         self.__backspaceDeletesLastLine = state
 
     @Slot()
-    def setShowTimestampAtLineStart(self, state: bool, strFormat: str):
+    def setShowTimestampAtLineStart(self, state: bool, strFormat: str,
+                                    mode: ApplicationSettings.TimestampMode = ApplicationSettings.TimestampMode.timeOfDay):
         self.__insertTimestampAtLineStart = state
         self.__timestampFormat = strFormat
+        self.__timestampMode = mode
         self.clear()
 
     def clear(self):
         self.__lastReceivedChar = None
+        self.restartElapsedTime()
+
+    def restartElapsedTime(self):
+        """ The elapsed time (TimestampMode.elapsedMs) starts again with the next received data """
+        self.__captureStartTime = None
+        self.__cachedTimestampKey = None
+        self.__cachedSecond = None
+
+    def __getTimestamp(self, rxTime: datetime) -> str:
+        if self.__timestampMode == ApplicationSettings.TimestampMode.elapsedMs:
+            if self.__captureStartTime is None:
+                self.__captureStartTime = rxTime
+            key = rxTime
+        elif '%f' in self.__timestampFormat:
+            key = rxTime
+        else:
+            # all other directives have a resolution of (at most) one second
+            key = rxTime.replace(microsecond=0)
+
+        if key != self.__cachedTimestampKey:
+            if self.__timestampMode == ApplicationSettings.TimestampMode.elapsedMs:
+                elapsedMs = (rxTime - self.__captureStartTime) / timedelta(milliseconds=1)
+                self.__cachedTimestamp = SerialDataProcessor.ELAPSED_MS_FORMAT.format(elapsedMs)
+            else:
+                self.__cachedTimestamp = self.__formatTimeOfDay(rxTime)
+            self.__cachedTimestampKey = key
+        return self.__cachedTimestamp
+
+    def __formatTimeOfDay(self, rxTime: datetime) -> str:
+        # strftime is slow (e.g. with per-line timestamps), but except %f, the directives change at most once per second
+        second = rxTime.replace(microsecond=0)
+        if second != self.__cachedSecond:
+            timestampFormat = SerialDataProcessor.MICROSECOND_DIRECTIVE_REGEX.sub(
+                lambda match: match.group(1) or SerialDataProcessor.MICROSECOND_MARK, self.__timestampFormat)
+            self.__cachedSecondParts = second.strftime(timestampFormat).split(SerialDataProcessor.MICROSECOND_MARK)
+            self.__cachedSecond = second
+        return f'{rxTime.microsecond:06d}'.join(self.__cachedSecondParts)
+
+    def __getLineTimestamp(self, lineStartTimes: dict[int, datetime] | None, pos: int, timestamp: str) -> str:
+        if lineStartTimes and pos in lineStartTimes:
+            return self.__getTimestamp(lineStartTimes[pos])
+        return timestamp
+
+    def __takeLineStartTimes(self, rxTime: datetime, data: bytes) -> dict[int, datetime] | None:
+        # the line timestamps of chunks, which were received before, are not needed anymore
+        while len(self.__lineTimestamps) > 0 and self.__lineTimestamps[0].rxTime < rxTime:
+            self.__lineTimestamps.popleft()
+        if (len(self.__lineTimestamps) == 0 or self.__lineTimestamps[0].rxTime != rxTime or
+                self.__lineTimestamps[0].chunkSize != len(data)):
+            return None
+        return self.__lineTimestamps.popleft().getStartTimes()
+
+    @Slot(object)
+    def handleLineTimestamps(self, lineTimestamps: 'LineTimestamps'):
+        """ Called in the receiver thread (direct connection) before the chunk is emitted, so it is available
+        when the chunk is processed (see SerialDataReceiver.setLineTimestampsEnabled)
+        """
+        self.__lineTimestamps.append(lineTimestamps)
 
     @staticmethod
-    def __charIsLinebreak(b: int) -> bool:
-        return b is not None and (b == 0x0D or b == 0x0A)  # '\r' or '\n'
-
-    @staticmethod
-    def __charIsDeleteLine(b: int) -> bool:
-        return b is not None and b == 0x08  # '\b'
-
-    @staticmethod
-    def __charIsPrintable(b: int) -> bool:
-        return 32 <= b <= 126
-
-    @staticmethod
-    def __getPrintableReplacement(b: int) -> str:
-        return f'[{b:02X}]'
+    def __getPrintableReplacement(match: re.Match) -> bytes:
+        return SerialDataProcessor.HEX_REPLACEMENTS[match.group()]
+
+    def __toText(self, data: bytes) -> tuple[str, int]:
+        """ Returns the printable text and the number of converted non-printable chars """
+        if self.__convertNonPrintableCharsToHex:
+            data, nonPrintableCharsCount = SerialDataProcessor.NON_PRINTABLE_CHAR_REGEX.subn(
+                SerialDataProcessor.__getPrintableReplacement, data)
+            return data.decode('ascii'), nonPrintableCharsCount
+        else:
+            return data.translate(None, SerialDataProcessor.NON_PRINTABLE_CHARS).decode('ascii'), 0
+
+    def __insertTimestamps(self, text: str, data: bytes, timestamp: str, followedByData: bool,
+                           lineStartTimes: dict[int, datetime] | None = None) -> str:
+        # text is the printable representation of data. A timestamp is inserted in front of every
+        # byte of data that follows a linebreak (also in front of a byte that is not printable).
+        # lineStartTimes are the estimated rx times of the lines starting at a position of data.
+        lines = SerialDataProcessor.LINE_SPLIT_REGEX.split(text)
+        endsWithLinebreak = len(lines) > 1 and len(lines[-1]) == 0
+        if endsWithLinebreak:
+            del lines[-1]
+
+        if lineStartTimes and len(lines) > 1:
+            # the linebreaks of text and data are the same (only other chars are converted)
+            lineStarts = [match.end() for match in SerialDataProcessor.LINEBREAK_REGEX.finditer(data)]
+            text = lines[0] + ''.join(self.__getLineTimestamp(lineStartTimes, start, timestamp) + line
+                                      for start, line in zip(lineStarts, lines[1:]))
+        else:
+            text = timestamp.join(lines)
+        if self.__lastReceivedChar is not None and self.__lastReceivedChar in SerialDataProcessor.LINEBREAK_CHARS:
+            if len(data) > 0 or followedByData:
+                text = self.__getLineTimestamp(lineStartTimes, 0, timestamp) + text
+        if endsWithLinebreak and (data[-1] not in SerialDataProcessor.LINEBREAK_CHARS or followedByData):
+            text += timestamp
+
+        if followedByData:
+            self.__lastReceivedChar = SerialDataProcessor.DELETE_LINE_CHAR[0]
+        elif len(data) > 0:
+            self.__lastReceivedChar = data[-1]
+        return text
 
     @Slot(datetime, QByteArray)
     def handleRawData(self, rxTime: datetime, rawData: QByteArray):
         if rawData.size() > 0:
+            startTime = time.perf_counter_ns()
+            data: bytes = rawData.data()
             nonPrintableCharsCount = 0
-            asciiData: str = ''
-
-            for b in rawData.data():
-                if self.__insertTimestampAtLineStart:
-                    if self.__charIsLinebreak(self.__lastReceivedChar):
-                        asciiData += rxTime.strftime(self.__timestampFormat)
-                    self.__lastReceivedChar = b
-
-                if SerialDataProcessor.__charIsPrintable(b) or SerialDataProcessor.__charIsLinebreak(b):
-                    asciiData += chr(b)
-                elif self.__backspaceDeletesLastLine and SerialDataProcessor.__charIsDeleteLine(b):
-                    if len(asciiData) > 0:
-                        self.signal_asciiDataAvailable.emit(asciiData)
-                        asciiData = ''
+            self.__rxTime = rxTime
+            lineStartTimes = self.__takeLineStartTimes(rxTime, data)
+            timestamp = None
+            if self.__insertTimestampAtLineStart:
+                if (lineStartTimes and self.__captureStartTime is None and
+                        self.__timestampMode == ApplicationSettings.TimestampMode.elapsedMs):
+                    # the elapsed time (TimestampMode.elapsedMs) starts with the first line, not with rxTime
+                    self.__getTimestamp(min(lineStartTimes.values()))
+                timestamp = self.__getTimestamp(rxTime)
+
+            if self.__backspaceDeletesLastLine:
+                segments = data.split(SerialDataProcessor.DELETE_LINE_CHAR)
+            else:
+                segments = [data]
+
+            segmentStart = 0
+            for index, segment in enumerate(segments):
+                followedByDeleteLine = index < len(segments) - 1
+
+                asciiData, count = self.__toText(segment)
+                nonPrintableCharsCount += count
+                if timestamp is not None:
+                    segmentStartTimes = lineStartTimes
+                    if lineStartTimes and segmentStart > 0:
+                        segmentStartTimes = {pos - segmentStart: startTime for pos, startTime in lineStartTimes.items()
+                                             if pos >= segmentStart}
+                    asciiData = self.__insertTimestamps(asciiData, segment, timestamp, followedByDeleteLine,
+                                                        segmentStartTimes)
+                segmentStart += len(segment) + 1
+
+                if len(asciiData) > 0:
+                    self.signal_asciiDataAvailable.emit(asciiData)
+                if followedByDeleteLine:
                     self.signal_deleteLine.emit()
-                elif self.__convertNonPrintableCharsToHex:
-                    nonPrintableCharsCount += 1
-                    asciiData += SerialDataProcessor.__getPrintableReplacement(b)
 
-            if len(asciiData) > 0:
-                self.signal_asciiDataAvailable.emit(asciiData)
             if nonPrintableCharsCount > 0:
                 self.signal_numberOfNonPrintableChars.emit(nonPrintableCharsCount)
+            self.__processingTimeNs += time.perf_counter_ns() - startTime
+        if self.__rawDataProcessedEnabled:
+            self.signal_rawDataProcessed.emit()
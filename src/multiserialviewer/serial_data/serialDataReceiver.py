@@ -1,11 +1,29 @@
 from PySide6.QtSerialPort import QSerialPort
-from PySide6.QtCore import Slot, Signal, QObject, QByteArray, QThread
+from PySide6.QtCore import Slot, Signal, QObject, QByteArray, QThread, QMetaObject, Qt
 from multiserialviewer.settings.serialConnectionSettings import SerialConnectionSettings
+from multiserialviewer.serial_data.serialDataStatistics import Translator
+from multiserialviewer.serial_data.lineTimestamps import LineTimestamps
+from multiserialviewer.serial_data.serialDataProcessor import SerialDataProcessor
 from datetime import datetime
+import time
 
 
 class SerialDataReceiver(QObject):
+    """ Reads the data of a serial port.
+
+    The receiver is meant to live in its own (I/O) thread. openPort and closePort can be called from
+    any thread: the port is opened and closed in the thread of the receiver, because QSerialPort uses
+    socket notifiers of the thread it is opened in.
+
+    If enabled (setLineTimestampsEnabled), signal_lineTimestampsAvailable is emitted before every
+    signal_rawDataAvailable with the estimated receive times of the lines of the chunk (see LineTimestamps).
+    """
     signal_rawDataAvailable: Signal = Signal(datetime, QByteArray)
+    signal_lineTimestampsAvailable: Signal = Signal(object)
+    signal_errorOccurred: Signal = Signal(str)
+    # results of requestOpenPort and requestClosePort
+    signal_portOpened: Signal = Signal(bool, str)
+    signal_portClosed: Signal = Signal()
 
     def __init__(self, settings: SerialConnectionSettings):
         super(SerialDataReceiver, self).__init__()
@@ -17,32 +35,106 @@ class SerialDataReceiver(QObject):
         self.__serialPort.setStopBits(settings.stopBits)
         self.__serialPort.setDataBits(settings.dataBits)
         self.__settings = settings
+        self.__portIsOpen: bool = False
+        self.__openResult: tuple[bool, str] = (False, QSerialPort.SerialPortError.NoError.name)
+
+        self.__lineTimestampsEnabled: bool = False
+        self.__frameDurationNs: int = Translator.frameDurationNs(settings)
+        self.__previousRxTimeNs: int = 0
+        self.__lastByteWasLineEnd: bool = True
 
         self.__serialPort.readyRead.connect(self.__handleData)
+        self.__serialPort.errorOccurred.connect(self.__handleError)
+
+    def __invokeInReceiverThread(self, methodName: str):
+        if self.thread() == QThread.currentThread() or not self.thread().isRunning():
+            QMetaObject.invokeMethod(self, methodName, Qt.ConnectionType.DirectConnection)
+        else:
+            QMetaObject.invokeMethod(self, methodName, Qt.ConnectionType.BlockingQueuedConnection)
+
+    def __postToReceiverThread(self, methodName: str):
+        if self.thread() == QThread.currentThread() or not self.thread().isRunning():
+            QMetaObject.invokeMethod(self, methodName, Qt.ConnectionType.DirectConnection)
+        else:
+            QMetaObject.invokeMethod(self, methodName, Qt.ConnectionType.QueuedConnection)
+
+    def requestOpenPort(self):
+        """ Like openPort, but does not wait for the result (see signal_portOpened) """
+        self.__postToReceiverThread('__handleOpenPortRequest')
+
+    def requestClosePort(self):
+        """ Like closePort, but does not wait. signal_portClosed is emitted, if the port was open. """
+        self.__postToReceiverThread('__handleClosePortRequest')
 
     def openPort(self) -> tuple[bool, str]:
+        self.__invokeInReceiverThread('__handleOpenPort')
+        return self.__openResult
+
+    def closePort(self):
+        self.__invokeInReceiverThread('__handleClosePort')
+
+    def portIsOpen(self):
+        return self.__portIsOpen
+
+    def getSettings(self) -> SerialConnectionSettings:
+        return self.__settings
+
+    def setLineTimestampsEnabled(self, state: bool):
+        self.__lineTimestampsEnabled = state
+
+    @Slot()
+    def __handleOpenPort(self):
         if not self.__serialPort.isOpen():
             self.__serialPort.clearError()
             openedSuccessfully = self.__serialPort.open(QSerialPort.OpenModeFlag.ReadOnly)
             if openedSuccessfully:
                 self.__serialPort.clear(QSerialPort.Direction.AllDirections)
-            return openedSuccessfully, self.__serialPort.error().name
+                self.__previousRxTimeNs = time.perf_counter_ns()
+                self.__lastByteWasLineEnd = True
+            self.__openResult = (openedSuccessfully, self.__serialPort.error().name)
         else:
-            return True, QSerialPort.SerialPortError.NoError.name
+            self.__openResult = (True, QSerialPort.SerialPortError.NoError.name)
+        self.__portIsOpen = self.__serialPort.isOpen()
 
-    def closePort(self):
-        if self.__serialPort.isOpen():
-            self.__serialPort.close()
+    @Slot()
+    def __handleOpenPortRequest(self):
+        self.__handleOpenPort()
+        self.signal_portOpened.emit(*self.__openResult)
 
-    def portIsOpen(self):
-        return self.__serialPort.isOpen()
+    @Slot()
+    def __handleClosePortRequest(self):
+        wasOpen = self.__portIsOpen
+        self.__handleClosePort()
+        if wasOpen:
+            self.signal_portClosed.emit()
 
-    def getSettings(self) -> SerialConnectionSettings:
-        return self.__settings
+    @Slot()
+    def __handleClosePort(self):
+        if self.__serialPort.isOpen():
+            self.__serialPort.close()
+        self.__portIsOpen = False
 
     @Slot()
     def __handleData(self):
+        rxTimeNs = time.perf_counter_ns()
         rxTime = datetime.now()
         receivedData: QByteArray = self.__serialPort.readAll()
         if receivedData.size() > 0:
+            data: bytes = receivedData.data()
+            if self.__lineTimestampsEnabled:
+                # emitted first, so the timestamps are available when the processor handles the data
+                self.signal_lineTimestampsAvailable.emit(
+                    LineTimestamps.estimate(data, rxTime, rxTimeNs, self.__frameDurationNs,
+                                            self.__lastByteWasLineEnd, self.__previousRxTimeNs))
             self.signal_rawDataAvailable.emit(rxTime, receivedData)
+            self.__lastByteWasLineEnd = data[-1] in SerialDataProcessor.LINEBREAK_CHARS
+            self.__previousRxTimeNs = rxTimeNs
+
+    @Slot(QSerialPort.SerialPortError)
+    def __handleError(self, error: QSerialPort.SerialPortError):
+        # errors while opening the port are returned by openPort
+        if error != QSerialPort.SerialPortError.NoError and self.__portIsOpen:
+            if error == QSerialPort.SerialPortError.ResourceError:
+                # e.g. the device was removed
+                self.__handleClosePort()
+            self.signal_errorOccurred.emit(f'{error.name}: {self.__serialPort.errorString()}')
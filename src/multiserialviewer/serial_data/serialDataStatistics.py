@@ -1,6 +1,12 @@
 from multiserialviewer.settings.serialConnectionSettings import SerialConnectionSettings
-from PySide6.QtCore import Signal, Slot, QObject, QByteArray, QTimer, Qt, QMetaObject
+from PySide6.QtCore import QByteArray
 from PySide6.QtSerialPort import QSerialPort
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import NamedTuple
+import threading
+import time
 
 
 class Translator:
@@ -31,61 +37,109 @@ class Translator:
 
         return lookup_dataBits[dataBits]
 
+    @staticmethod
+    def settingsToBitsPerFrame(settings: SerialConnectionSettings) -> float:
+        """ Returns the number of data, stop and parity bits of a frame (without the start bit) """
+        return Translator.datasToBits(settings.dataBits) + \
+               Translator.stopsToBits(settings.stopBits) + \
+               Translator.parityToBits(settings.parity)
 
-class SerialDataStatistics(QObject):
-    signal_curUsageChanged = Signal(int)
-    signal_maxUsageChanged = Signal(int)
-    signal_receivedBytesIncremented = Signal(int)
+    @staticmethod
+    def frameDurationNs(settings: SerialConnectionSettings) -> int:
+        """ Returns the duration of transmitting one byte (including the start bit) in nanoseconds """
+        return round((1 + Translator.settingsToBitsPerFrame(settings)) * 1000000000 / settings.baudrate)
 
-    def __init__(self, settings: SerialConnectionSettings):
-        super(SerialDataStatistics, self).__init__()
 
-        self.__bitsPerFrame: float = Translator.datasToBits(settings.dataBits) + \
-                                     Translator.stopsToBits(settings.stopBits) + \
-                                     Translator.parityToBits(settings.parity)
-        self.__period: float = round(10000.0 / settings.baudrate, 5)
+class Throughput(NamedTuple):
+    windowSeconds: int
+    bytesPerSecond: float
+    usagePercent: float
 
-        self.__maxBytesPerPeriod: int = round((settings.baudrate * self.__period) / self.__bitsPerFrame)
-        self.__receivedBytesPerPeriod: int = 0
-        self.__overallReceivedBytes: int = 0
-        self.__maxUsage: int = 0
 
-        self.__refreshSignalsTimer = QTimer(self)
-        self.__refreshSignalsTimer.setTimerType(Qt.TimerType.PreciseTimer)
-        self.__refreshSignalsTimer.setInterval(int(self.__period * 1000))
-        self.__refreshSignalsTimer.setSingleShot(False)
-        self.__refreshSignalsTimer.timeout.connect(self.__handleTimeoutRefreshSignals)
+class SerialDataStatistics:
+    """ Measures the received bytes per second and the bandwidth usage over sliding windows (WINDOWS_S).
 
-        self.__refreshSignalsTimer.start()
+    handleRawData is called in the receiver thread (direct connection) and only appends the rx time of the
+    chunk and the number of bytes received so far (a prefix sum). The throughput is calculated when it is
+    displayed (see getThroughput): the bytes of a window are the difference of two prefix sums, which are
+    found by a binary search of the rx times. So no timer and no thread is needed.
+    """
+    WINDOWS_S = (1, 10, 60)
+    # chunks older than the largest window are removed in batches of at least this size
+    TRIM_MIN_CHUNKS = 1024
 
-    @Slot(QByteArray, QByteArray)
-    def handleRawData(self, rxTime, rawData: QByteArray):
-        self.__receivedBytesPerPeriod += rawData.size()
-        self.__overallReceivedBytes += rawData.size()
+    def __init__(self, settings: SerialConnectionSettings):
+        self.__frameDurationS: float = Translator.frameDurationNs(settings) / 1e9
+
+        self.__lock = threading.Lock()
+        self.__rxTimes: array = array('d')
+        # received bytes up to and including the chunk
+        self.__totals: array = array('q')
+        # received bytes before the first kept chunk
+        self.__trimmedTotal: int = 0
+        self.__lastRxTime: float = 0.0
+        self.__lastArrivalTime: float = 0.0
+        self.__maxUsage: float = 0.0
+        # rx time of the first byte (estimated from the first chunk), a window is not longer than the capture
+        self.__firstByteRxTime: float | None = None
+
+    def handleRawData(self, rxTime: datetime, rawData: QByteArray):
+        arrivalTime = time.monotonic()
+        with self.__lock:
+            # the rx times are kept sorted (e.g. if the clock is adjusted)
+            rxTimestamp = max(rxTime.timestamp(), self.__lastRxTime)
+            if self.__firstByteRxTime is None and rawData.size() > 0:
+                self.__firstByteRxTime = rxTimestamp - rawData.size() * self.__frameDurationS
+            self.__rxTimes.append(rxTimestamp)
+            self.__totals.append(self.__getReceivedBytes() + rawData.size())
+            self.__lastRxTime = rxTimestamp
+            self.__lastArrivalTime = arrivalTime
+
+            outdated = bisect_left(self.__rxTimes, rxTimestamp - SerialDataStatistics.WINDOWS_S[-1])
+            if outdated >= SerialDataStatistics.TRIM_MIN_CHUNKS:
+                self.__trimmedTotal = self.__totals[outdated - 1]
+                del self.__rxTimes[:outdated]
+                del self.__totals[:outdated]
 
     def reset(self):
-        QMetaObject.invokeMethod(self, '__handleReset', Qt.ConnectionType.QueuedConnection)
-
-    @Slot()
-    def __handleReset(self):
-        self.__overallReceivedBytes = 0
-        self.__maxUsage = 0
-
-    @Slot()
-    def __handleTimeoutRefreshSignals(self):
-        curUtilization: int = int(round((self.__receivedBytesPerPeriod / self.__maxBytesPerPeriod) * 100))
-
-        # curUtilization is not very accurate for two reasons:
-        # 1. QTimer has a jitter
-        # 2. We receive multiple bytes at once which could (partly) belong to the previous period.
-        #    That's why we calculate sometimes a utilization > 100%. On the other side, we could get a
-        #    utilization which is too small, because the received bytes are not processed/forwarded yet.
-        curUtilization = min(curUtilization, 100)
-        self.signal_curUsageChanged.emit(curUtilization)
-        self.signal_receivedBytesIncremented.emit(self.__overallReceivedBytes)
-
-        if curUtilization > self.__maxUsage:
-            self.__maxUsage = curUtilization
-            self.signal_maxUsageChanged.emit(self.__maxUsage)
-
-        self.__receivedBytesPerPeriod = 0
+        with self.__lock:
+            self.__rxTimes = array('d')
+            self.__totals = array('q')
+            self.__trimmedTotal = 0
+            # e.g. a restarted replay has earlier rx times
+            self.__lastRxTime = 0.0
+            self.__lastArrivalTime = 0.0
+            self.__maxUsage = 0.0
+            self.__firstByteRxTime = None
+
+    def __getReceivedBytes(self) -> int:
+        return self.__totals[-1] if len(self.__totals) > 0 else self.__trimmedTotal
+
+    def getReceivedBytes(self) -> int:
+        with self.__lock:
+            return self.__getReceivedBytes()
+
+    def getMaxUsage(self) -> float:
+        """ Returns the maximum usage of the first window, as far as it was calculated by getThroughput """
+        return self.__maxUsage
+
+    def getThroughput(self) -> list[Throughput]:
+        """ Returns the throughput of every window in WINDOWS_S, which ends now """
+        with self.__lock:
+            # the rx times are compared to now, converted to the clock of the rx times (replayed data has
+            # the recorded rx times)
+            end = self.__lastRxTime + (time.monotonic() - self.__lastArrivalTime)
+            total = self.__getReceivedBytes()
+            throughput = []
+            for windowSeconds in SerialDataStatistics.WINDOWS_S:
+                first = bisect_right(self.__rxTimes, end - windowSeconds)
+                receivedBytes = total - (self.__totals[first - 1] if first > 0 else self.__trimmedTotal)
+                # the window of a capture, which is younger than the window, starts with the capture
+                duration = windowSeconds
+                if self.__firstByteRxTime is not None:
+                    duration = min(windowSeconds, end - self.__firstByteRxTime)
+                # a chunk at the start of the window can contain bytes received before the window
+                usage = min(100.0, 100.0 * receivedBytes * self.__frameDurationS / duration)
+                throughput.append(Throughput(windowSeconds, receivedBytes / duration, usage))
+            self.__maxUsage = max(self.__maxUsage, throughput[0].usagePercent)
+        return throughput
@@ -0,0 +1,416 @@
+from PySide6.QtCore import Signal, Slot, QObject
+from bisect import bisect_left, bisect_right
+import re
+import typing
+
+from multiserialviewer.serial_data.deadlineScheduler import DeadlineScheduler
+
+try:
+    from re import _parser as sre_parse
+    from re import _compiler as sre_compile
+except ImportError:
+    # Python < 3.11
+    import sre_parse
+    import sre_compile
+
+
+class StreamingPattern(QObject):
+    """ Pattern of a StreamingMatchEngine. Emits the groups of every match found in the stream. """
+    signal_textExtracted: Signal = Signal(str, object)
+
+    def __init__(self, name: str, pattern: str, start: int, chunkCount: int, parent: QObject):
+        super(StreamingPattern, self).__init__(parent)
+
+        self.name = name
+        self.regex = re.compile(pattern)
+        self.requiredLiteral: str = StreamingMatchEngine.getRequiredLiteral(pattern)
+        self.dependsOnBufferStart: bool = StreamingMatchEngine.dependsOnTextBeforeMatch(pattern)
+        self.maxMatchLength: int | None = StreamingMatchEngine.getMaxMatchLength(pattern)
+        # only needed, if the match length is unlimited
+        self.incompleteMatchRegex: re.Pattern | None = None
+        if self.maxMatchLength is None:
+            self.incompleteMatchRegex = StreamingMatchEngine.getIncompleteMatchRegex(pattern)
+
+        # stream position where the buffer of this pattern begins (text before was processed already)
+        self.start: int = start
+        # no match can start in the buffer before this position (no matter which bytes are received)
+        self.resumePos: int = start
+        # a match at the end of the stream is waiting for more bytes
+        self.waitingForMoreData: bool = False
+        # the buffer does not contain requiredLiteral, so the pattern is not searched until the literal is received.
+        # The buffer of a dormant pattern is only trimmed when it wakes up (for the chunks received after chunkCount).
+        self.dormant: bool = len(self.requiredLiteral) > 0
+        self.chunkCount: int = chunkCount
+
+    def firstPossibleMatchPos(self) -> int:
+        return max(self.start, self.resumePos)
+
+    def firstRequiredPos(self) -> int:
+        """ Returns the first stream position, which is still needed by this pattern """
+        return self.start if self.dependsOnBufferStart else self.firstPossibleMatchPos()
+
+
+class StreamingMatchEngine(QObject):
+    """ Extracts text matching several patterns from a stream of text (e.g. for all watches and counters of a viewer).
+
+    The received text is stored once for all patterns. Each pattern has its own position in this stream, so the
+    results are the same as if every pattern had its own buffer. Most patterns require a literal text (e.g. the
+    name of a watch). The received text is searched once for all these literals, and a pattern is only searched
+    with its regular expression if its buffer contains the literal. Text, in which a pattern cannot match (no matter
+    which text is received later), is not searched again. This is not known for patterns with anchors, assertions or
+    back references, so their buffer is searched again with every chunk until it is trimmed.
+    """
+    # a match is only processed if at least this number of bytes was received after it
+    TAIL_LENGTH = 5
+    # if the buffer of a pattern exceeds MAX_BUFFER_LENGTH, the first TRIM_LENGTH chars are dropped
+    MAX_BUFFER_LENGTH = 5000
+    TRIM_LENGTH = 2000
+    # a match at the end of the stream is processed if no more bytes were received within this time
+    TIMEOUT_MS = 100
+    # dormant patterns are brought up to date after this number of chunks (to limit the size of the stream)
+    MAX_CHUNK_HISTORY = 64
+
+    def __init__(self, scheduler: DeadlineScheduler | None = None, parent: QObject | None = None):
+        super(StreamingMatchEngine, self).__init__(parent)
+        # the scheduler should be shared by all engines of a thread
+        self.__scheduler: DeadlineScheduler = scheduler if scheduler is not None else DeadlineScheduler(self)
+
+        self.__patterns: list[StreamingPattern] = []
+        self.__patternsByLiteral: dict[str, list[StreamingPattern]] = {}
+        self.__literalRegex: re.Pattern | None = None
+        self.__maxLiteralLength: int = 0
+
+        self.__stream: str = ''
+        # stream position of self.__stream[0]
+        self.__streamOffset: int = 0
+        self.__maxStreamLength: int = 2 * StreamingMatchEngine.MAX_BUFFER_LENGTH
+        # end positions of the last received chunks (for dormant patterns)
+        self.__chunkEnds: list[int] = []
+        # number of chunks received before self.__chunkEnds[0]
+        self.__chunkEndsOffset: int = 0
+        # returns the rx time of the received chunk (see setRxTimeSource)
+        self.__rxTimeSource: typing.Callable[[], float | None] | None = None
+        # stream end positions and rx times of the chunks still in the stream (if the rx time is known)
+        self.__rxTimeChunkEnds: list[int] = []
+        self.__rxTimes: list[float] = []
+        # rx time of the chunk with the end of the match, which is emitted
+        self.__matchRxTime: float | None = None
+
+    @staticmethod
+    def getRequiredLiteral(pattern: str) -> str:
+        """ Returns the longest literal text which is part of every match of pattern ('' if there is none) """
+        try:
+            parsedPattern = sre_parse.parse(pattern)
+        except (re.error, RecursionError):
+            return ''
+        if parsedPattern.state.flags & re.IGNORECASE:
+            return ''
+
+        literals = ['']
+
+        def collect(items):
+            for op, av in items:
+                if op == sre_parse.LITERAL:
+                    literals[-1] += chr(av)
+                elif op == sre_parse.SUBPATTERN and not (av[1] & re.IGNORECASE):
+                    # a group without case-insensitive flag: (group, add_flags, del_flags, subpattern)
+                    collect(av[3])
+                else:
+                    literals.append('')
+
+        collect(parsedPattern)
+        return max(literals, key=len)
+
+    @staticmethod
+    def __getOpcodes(parsedPattern) -> list:
+        """ Returns the opcodes of the parsed pattern including all nested opcodes """
+        opcodes = []
+        for op, av in parsedPattern:
+            opcodes.append((op, av))
+            values = list(av) if isinstance(av, (tuple, list)) else [av]
+            while len(values) > 0:
+                value = values.pop()
+                if isinstance(value, sre_parse.SubPattern):
+                    opcodes.extend(StreamingMatchEngine.__getOpcodes(value))
+                elif isinstance(value, (tuple, list)):
+                    values.extend(value)
+        return opcodes
+
+    @staticmethod
+    def dependsOnTextBeforeMatch(pattern: str) -> bool:
+        """ Returns True if pattern contains an anchor, a word boundary or a lookbehind assertion """
+        try:
+            opcodes = StreamingMatchEngine.__getOpcodes(sre_parse.parse(pattern))
+        except (re.error, RecursionError):
+            return True
+        for op, av in opcodes:
+            if op == sre_parse.AT and av not in (sre_parse.AT_END, sre_parse.AT_END_STRING):
+                return True
+            if op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT) and av[0] < 0:
+                return True
+        return False
+
+    @staticmethod
+    def getMaxMatchLength(pattern: str) -> int | None:
+        """ Returns the maximum number of chars a match attempt reads (None if unknown or unlimited) """
+        try:
+            parsedPattern = sre_parse.parse(pattern)
+            opcodes = StreamingMatchEngine.__getOpcodes(parsedPattern)
+        except (re.error, RecursionError):
+            return None
+        # anchors and assertions read chars outside the match, back references have a variable length
+        if any(op in (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT, sre_parse.GROUPREF, sre_parse.GROUPREF_EXISTS)
+               for op, av in opcodes):
+            return None
+        maxLength = parsedPattern.getwidth()[1]
+        return maxLength if maxLength < sre_parse.MAXREPEAT - 1 else None
+
+    @staticmethod
+    def getIncompleteMatchRegex(pattern: str) -> re.Pattern | None:
+        """ Returns a regex matching the text from a position to the end of the text, if this text is the beginning
+        of a match of pattern (None if the pattern is not supported). A match attempt at any position before the
+        first match of this regex fails, no matter which chars are appended to the text.
+        """
+        try:
+            parsedPattern = sre_parse.parse(pattern)
+        except (re.error, RecursionError):
+            return None
+        state = parsedPattern.state
+        chars = (sre_parse.LITERAL, sre_parse.NOT_LITERAL, sre_parse.ANY, sre_parse.IN, sre_parse.CATEGORY)
+
+        def getPrefixes(items: list) -> list | None:
+            """ Returns the items of a pattern matching every beginning of a match of items (including '') """
+            if len(items) == 0:
+                return []
+            (op, av), remainingItems = items[0], items[1:]
+            remainingPrefixes = getPrefixes(remainingItems)
+            if remainingPrefixes is None:
+                return None
+            if op in chars:
+                # the char itself is part of the second branch
+                firstPrefixes = []
+            elif op == sre_parse.SUBPATTERN:
+                # the group keeps its flags, but is not captured
+                groupPrefixes = getPrefixes(av[3].data)
+                if groupPrefixes is None:
+                    return None
+                firstPrefixes = [(op, (None, av[1], av[2], sre_parse.SubPattern(state, groupPrefixes)))]
+            elif op == sre_parse.BRANCH:
+                branchPrefixes = [getPrefixes(branch.data) for branch in av[1]]
+                if None in branchPrefixes:
+                    return None
+                firstPrefixes = [(op, (None, [sre_parse.SubPattern(state, prefixes) for prefixes in branchPrefixes]))]
+            elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+                # complete repetitions followed by the beginning of one more repetition
+                _, maxCount, item = av
+                itemPrefixes = getPrefixes(item.data)
+                if itemPrefixes is None:
+                    return None
+                if maxCount == 0:
+                    firstPrefixes = []
+                else:
+                    completeCount = maxCount if maxCount == sre_parse.MAXREPEAT else maxCount - 1
+                    firstPrefixes = [(sre_parse.MAX_REPEAT, (0, completeCount, item))] + itemPrefixes
+            else:
+                # anchors, assertions, back references, atomic groups and possessive repeats
+                return None
+            # the beginning of the first item, or the first item followed by the beginning of the remaining items
+            return [(sre_parse.BRANCH, (None, [sre_parse.SubPattern(state, firstPrefixes),
+                                               sre_parse.SubPattern(state, [items[0]] + remainingPrefixes)]))]
+
+        try:
+            prefixes = getPrefixes(parsedPattern.data)
+            if prefixes is None:
+                return None
+            return sre_compile.compile(sre_parse.SubPattern(state, prefixes + [(sre_parse.AT, sre_parse.AT_END_STRING)]))
+        except (re.error, RecursionError):
+            return None
+
+    def patterns(self) -> list[StreamingPattern]:
+        return self.__patterns
+
+    def addPattern(self, name: str, pattern: str) -> StreamingPattern:
+        return self.addPatterns([(name, pattern)])[0]
+
+    def addPatterns(self, namesAndPatterns: list[tuple[str, str]]) -> list[StreamingPattern]:
+        """ Adds several patterns (the literal search is updated only once) """
+        streamingPatterns = [StreamingPattern(name, pattern, self.__streamEnd(), self.__chunkCount(), self)
+                             for name, pattern in namesAndPatterns]
+        self.__patterns.extend(streamingPatterns)
+        self.__updateLiteralRegex()
+        return streamingPatterns
+
+    def removePattern(self, streamingPattern: StreamingPattern):
+        self.removePatterns([streamingPattern])
+
+    def removePatterns(self, streamingPatterns: list[StreamingPattern]):
+        if len(streamingPatterns) == 0:
+            return
+        removed = set(streamingPatterns)
+        self.__patterns = [streamingPattern for streamingPattern in self.__patterns if streamingPattern not in removed]
+        self.__updateLiteralRegex()
+        for streamingPattern in streamingPatterns:
+            streamingPattern.deleteLater()
+
+    def __updateLiteralRegex(self):
+        self.__patternsByLiteral = {}
+        for streamingPattern in self.__patterns:
+            if len(streamingPattern.requiredLiteral) > 0:
+                self.__patternsByLiteral.setdefault(streamingPattern.requiredLiteral, []).append(streamingPattern)
+
+        # the lookahead finds a literal at every position. If several literals start at the same position, the
+        # longest one is found and all others are a prefix of it.
+        literals = sorted(self.__patternsByLiteral, key=len, reverse=True)
+        self.__literalPrefixes: dict[str, list[str]] = {
+            literal: [prefix for prefix in literals if literal.startswith(prefix)] for literal in literals}
+        self.__literalRegex = re.compile('(?=(' + '|'.join(map(re.escape, literals)) + '))') if literals else None
+        self.__maxLiteralLength = len(literals[0]) if literals else 0
+
+    def __streamEnd(self) -> int:
+        return self.__streamOffset + len(self.__stream)
+
+    def __chunkCount(self) -> int:
+        return self.__chunkEndsOffset + len(self.__chunkEnds)
+
+    def __applySkippedTrimming(self, streamingPattern: StreamingPattern):
+        # the buffer of a dormant pattern is trimmed as if it had processed all received chunks
+        start = streamingPattern.start
+        for chunkEnd in self.__chunkEnds[streamingPattern.chunkCount - self.__chunkEndsOffset:]:
+            if chunkEnd - start > StreamingMatchEngine.MAX_BUFFER_LENGTH:
+                start += StreamingMatchEngine.TRIM_LENGTH
+        streamingPattern.start = start
+        streamingPattern.chunkCount = self.__chunkCount()
+
+    def __findReceivedLiterals(self, previousStreamEnd: int) -> set[StreamingPattern]:
+        """ Returns the patterns, whose literal was received with the last chunk """
+        if self.__literalRegex is None:
+            return set()
+
+        searchStart = max(previousStreamEnd - self.__maxLiteralLength + 1, self.__streamOffset)
+        receivedLiterals = {match.group(1)
+                            for match in self.__literalRegex.finditer(self.__stream, searchStart - self.__streamOffset)}
+        patterns = set()
+        for literal in receivedLiterals:
+            for prefix in self.__literalPrefixes[literal]:
+                patterns.update(self.__patternsByLiteral[prefix])
+        return patterns
+
+    def __getBuffer(self, streamingPattern: StreamingPattern) -> str:
+        return self.__stream[streamingPattern.start - self.__streamOffset:]
+
+    def __removeProcessedText(self):
+        if len(self.__chunkEnds) > StreamingMatchEngine.MAX_CHUNK_HISTORY:
+            for streamingPattern in self.__patterns:
+                if streamingPattern.dormant:
+                    self.__applySkippedTrimming(streamingPattern)
+            self.__chunkEndsOffset += len(self.__chunkEnds)
+            self.__chunkEnds = []
+
+        # processed text is removed when the stream has doubled its size (amortized copying)
+        if len(self.__stream) > self.__maxStreamLength:
+            start = min((p.firstRequiredPos() for p in self.__patterns), default=self.__streamEnd())
+            self.__stream = self.__stream[start - self.__streamOffset:]
+            self.__streamOffset = start
+            removedRxTimes = bisect_right(self.__rxTimeChunkEnds, start)
+            del self.__rxTimeChunkEnds[:removedRxTimes]
+            del self.__rxTimes[:removedRxTimes]
+            self.__maxStreamLength = max(2 * len(self.__stream), 2 * StreamingMatchEngine.MAX_BUFFER_LENGTH)
+
+    def __processMatches(self, streamingPattern: StreamingPattern, waitForMoreData: bool):
+        if streamingPattern.dependsOnBufferStart:
+            text, textOffset = self.__getBuffer(streamingPattern), streamingPattern.start
+        else:
+            # the result does not depend on the text before the buffer, so the stream is searched without copying
+            text, textOffset = self.__stream, self.__streamOffset
+
+        streamingPattern.waitingForMoreData = False
+        pendingMatchPos = self.__streamEnd()
+        for match in streamingPattern.regex.finditer(text, streamingPattern.firstPossibleMatchPos() - textOffset):
+            if waitForMoreData and (len(text) - match.end(0)) <= StreamingMatchEngine.TAIL_LENGTH:
+                # a match is only processed if not at the end of the buffer, because
+                # there could be coming more bytes, that belong to this pattern,
+                # and we don't want to miss them. E.g. an integer matches after the first
+                # number (char), but we want to be greedy and get all numbers (which could
+                # arrive some time later).
+                # We require to have received at least 5 more bytes that do not belong to
+                # the regex pattern. Because a string like '1.2246467991473532e' would otherwise
+                # be interpreted immediately as a float (without 'e' at the end), but the exponent
+                # was just not received yet... (-> 1.2246467991473532e-16)
+                streamingPattern.waitingForMoreData = True
+                pendingMatchPos = match.start(0) + textOffset
+                break
+            if len(self.__rxTimes) > 0:
+                # the match is complete with the chunk containing its last char
+                index = bisect_left(self.__rxTimeChunkEnds, match.end(0) + textOffset)
+                self.__matchRxTime = self.__rxTimes[min(index, len(self.__rxTimes) - 1)]
+            streamingPattern.signal_textExtracted.emit(streamingPattern.name, [*match.groups()])
+            streamingPattern.start = match.end(0) + textOffset
+
+        if streamingPattern.maxMatchLength is not None:
+            # a match attempt, which started at least maxMatchLength chars before the end, has read all chars it
+            # needs. So these failed attempts will also fail after more bytes are received.
+            streamingPattern.resumePos = min(pendingMatchPos, self.__streamEnd() - streamingPattern.maxMatchLength + 1)
+        elif streamingPattern.incompleteMatchRegex is not None:
+            # the match length is unlimited, but the failed attempts before the first incomplete match (which
+            # reaches the end of the stream) will also fail after more bytes are received. There is always an
+            # incomplete match ('') at the end of the stream.
+            incompleteMatch = streamingPattern.incompleteMatchRegex.search(
+                self.__stream, streamingPattern.firstPossibleMatchPos() - self.__streamOffset)
+            streamingPattern.resumePos = min(pendingMatchPos, incompleteMatch.start(0) + self.__streamOffset)
+
+    def setRxTimeSource(self, rxTimeSource: typing.Callable[[], float | None] | None):
+        """ rxTimeSource is called for every received chunk and returns its rx time (seconds since the epoch),
+        e.g. SerialDataProcessor.getRxTime
+        """
+        self.__rxTimeSource = rxTimeSource
+
+    def getRxTime(self) -> float | None:
+        """ Returns the rx time of the match, which is emitted by signal_textExtracted (None if unknown) """
+        return self.__matchRxTime
+
+    @Slot(str)
+    def processBytesFromStream(self, asciiString: str):
+        previousStreamEnd = self.__streamEnd()
+        self.__stream += asciiString
+        rxTime = self.__rxTimeSource() if self.__rxTimeSource is not None else None
+        if rxTime is not None:
+            self.__rxTimeChunkEnds.append(self.__streamEnd())
+            self.__rxTimes.append(rxTime)
+        receivedLiterals = self.__findReceivedLiterals(previousStreamEnd)
+
+        for streamingPattern in self.__patterns:
+            if streamingPattern.dormant:
+                if streamingPattern not in receivedLiterals:
+                    continue
+                self.__applySkippedTrimming(streamingPattern)
+                streamingPattern.dormant = False
+
+            self.__processMatches(streamingPattern, waitForMoreData=True)
+
+            if self.__streamEnd() - streamingPattern.start > StreamingMatchEngine.MAX_BUFFER_LENGTH:
+                streamingPattern.start += StreamingMatchEngine.TRIM_LENGTH
+
+            streamingPattern.chunkCount = self.__chunkCount() + 1
+            if len(streamingPattern.requiredLiteral) > 0 and not streamingPattern.waitingForMoreData:
+                literalPos = self.__stream.find(streamingPattern.requiredLiteral,
+                                                streamingPattern.firstPossibleMatchPos() - self.__streamOffset)
+                streamingPattern.dormant = literalPos < 0
+
+        self.__chunkEnds.append(self.__streamEnd())
+        # the timeout of all patterns is delayed by every received chunk (all patterns receive the same chunks)
+        if any(p.waitingForMoreData for p in self.__patterns):
+            self.__scheduler.schedule(self.processTimeout, StreamingMatchEngine.TIMEOUT_MS)
+        else:
+            self.__scheduler.cancel(self.processTimeout)
+        self.__removeProcessedText()
+
+    def cancelTimeout(self):
+        """ Cancels the scheduled timeout (e.g. before the engine is moved away from a shared scheduler) """
+        self.__scheduler.cancel(self.processTimeout)
+
+    @Slot()
+    def processTimeout(self):
+        # no more data was received, so let's assume the matches at the end of the stream are complete
+        for streamingPattern in self.__patterns:
+            if streamingPattern.waitingForMoreData:
+                self.__processMatches(streamingPattern, waitForMoreData=False)
@@ -0,0 +1,68 @@
+from PySide6.QtCore import QObject, Signal, Slot, QMetaObject, Qt, QThread
+import typing
+
+
+class TextSpillWriter(QObject):
+    """ Appends the lines removed from a serial viewer to a text file.
+
+    writeText is called with a queued connection, so the file is written in the thread of the writer and
+    the GUI thread is not blocked by the disk. The file is kept open until close is called. If writing fails,
+    the writer is disabled and signal_errorOccurred is emitted (it is enabled again by setEnabled).
+    """
+    signal_errorOccurred: Signal = Signal(str)
+
+    def __init__(self, filePath: str):
+        super(TextSpillWriter, self).__init__()
+        self.__filePath: str = filePath
+        self.__enabled: bool = False
+
+        # only used in the thread of the writer
+        self.__file: typing.Optional[typing.TextIO] = None
+
+    def __invokeInWriterThread(self, methodName: str):
+        if self.thread() == QThread.currentThread() or not self.thread().isRunning():
+            QMetaObject.invokeMethod(self, methodName, Qt.ConnectionType.DirectConnection)
+        else:
+            QMetaObject.invokeMethod(self, methodName, Qt.ConnectionType.BlockingQueuedConnection)
+
+    def setEnabled(self, enabled: bool):
+        self.__enabled = enabled
+        if not enabled:
+            self.close()
+
+    def isEnabled(self) -> bool:
+        return self.__enabled
+
+    def getFilePath(self) -> str:
+        return self.__filePath
+
+    @Slot(str)
+    def writeText(self, text: str):
+        if not self.__enabled:
+            return
+
+        try:
+            if self.__file is None:
+                self.__file = open(self.__filePath, 'a', encoding='utf-8')
+            self.__file.write(text)
+            self.__file.flush()
+        except OSError as e:
+            self.__enabled = False
+            self.__releaseFile()
+            self.signal_errorOccurred.emit(f'Writing removed lines to {self.__filePath} stopped ({e})')
+
+    def close(self):
+        """ Closes the file (blocks until this is done in the thread of the writer). """
+        self.__invokeInWriterThread('__closeFile')
+
+    def __releaseFile(self):
+        if self.__file is not None:
+            try:
+                self.__file.close()
+            except OSError:
+                pass
+            self.__file = None
+
+    @Slot()
+    def __closeFile(self):
+        self.__releaseFile()
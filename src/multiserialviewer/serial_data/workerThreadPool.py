@@ -0,0 +1,103 @@
+from PySide6.QtCore import QObject, QThread, Signal, Slot, Qt, QCoreApplication
+import typing
+
+from multiserialviewer.serial_data.deadlineScheduler import DeadlineScheduler
+
+if typing.TYPE_CHECKING:
+    from multiserialviewer.serial_data.streamingMatchEngine import StreamingMatchEngine
+
+
+class Worker(QObject):
+    """ Thread of the WorkerThreadPool. Lives in its thread together with the DeadlineScheduler shared by its ports. """
+    signal_call: Signal = Signal(object)
+    signal_post: Signal = Signal(object)
+
+    def __init__(self, name: str):
+        super(Worker, self).__init__()
+        self.name: str = name
+        self.portNames: list[str] = []
+
+        self.workerThread: QThread = QThread()
+        self.workerThread.setObjectName(name)
+        self.deadlineScheduler: DeadlineScheduler = DeadlineScheduler()
+        self.deadlineScheduler.moveToThread(self.workerThread)
+        self.moveToThread(self.workerThread)
+        self.signal_call.connect(self.__call, Qt.ConnectionType.BlockingQueuedConnection)
+        self.signal_post.connect(self.__call, Qt.ConnectionType.QueuedConnection)
+
+    def callInThread(self, function: typing.Callable[[], None]):
+        """ Calls function in the worker thread and waits until it returned """
+        if self.workerThread == QThread.currentThread() or not self.workerThread.isRunning():
+            function()
+        else:
+            self.signal_call.emit(function)
+
+    def postToThread(self, function: typing.Callable[[], None]):
+        """ Calls function in the worker thread without waiting (after the events already queued, e.g. received data) """
+        if self.workerThread == QThread.currentThread() or not self.workerThread.isRunning():
+            function()
+        else:
+            self.signal_post.emit(function)
+
+    def detach(self, matchEngine: 'StreamingMatchEngine', objects: list[QObject]):
+        """ Moves the processing objects of a port back to the main thread. The events of the worker thread are
+        processed in order, so the data still queued for the port is processed before. """
+        def detachInThread():
+            # the scheduler of the worker is shared with other ports
+            matchEngine.cancelTimeout()
+            mainThread = QCoreApplication.instance().thread()
+            for obj in objects:
+                obj.moveToThread(mainThread)
+        self.callInThread(detachInThread)
+
+    @Slot(object)
+    def __call(self, function: typing.Callable[[], None]):
+        function()
+
+
+class WorkerThreadPool:
+    """ Threads shared by all serial ports of the process for processing the received data.
+
+    Every port is assigned to one worker (the one with the fewest ports) and the processing objects of the
+    port are moved to its thread. As the events of a thread are processed in order, the data of a port is
+    processed in the order it was received. A port without data does not cause any work and a worker
+    without ports is stopped. At most threadCount workers are used (default: number of cores).
+    """
+    __instance: typing.Optional['WorkerThreadPool'] = None
+
+    def __init__(self, threadCount: int = 0):
+        self.threadCount: int = threadCount if threadCount > 0 else max(1, QThread.idealThreadCount())
+        self.__workers: list[Worker] = []
+
+    @staticmethod
+    def instance() -> 'WorkerThreadPool':
+        """ Returns the pool of the process """
+        if WorkerThreadPool.__instance is None:
+            WorkerThreadPool.__instance = WorkerThreadPool()
+        return WorkerThreadPool.__instance
+
+    def getWorkers(self) -> list[Worker]:
+        return self.__workers
+
+    def acquire(self, portName: str) -> Worker:
+        """ Returns the worker, which processes the data of portName from now on """
+        idleWorkers = [worker for worker in self.__workers if len(worker.portNames) == 0]
+        if len(idleWorkers) > 0:
+            worker = idleWorkers[0]
+        elif len(self.__workers) < self.threadCount:
+            worker = Worker(f'Worker thread {len(self.__workers) + 1}')
+            self.__workers.append(worker)
+        else:
+            worker = min(self.__workers, key=lambda w: len(w.portNames))
+
+        worker.portNames.append(portName)
+        if not worker.workerThread.isRunning():
+            worker.workerThread.start()
+        return worker
+
+    def release(self, worker: Worker, portName: str):
+        """ The objects of portName must not live in the thread of the worker anymore """
+        worker.portNames.remove(portName)
+        if len(worker.portNames) == 0 and worker.workerThread.isRunning():
+            worker.workerThread.quit()
+            worker.workerThread.wait()
@@ -1,10 +1,32 @@
 
+from enum import Enum
+
+
 class ApplicationSettings:
+    class TimestampMode(Enum):
+        timeOfDay = 1  # rx time formatted with timestampFormat
+        elapsedMs = 2  # milliseconds since the start of the capture
+
     DEFAULT_TIMESTAMP_FORMAT = '[%H:%M:%S.%f] '
+    DEFAULT_SCROLLBACK_MAX_LINES = 100000
+    DEFAULT_SCROLLBACK_MAX_CHARACTERS = 20000000
+    DEFAULT_WATCH_HISTORY_SIZE = 100000
+    DEFAULT_WATCH_MAX_WORDS = 100
 
     def __init__(self):
         self.restoreCaptureState: bool = False
+        # stop the capture, if one of the ports cannot be opened
+        self.startCaptureAllOrNothing: bool = True
         self.showNonPrintableCharsAsHex: bool = False
         self.backspaceDeletesLastLine: bool = False
         self.showTimestamp: bool = False
         self.timestampFormat: str = ""
+        self.timestampMode: ApplicationSettings.TimestampMode = ApplicationSettings.TimestampMode.timeOfDay
+        self.scrollbackMaxLines: int = ApplicationSettings.DEFAULT_SCROLLBACK_MAX_LINES
+        # also limits the text of long lines (e.g. a device that never sends a line break)
+        self.scrollbackMaxCharacters: int = ApplicationSettings.DEFAULT_SCROLLBACK_MAX_CHARACTERS
+        self.scrollbackSpillToDisk: bool = False
+        self.recordRawData: bool = False
+        self.watchHistorySize: int = ApplicationSettings.DEFAULT_WATCH_HISTORY_SIZE
+        # number of different words tracked by a word watch
+        self.watchMaxWords: int = ApplicationSettings.DEFAULT_WATCH_MAX_WORDS
@@ -93,10 +93,18 @@ class Settings:
         def restoreDefaultValues(self):
             self.values = ApplicationSettings()
             self.values.restoreCaptureState = True
+            self.values.startCaptureAllOrNothing = True
             self.values.showTimestamp = False
             self.values.timestampFormat = ApplicationSettings.DEFAULT_TIMESTAMP_FORMAT
+            self.values.timestampMode = ApplicationSettings.TimestampMode.timeOfDay
             self.values.showNonPrintableCharsAsHex = True
             self.values.backspaceDeletesLastLine = False
+            self.values.scrollbackMaxLines = ApplicationSettings.DEFAULT_SCROLLBACK_MAX_LINES
+            self.values.scrollbackMaxCharacters = ApplicationSettings.DEFAULT_SCROLLBACK_MAX_CHARACTERS
+            self.values.scrollbackSpillToDisk = False
+            self.values.recordRawData = False
+            self.values.watchHistorySize = ApplicationSettings.DEFAULT_WATCH_HISTORY_SIZE
+            self.values.watchMaxWords = ApplicationSettings.DEFAULT_WATCH_MAX_WORDS
 
             self.captureActive = False
 
@@ -106,26 +114,53 @@ class Settings:
             settings.beginGroup(self.SettingsName_v1)
             if settings.contains("restoreCaptureState"):
                 self.values.restoreCaptureState = settings.value("restoreCaptureState", type=bool)
+            if settings.contains("startCaptureAllOrNothing"):
+                self.values.startCaptureAllOrNothing = settings.value("startCaptureAllOrNothing", type=bool)
             if settings.contains("captureActive"):
                 self.captureActive = settings.value("captureActive", type=bool)
             if settings.contains("showTimestamp"):
                 self.values.showTimestamp = settings.value("showTimestamp", type=bool)
             if settings.contains("timestampFormat"):
                 self.values.timestampFormat = settings.value("timestampFormat")
+            if settings.contains("timestampMode"):
+                try:
+                    self.values.timestampMode = ApplicationSettings.TimestampMode(settings.value("timestampMode", type=int))
+                except ValueError:
+                    pass
             if settings.contains("showNonPrintableCharsAsHex"):
                 self.values.showNonPrintableCharsAsHex = settings.value("showNonPrintableCharsAsHex", type=bool)
             if settings.contains("backspaceDeletesLastLine"):
                 self.values.backspaceDeletesLastLine = settings.value("backspaceDeletesLastLine", type=bool)
+            if settings.contains("scrollbackMaxLines"):
+                self.values.scrollbackMaxLines = settings.value("scrollbackMaxLines", type=int)
+            if settings.contains("scrollbackMaxCharacters"):
+                self.values.scrollbackMaxCharacters = settings.value("scrollbackMaxCharacters", type=int)
+            if settings.contains("scrollbackSpillToDisk"):
+                self.values.scrollbackSpillToDisk = settings.value("scrollbackSpillToDisk", type=bool)
+            if settings.contains("recordRawData"):
+                self.values.recordRawData = settings.value("recordRawData", type=bool)
+            if settings.contains("watchHistorySize"):
+                self.values.watchHistorySize = max(1, settings.value("watchHistorySize", type=int))
+            if settings.contains("watchMaxWords"):
+                self.values.watchMaxWords = max(1, settings.value("watchMaxWords", type=int))
             settings.endGroup()
 
         def saveSettings(self, settings: QSettings):
             settings.beginGroup(self.SettingsName_v1)
             settings.setValue("restoreCaptureState", self.values.restoreCaptureState)
+            settings.setValue("startCaptureAllOrNothing", self.values.startCaptureAllOrNothing)
             settings.setValue("captureActive", self.captureActive)
             settings.setValue("showTimestamp", self.values.showTimestamp)
             settings.setValue("timestampFormat", self.values.timestampFormat)
+            settings.setValue("timestampMode", self.values.timestampMode.value)
             settings.setValue("showNonPrintableCharsAsHex", self.values.showNonPrintableCharsAsHex)
             settings.setValue("backspaceDeletesLastLine", self.values.backspaceDeletesLastLine)
+            settings.setValue("scrollbackMaxLines", self.values.scrollbackMaxLines)
+            settings.setValue("scrollbackMaxCharacters", self.values.scrollbackMaxCharacters)
+            settings.setValue("scrollbackSpillToDisk", self.values.scrollbackSpillToDisk)
+            settings.setValue("recordRawData", self.values.recordRawData)
+            settings.setValue("watchHistorySize", self.values.watchHistorySize)
+            settings.setValue("watchMaxWords", self.values.watchMaxWords)
             settings.endGroup()
 
     class MainWindow:
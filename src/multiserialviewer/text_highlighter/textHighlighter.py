@@ -1,3 +1,4 @@
+from PySide6.QtCore import Signal, Slot, QTimer, QElapsedTimer
 from PySide6.QtGui import QSyntaxHighlighter, QTextCharFormat
 from PySide6.QtGui import QColor
 import re
@@ -7,26 +8,93 @@ from multiserialviewer.settings.textHighlighterSettings import TextHighlighterSe
 
 
 class TextHighlighter(QSyntaxHighlighter):
+    signal_rehighlightProgress: Signal = Signal(int)
+
+    # maximum duration of one slice of an incremental rehighlight
+    REHIGHLIGHT_SLICE_MS = 10
+
     def __init__(self, parent=None):
         QSyntaxHighlighter.__init__(self, parent)
         self._settings: List[TextHighlighterSettings] = []
+        # compiled regex and format of every valid setting (in the order of the settings)
+        self._rules: List[tuple[re.Pattern, QTextCharFormat]] = []
+
+        self.__rehighlightTimer: QTimer = QTimer(self)
+        self.__rehighlightTimer.setInterval(0)
+        self.__rehighlightTimer.timeout.connect(self.__rehighlightNextBlocks)
+        self.__nextBlockNumber: int = -1
+        self.__blockCount: int = 0
+
+    @staticmethod
+    def createTextFormat(setting: TextHighlighterSettings) -> QTextCharFormat:
+        text_format = QTextCharFormat()
+        text_format.setFontItalic(bool(setting.italic))
+        if setting.bold:
+            text_format.setFontWeight(700)
+        text_format.setFontPointSize(int(setting.font_size))
+        text_format.setForeground(QColor(setting.color_foreground))
+        text_format.setBackground(QColor(setting.color_background))
+        return text_format
 
     def setSettings(self, settings: List[TextHighlighterSettings]):
         self._settings = settings
+        self._rules = []
+        for setting in settings:
+            try:
+                self._rules.append((re.compile(setting.pattern), TextHighlighter.createTextFormat(setting)))
+            except re.error as e:
+                print(f'Invalid highlighter pattern {setting.pattern} ({e})')
+
+    def rehighlightIncrementally(self, firstVisibleBlockNumber: int = 0, lastVisibleBlockNumber: int = -1):
+        """ Rehighlights the visible blocks immediately and all other blocks in short slices (newest first).
+
+        An incremental rehighlight which is still running is restarted. Blocks are processed from the
+        end of the document to its start, so removing the oldest lines does not skip blocks. New blocks
+        are highlighted by QSyntaxHighlighter itself.
+        """
+        document = self.document()
+        if document is None:
+            return
+
+        for blockNumber in range(firstVisibleBlockNumber, lastVisibleBlockNumber + 1):
+            block = document.findBlockByNumber(blockNumber)
+            if block.isValid():
+                self.rehighlightBlock(block)
+
+        self.__blockCount = document.blockCount()
+        self.__nextBlockNumber = self.__blockCount - 1
+        self.__rehighlightTimer.start()
+        self.signal_rehighlightProgress.emit(0)
+
+    def isRehighlighting(self) -> bool:
+        return self.__rehighlightTimer.isActive()
+
+    @Slot()
+    def __rehighlightNextBlocks(self):
+        document = self.document()
+        block = document.findBlockByNumber(min(self.__nextBlockNumber, document.blockCount() - 1))
+
+        duration = QElapsedTimer()
+        duration.start()
+        while block.isValid() and duration.elapsed() < TextHighlighter.REHIGHLIGHT_SLICE_MS:
+            self.rehighlightBlock(block)
+            block = block.previous()
+
+        if block.isValid():
+            self.__nextBlockNumber = block.blockNumber()
+            processedBlocks = max(0, self.__blockCount - self.__nextBlockNumber - 1)
+            self.signal_rehighlightProgress.emit(min(99, 100 * processedBlocks // self.__blockCount))
+        else:
+            self.__rehighlightTimer.stop()
+            self.__nextBlockNumber = -1
+            self.signal_rehighlightProgress.emit(100)
 
     def highlightBlock(self, text):
         if len(text) < 1:
             return
 
-        for setting in self._settings:
-            for match in re.finditer(setting.pattern, text):
-                text_format = QTextCharFormat()
-                text_format.setFontItalic(bool(setting.italic))
-                if setting.bold:
-                    text_format.setFontWeight(700)
-                text_format.setFontPointSize(int(setting.font_size))
-                text_format.setForeground(QColor(setting.color_foreground))
-                text_format.setBackground(QColor(setting.color_background))
-
+        # later rules override the format of earlier rules
+        for regex, text_format in self._rules:
+            for match in regex.finditer(text):
                 start, end = match.span()
                 self.setFormat(start, end - start, text_format)
@@ -3,6 +3,7 @@ from PySide6.QtCore import QFile
 import pathlib
 
 from multiserialviewer.gui_viewer.serialViewerTextEdit import SerialViewerTextEdit
+from multiserialviewer.gui_viewer.plotCanvas import PlotCanvas
 
 
 def createWidgetFromUiFile(ui_file_name):
@@ -15,6 +16,7 @@ def createWidgetFromUiFile(ui_file_name):
 
     # cutom widgets
     loader.registerCustomWidget(SerialViewerTextEdit)
+    loader.registerCustomWidget(PlotCanvas)
 
     widget = loader.load(ui_file)
     ui_file.close()
@@ -0,0 +1,47 @@
+from PySide6.QtCore import QThread
+
+from multiserialviewer.application.counterHandler import CounterHandler
+from multiserialviewer.serial_data.streamingMatchEngine import StreamingMatchEngine
+from multiserialviewer.settings.counterSettings import CounterSettings
+
+
+def test_countsArePublishedThrottled(qtbot):
+    handler = CounterHandler([CounterSettings('ERROR'), CounterSettings('WARNING')], StreamingMatchEngine())
+    model = handler.counterTableModel
+    changes = []
+    model.dataChanged.connect(lambda topLeft, bottomRight: changes.append((topLeft.row(), bottomRight.row())))
+
+    for _ in range(10000):
+        handler.incrementCounterValue('WARNING', None)
+
+    assert handler.entries.getByKey('WARNING').value == 10000
+    assert model.rows[1].value == 0
+    qtbot.waitUntil(lambda: len(changes) > 0, timeout=1000)
+    assert changes == [(1, 1)]
+    assert model.rows[1].value == 10000
+
+    handler.clear()
+    qtbot.waitUntil(lambda: model.rows[1].value == 0, timeout=1000)
+    assert changes == [(1, 1), (1, 1)]
+    assert [settings.pattern for settings in handler.getSettings()] == ['ERROR', 'WARNING']
+
+
+def test_countersAreChangedInHandlerThread(qtbot):
+    thread = QThread()
+    matchEngine = StreamingMatchEngine()
+    handler = CounterHandler([], matchEngine)
+    matchEngine.moveToThread(thread)
+    handler.moveToThread(thread)
+    thread.start()
+    try:
+        handler.createCounters(['ERROR', 'WARNING'])
+        qtbot.waitUntil(lambda: [row.pattern for row in handler.counterTableModel.rows] == ['ERROR', 'WARNING'],
+                        timeout=1000)
+        assert all(textExtractor.thread() == thread for textExtractor in handler.textExtractors.values())
+
+        handler.removeCounters([0])
+        qtbot.waitUntil(lambda: [row.pattern for row in handler.counterTableModel.rows] == ['WARNING'],
+                        timeout=1000)
+    finally:
+        thread.quit()
+        thread.wait()
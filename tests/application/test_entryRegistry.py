@@ -0,0 +1,22 @@
+import pytest
+
+from multiserialviewer.application.entryRegistry import EntryRegistry
+
+
+def test_idsAreStable():
+    registry = EntryRegistry()
+    ids = [registry.add(key, key.upper()) for key in ['a', 'b', 'c', 'd']]
+    assert ids == [0, 1, 2, 3]
+
+    assert registry.remove(registry.getId('b')) == 'B'
+    assert registry.getId('c') == 2 and registry.get(2) == 'C'
+    assert registry.getByKey('b') is None and 'b' not in registry
+    assert list(registry) == ['A', 'C', 'D']
+
+    # a new entry gets a new id and is the last row
+    assert registry.add('b', 'B2') == 4
+    assert registry.getIds() == [0, 2, 3, 4]
+    assert registry.getIdsOfRows([0, 3, 7]) == [0, 4]
+
+    with pytest.raises(KeyError):
+        registry.add('a', 'A2')
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+
+import pytest
+from PySide6.QtCore import QByteArray
+
+from multiserialviewer.application.serialViewerController import SerialViewerController
+from multiserialviewer.application.serialViewerControllerPool import SerialViewerControllerPool
+from multiserialviewer.gui_viewer.serialViewerWindow import SerialViewerWindow
+from multiserialviewer.icons.iconSet import IconSet
+from multiserialviewer.serial_data.rawDataRecorder import RawDataRecorder
+from multiserialviewer.serial_data.rawDataReplaySource import RawDataReplaySource
+from multiserialviewer.settings.applicationSettings import ApplicationSettings
+from multiserialviewer.settings.serialViewerSettings import SerialViewerSettings
+from multiserialviewer.settings.settings import Settings
+
+
+@pytest.fixture
+def recording(qtbot, tmp_path) -> str:
+    recorder = RawDataRecorder(str(tmp_path), 'port')
+    recorder.setEnabled(True)
+    for index in range(3):
+        recorder.handleRawData(datetime(2024, 5, 17) + timedelta(milliseconds=index), QByteArray(b'line\n'))
+    recorder.close()
+    return recorder.getFilePath()
+
+
+@pytest.fixture
+def pool(qtbot):
+    pool = SerialViewerControllerPool()
+    yield pool
+    pool.deleteAll()
+
+
+def addReplayController(qtbot, pool: SerialViewerControllerPool, filePath: str, logDir: str,
+                        settingsApplication: ApplicationSettings | None = None) -> SerialViewerController:
+    settings = SerialViewerSettings()
+    settings.connection.portName = filePath
+    view = SerialViewerWindow(filePath, IconSet('google', '434343'))
+    qtbot.addWidget(view)
+    if settingsApplication is None:
+        settingsApplication = ApplicationSettings()
+    ctrl = SerialViewerController(settings, settingsApplication, view, logDir,
+                                  RawDataReplaySource(settings.connection, filePath))
+    pool.add(ctrl)
+    return ctrl
+
+
+def test_everyPortResultIsReported(qtbot, pool, recording, tmp_path):
+    opened = addReplayController(qtbot, pool, recording, str(tmp_path))
+    missing = addReplayController(qtbot, pool, str(tmp_path / 'missing.msvraw'), str(tmp_path))
+    results = []
+    pool.signal_captureStarted.connect(lambda portName, result: results.append((portName, result)))
+
+    with qtbot.waitSignal(pool.signal_startCaptureFinished, timeout=2000) as finished:
+        pool.startCapture(allOrNothing=False)
+
+    assert finished.args == [True]
+    assert sorted(results) == sorted([(opened.getPortName(), True), (missing.getPortName(), False)])
+    assert pool.getPendingPortCount() == 0
+    assert opened.receiver.portIsOpen()
+
+
+def test_allOrNothingClosesOpenedPorts(qtbot, pool, recording, tmp_path):
+    opened = addReplayController(qtbot, pool, recording, str(tmp_path))
+    addReplayController(qtbot, pool, str(tmp_path / 'missing.msvraw'), str(tmp_path))
+    stopped = []
+    pool.signal_captureStopped.connect(stopped.append)
+
+    with qtbot.waitSignal(pool.signal_startCaptureFinished, timeout=2000) as finished:
+        pool.startCapture(allOrNothing=True)
+    assert finished.args == [False]
+
+    qtbot.waitUntil(lambda: stopped == [opened.getPortName()], timeout=2000)
+    assert not opened.receiver.portIsOpen()
+
+
+def test_stopCaptureCancelsPendingStart(qtbot, pool, recording, tmp_path):
+    ctrl = addReplayController(qtbot, pool, recording, str(tmp_path))
+
+    with qtbot.assertNotEmitted(pool.signal_startCaptureFinished, wait=200):
+        pool.startCapture()
+        pool.stopCapture()
+    assert pool.getPendingPortCount() == 0
+    assert not ctrl.receiver.portIsOpen()
+
+
+def test_replayIsProcessedWithoutRecording(qtbot, pool, recording, tmp_path):
+    settingsApplication = ApplicationSettings()
+    settingsApplication.recordRawData = True
+    ctrl = addReplayController(qtbot, pool, recording, str(tmp_path), settingsApplication)
+    assert not ctrl.recorder.isEnabled()
+    pool.setApplicationSettings(settingsApplication)
+    assert not ctrl.recorder.isEnabled()
+
+    with qtbot.waitSignal(pool.signal_startCaptureFinished, timeout=2000):
+        pool.startCapture()
+    # every replayed chunk is acknowledged by the processor
+    qtbot.waitUntil(lambda: ctrl.receiver.isFinished() and ctrl.receiver.getPendingChunkCount() == 0, timeout=2000)
+
+
+def test_allOrNothingIsTheDefault(qtbot):
+    # the same default for new settings and restored default settings
+    assert ApplicationSettings().startCaptureAllOrNothing
+    assert Settings.Application().values.startCaptureAllOrNothing
+
+
+def test_portAddedDuringCaptureDoesNotStopOtherPorts(qtbot, pool, recording, tmp_path):
+    opened = addReplayController(qtbot, pool, recording, str(tmp_path))
+    with qtbot.waitSignal(pool.signal_startCaptureFinished, timeout=2000) as finished:
+        pool.startCapture(allOrNothing=True)
+    assert finished.args == [True]
+
+    missing = addReplayController(qtbot, pool, str(tmp_path / 'missing.msvraw'), str(tmp_path))
+    with qtbot.assertNotEmitted(pool.signal_startCaptureFinished):
+        with qtbot.waitSignal(pool.signal_captureStarted, timeout=2000) as started:
+            missing.requestStartCapture()
+    assert started.args == [missing.getPortName(), False]
+    assert opened.receiver.portIsOpen()
@@ -0,0 +1,154 @@
+from PySide6.QtCore import QThread, QMetaObject, Qt, Q_ARG
+
+from multiserialviewer.application.watchHandler import WatchHandler
+from multiserialviewer.serial_data.streamingMatchEngine import StreamingMatchEngine
+from multiserialviewer.settings.watchSettings import WatchSettings
+
+
+def createHandler() -> tuple[WatchHandler, list]:
+    settings = [WatchSettings('temp', '', WatchSettings.VariableType.number, r'(\d+)'),
+                WatchSettings('state', 'on off', WatchSettings.VariableType.word, r'(\w+)'),
+                WatchSettings('speed', '', WatchSettings.VariableType.number, r'(\d+)')]
+    handler = WatchHandler(settings, StreamingMatchEngine())
+    changes = []
+    handler.watchTableModel.dataChanged.connect(lambda topLeft, bottomRight: changes.append(
+        ((topLeft.row(), topLeft.column()), (bottomRight.row(), bottomRight.column()))))
+    return handler, changes
+
+
+def test_valuesArePublishedThrottledAndMerged(qtbot):
+    handler, changes = createHandler()
+    model = handler.watchTableModel
+    assert [row.name for row in model.rows] == ['temp', 'state', 'speed']
+
+    for value in range(1000):
+        handler.setWatchValue('temp', [str(value)])
+    handler.setWatchValue('speed', ['7'])
+
+    # the values of the handler are exact immediately, the model gets a snapshot later
+    assert handler.entries.getByKey('temp').updateCount == 1000
+    assert handler.entries.getByKey('temp').maxValue == 999.0
+    assert model.rows[0].value == ''
+
+    qtbot.waitUntil(lambda: len(changes) > 0, timeout=1000)
+    assert changes == [((0, 0), (2, 1))]
+    assert model.rows[0].value == '999.0' and model.rows[2].value == '7.0'
+    qtbot.wait(2 * WatchHandler.PUBLISH_INTERVAL_MS)
+    assert len(changes) == 1
+
+
+def test_createAndRemoveWatch(qtbot):
+    handler, changes = createHandler()
+
+    handler.setWatchValue('speed', ['7'])
+    handler.removeWatchByIndex(0)
+    handler.createWatch('temp', '', 'number', r'(-?\d+)')
+    handler.flush()
+
+    assert [row.name for row in handler.watchTableModel.rows] == ['state', 'speed', 'temp']
+    assert handler.watchTableModel.rows[1].value == '7.0'
+    assert [settings.name for settings in handler.getSettings()] == ['state', 'speed', 'temp']
+    assert handler.getSettings()[2].pattern == r'(-?\d+)'
+
+
+def test_newSamplesOfNumberWatchesArePublished(qtbot):
+    handler, changes = createHandler()
+    published = []
+    handler.signal_samplesAvailable.connect(published.append)
+
+    for value in range(5):
+        handler.setWatchValue('temp', [str(value)])
+    handler.setWatchValue('state', ['on'])
+    handler.flush()
+    assert len(published) == 1
+    assert list(published[0].keys()) == ['temp']
+    assert list(published[0]['temp'][1]) == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    # only the samples added since the last publish
+    handler.setWatchValue('temp', ['5'])
+    handler.flush()
+    assert list(published[1]['temp'][1]) == [5.0]
+
+
+def test_requestedSamplesArePublished(qtbot):
+    handler, changes = createHandler()
+    published = []
+    handler.signal_samplesAvailable.connect(lambda samples: published.append(('new', samples)))
+    handler.signal_historyAvailable.connect(lambda samples: published.append(('history', samples)))
+    for value in range(5):
+        handler.entries.getByKey('temp').setValue(str(value), float(value))
+        handler.setWatchValue('speed', ['1'])
+
+    handler.requestSamples(3.0)
+    # the pending samples are published before
+    assert [kind for kind, samples in published] == ['new', 'history']
+    assert sorted(published[1][1].keys()) == ['speed', 'temp']
+    times, values = published[1][1]['temp']
+    assert list(times) == [3.0, 4.0] and list(values) == [3.0, 4.0]
+
+
+def test_maxWordsOfWordWatches(qtbot):
+    settings = [WatchSettings('state', '', WatchSettings.VariableType.word, r'(\w+)')]
+    handler = WatchHandler(settings, StreamingMatchEngine(), maxWords=2)
+    assert handler.entries.getByKey('state').maxWords == 2
+
+    handler.setMaxWords(5)
+    handler.createWatch('mode', '', 'word', r'(\w+)')
+    assert handler.entries.getByKey('state').maxWords == 5
+    assert handler.entries.getByKey('mode').maxWords == 5
+
+
+def test_samplesHaveTheRxTimeOfTheChunk(qtbot):
+    handler, changes = createHandler()
+    rxTimes = iter([1000.0, 1001.5, 999.0])
+    handler.matchEngine.setRxTimeSource(lambda: next(rxTimes))
+    handler.matchEngine.processBytesFromStream('temp: 1\ntemp: 2\n')
+    handler.matchEngine.processBytesFromStream('temp: 3\nspeed: 4\n')
+    # an earlier rx time (e.g. the system clock was set back) does not go back in the history
+    handler.matchEngine.processBytesFromStream('temp: 5\n.......\n')
+
+    times, values = handler.entries.getByKey('temp').history.getSamples()
+    assert list(values) == [1.0, 2.0, 3.0, 5.0]
+    # 'temp: 2' is processed with the next chunk, but was received with the first one
+    assert list(times) == [1000.0, 1000.0, 1001.5, 1001.5]
+
+
+def test_watchesAreCreatedAndRemovedInBulk(qtbot):
+    handler, changes = createHandler()
+    resets = []
+    handler.watchTableModel.modelReset.connect(lambda: resets.append(len(handler.watchTableModel.rows)))
+
+    handler.createWatches([WatchSettings(f'value{index}', '', WatchSettings.VariableType.number, r'(\d+)')
+                           for index in range(100)])
+    handler.removeWatchesByIndex(list(range(0, 103, 2)))
+    assert resets == [103, 51]
+    assert [row.name for row in handler.watchTableModel.rows][:3] == ['state', 'value0', 'value2']
+
+    handler.setWatchValue('value2', ['5'])
+    handler.flush()
+    assert handler.watchTableModel.rows[2].value == '5.0'
+    assert len(handler.textExtractors) == 51
+
+
+def test_watchesAreChangedInHandlerThread(qtbot):
+    thread = QThread()
+    matchEngine = StreamingMatchEngine()
+    handler = WatchHandler([], matchEngine)
+    matchEngine.moveToThread(thread)
+    handler.moveToThread(thread)
+    thread.start()
+    try:
+        handler.createWatches([WatchSettings('temp', '', WatchSettings.VariableType.number, r'(\d+)')])
+        handler.flush()
+        qtbot.waitUntil(lambda: [row.name for row in handler.watchTableModel.rows] == ['temp'], timeout=1000)
+        assert all(textExtractor.thread() == thread for textExtractor in handler.textExtractors.values())
+
+        QMetaObject.invokeMethod(matchEngine, 'processBytesFromStream', Qt.ConnectionType.BlockingQueuedConnection,
+                                 Q_ARG(str, 'temp: 42\n'))
+        qtbot.waitUntil(lambda: handler.watchTableModel.rows[0].value == '42.0', timeout=1000)
+
+        handler.removeWatchByVariableName('temp')
+        qtbot.waitUntil(lambda: len(handler.watchTableModel.rows) == 0, timeout=1000)
+    finally:
+        thread.quit()
+        thread.wait()
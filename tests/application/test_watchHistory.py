@@ -0,0 +1,55 @@
+import statistics
+
+import pytest
+
+from multiserialviewer.application.watchHistory import WatchHistory
+
+
+def createHistory(capacity: int, count: int) -> WatchHistory:
+    history = WatchHistory(capacity)
+    for index in range(count):
+        history.append(float(index), float(index * index % 17))
+    return history
+
+
+def test_oldestSamplesAreReplaced():
+    history = createHistory(5, 12)
+
+    times, values = history.getSamples()
+    assert list(times) == [7.0, 8.0, 9.0, 10.0, 11.0]
+    assert len(history) == 5
+    assert history.getAppendedCount() == 12
+
+    times, _ = history.getSamplesSince(10)
+    assert list(times) == [10.0, 11.0]
+    times, _ = history.getSamplesSince(0)
+    assert len(times) == 5
+
+
+@pytest.mark.parametrize('count', [3, 50])
+def test_windowedQueries(count):
+    history = createHistory(20, count)
+    _, allValues = history.getSamples()
+    expected = list(allValues)[-5:] if count > 5 else list(allValues)
+
+    # the window of 4 seconds contains the samples of the last 5 time steps
+    assert list(history.getValues(4)) == expected
+    assert history.mean(4) == pytest.approx(statistics.fmean(expected))
+    assert history.stddev(4) == pytest.approx(statistics.pstdev(expected))
+    assert history.percentile(50, 4) == pytest.approx(statistics.median(expected))
+    assert history.percentile(100) == max(allValues)
+    assert history.rateOfChange(4) == pytest.approx((expected[-1] - expected[0]) / (len(expected) - 1))
+
+
+def test_setCapacityKeepsNewestSamples():
+    history = createHistory(10, 25)
+    history.setCapacity(4)
+    assert list(history.getSamples()[0]) == [21.0, 22.0, 23.0, 24.0]
+
+    history.setCapacity(8)
+    history.append(25.0, 1.0)
+    assert list(history.getSamples()[0]) == [21.0, 22.0, 23.0, 24.0, 25.0]
+    assert history.getAppendedCount() == 26
+
+    history.clear()
+    assert len(history) == 0 and history.mean() is None
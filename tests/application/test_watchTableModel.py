@@ -0,0 +1,43 @@
+from multiserialviewer.application.watchTableModel import WatchEntryWord
+
+
+def test_wordCountsAndTransitions():
+    entry = WatchEntryWord('state', 'idle run', r'(\w+)')
+    for word in ['idle', 'run', 'run', 'idle', 'run', 'error']:
+        entry.setValue(word)
+
+    assert entry.getValue() == 'error'
+    assert entry.updateCount == 6
+    assert list(entry.receivedWords.keys()) == ['idle', 'run', 'error']
+    assert [statistics.count for statistics in entry.receivedWords.values()] == [2, 3, 1]
+    assert entry.receivedWords['idle'].firstSeen <= entry.receivedWords['idle'].lastSeen
+    assert entry.transitionCounts == {('idle', 'run'): 2, ('run', 'idle'): 1, ('run', 'error'): 1}
+    assert entry.getTooltipSecondary().startswith("Received words 'idle (2), run (3), error (1)'\n"
+                                                  "Transitions: idle -> run (2)")
+
+    entry.reset()
+    assert entry.receivedWords == {} and entry.transitionCounts == {} and entry.getTooltipSecondary() == ''
+
+
+def test_numberOfTrackedWordsIsLimited():
+    entry = WatchEntryWord('state', '', r'(\w+)', maxWords=2)
+    for word in ['a', 'b', 'c', 'a', 'd']:
+        entry.setValue(word)
+
+    assert list(entry.receivedWords.keys()) == ['a', 'b']
+    assert entry.droppedWordCount == 2
+    assert entry.getValue() == 'd'
+    # transitions from or to untracked words are not counted
+    assert entry.transitionCounts == {('a', 'b'): 1}
+
+
+def test_maxWordsCanBeChanged():
+    entry = WatchEntryWord('state', '', r'(\w+)', maxWords=1)
+    for word in ['a', 'b']:
+        entry.setValue(word)
+    entry.setMaxWords(2)
+    for word in ['b', 'c']:
+        entry.setValue(word)
+
+    assert list(entry.receivedWords.keys()) == ['a', 'b']
+    assert entry.droppedWordCount == 2
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+from PySide6.QtCore import QByteArray
+
+# control characters except backspace, line feed and carriage return
+NOISE_BYTES = bytes(b for b in range(32) if b not in (0x08, 0x0A, 0x0D))
+WORDS = ['init', 'sensor', 'motor', 'ERROR', 'WARNING', 'ok', 'timeout', 'retry', 'value', 'state', 'idle']
+
+
+def createLine(rng: random.Random) -> bytes:
+    """ Returns a line like the debug output of a MCU: mostly log text, some watch values, noise and progress output """
+    kind = rng.random()
+    if kind < 0.3:
+        name = rng.choice(['temp', 'voltage', 'speed', 'state'])
+        value = rng.choice(['on', 'off', 'idle']) if name == 'state' else f'{rng.uniform(-20, 80):.1f}'
+        return f'{name}: {value}\r\n'.encode()
+    if kind < 0.35:
+        return bytes(rng.choice(NOISE_BYTES) for _ in range(rng.randrange(4, 20))) + b'\r\n'
+    if kind < 0.4:
+        return f'Progress {rng.randrange(100)}%'.encode() + b'\b'
+    return (f'[{rng.randrange(100000):05d}] ' + ' '.join(rng.choice(WORDS) for _ in range(rng.randrange(4, 12)))
+            + '\r\n').encode()
+
+
+def createRawCorpus(size: int, chunkSize: int, seed: int = 1) -> list[QByteArray]:
+    """ Returns about size bytes of generated lines, split into chunks like received from a serial port """
+    rng = random.Random(seed)
+    data = bytearray()
+    while len(data) < size:
+        data += createLine(rng)
+    return [QByteArray(bytes(data[pos:pos + chunkSize])) for pos in range(0, len(data), chunkSize)]
+
+
+@pytest.fixture(scope='session')
+def rawCorpus() -> list[QByteArray]:
+    return createRawCorpus(256 * 1024, 256)
+
+
+@pytest.fixture(scope='session')
+def textCorpus(rawCorpus) -> list[str]:
+    """ rawCorpus as received text chunks (non-printable chars removed) """
+    return [chunk.data().translate(None, NOISE_BYTES + b'\b').decode('ascii') for chunk in rawCorpus]
+
+
+@pytest.fixture(scope='session')
+def textLines(textCorpus) -> list[str]:
+    return ''.join(textCorpus).splitlines()[:5000]
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+import pytest
+
+from multiserialviewer.serial_data.serialDataProcessor import SerialDataProcessor
+
+
+@pytest.mark.parametrize('backspaceDeletesLastLine', [False, True], ids=['noBackspace', 'backspace'])
+@pytest.mark.parametrize('convertToHex', [False, True], ids=['noHex', 'hex'])
+@pytest.mark.parametrize('insertTimestamp', [False, True], ids=['noTimestamp', 'timestamp'])
+def test_handleRawData(benchmark, rawCorpus, insertTimestamp, convertToHex, backspaceDeletesLastLine):
+    processor = SerialDataProcessor()
+    processor.setConvertNonPrintableCharsToHex(convertToHex)
+    processor.setBackspaceDeletesLastLine(backspaceDeletesLastLine)
+    processor.setShowTimestampAtLineStart(insertTimestamp, '[%H:%M:%S.%f] ')
+    output = []
+    processor.signal_asciiDataAvailable.connect(output.append)
+    rxTime = datetime(2025, 1, 1, 12, 0, 0)
+
+    def processCorpus():
+        output.clear()
+        for chunk in rawCorpus:
+            processor.handleRawData(rxTime, chunk)
+
+    benchmark(processCorpus)
+    assert len(output) > 0
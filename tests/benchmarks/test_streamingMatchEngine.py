@@ -0,0 +1,37 @@
+import pytest
+
+from multiserialviewer.serial_data.streamingMatchEngine import StreamingMatchEngine
+
+
+def createPatterns(count: int) -> list[tuple[str, str]]:
+    """ Returns count watch/counter patterns; a few of them match the corpus, the others (like most) are rare """
+    patterns = [('temp', r'temp[\s:=]+(-?\d+(?:\.\d+)?)'),
+                ('state', r'state[\s:=]+(on|off|idle)'),
+                ('error', r'(ERROR)'),
+                ('voltage', r'voltage: (-?\d+\.\d)')]
+    index = 0
+    while len(patterns) < count:
+        patterns.append((f'var{index}', rf'var{index}[\s:=]+(\d+)'))
+        index += 1
+    return patterns[:count]
+
+
+@pytest.mark.parametrize('patternCount', [1, 10, 50, 200])
+def test_processBytesFromStream(benchmark, qapp, textCorpus, patternCount):
+    output = []
+
+    def createEngine():
+        # a new engine every round, otherwise the pending timeouts of the previous round are processed
+        engine = StreamingMatchEngine()
+        for name, pattern in createPatterns(patternCount):
+            engine.addPattern(name, pattern).signal_textExtracted.connect(
+                lambda name, groups: output.append(groups))
+        return (engine,), {}
+
+    def processCorpus(engine: StreamingMatchEngine):
+        for chunk in textCorpus:
+            engine.processBytesFromStream(chunk)
+        engine.processTimeout()
+
+    benchmark.pedantic(processCorpus, setup=createEngine, rounds=5)
+    assert len(output) > 0
@@ -0,0 +1,27 @@
+import pytest
+from PySide6.QtGui import QTextDocument
+
+from multiserialviewer.settings.textHighlighterSettings import TextHighlighterSettings
+from multiserialviewer.text_highlighter.textHighlighter import TextHighlighter
+
+
+def createSettings(count: int) -> list[TextHighlighterSettings]:
+    patterns = [r'ERROR', r'WARNING', r'temp: -?\d+\.\d', r'state: \w+', r'\[\d{5}\]']
+    settings = []
+    for index in range(count):
+        setting = TextHighlighterSettings()
+        setting.pattern = patterns[index] if index < len(patterns) else rf'\bword{index}\b'
+        settings.append(setting)
+    return settings
+
+
+@pytest.mark.parametrize('ruleCount', [1, 10, 100])
+def test_highlightBlock(benchmark, qapp, textLines, ruleCount):
+    document = QTextDocument('\n'.join(textLines[:2000]))
+    highlighter = TextHighlighter()
+    highlighter.setSettings(createSettings(ruleCount))
+    highlighter.setDocument(document)
+
+    # rehighlight calls highlightBlock for every block of the document
+    benchmark(highlighter.rehighlight)
+    assert any(len(document.findBlockByNumber(number).layout().formats()) > 0 for number in range(100))
@@ -0,0 +1,34 @@
+from multiserialviewer.application.watchHandler import WatchHandler
+from multiserialviewer.serial_data.streamingMatchEngine import StreamingMatchEngine
+from multiserialviewer.settings.watchSettings import WatchSettings
+
+
+def test_setWatchValueAndFlush(benchmark, qapp):
+    settings = []
+    for index in range(10):
+        settings.append(WatchSettings(f'number{index}', '', WatchSettings.VariableType.number, r'(\d+)'))
+        settings.append(WatchSettings(f'word{index}', 'on off idle', WatchSettings.VariableType.word, r'(\w+)'))
+    # the values are set in the handler (processing thread), the model of the GUI gets snapshots
+    handler = WatchHandler(settings, StreamingMatchEngine())
+    updates = [(f'number{index % 10}', [f'{index * 0.5:.1f}']) if index % 2 == 0 else
+               (f'word{index % 10}', [('on', 'off', 'idle')[index % 3]]) for index in range(10000)]
+
+    def setValues():
+        for name, value in updates:
+            handler.setWatchValue(name, value)
+        handler.flush()
+
+    benchmark(setValues)
+    assert sum(entry.updateCount for entry in handler.entries) % len(updates) == 0
+
+
+def test_createAndRemoveWatches(benchmark, qapp):
+    settings = [WatchSettings(f'number{index}', '', WatchSettings.VariableType.number, r'(\d+)') for index in range(500)]
+    handler = WatchHandler([], StreamingMatchEngine())
+
+    def createAndRemove():
+        handler.createWatches(settings)
+        handler.removeWatchesByIndex(list(range(len(settings))))
+
+    benchmark(createAndRemove)
+    assert len(handler.entries) == 0
@@ -0,0 +1,18 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+DEV_TOOL_DIR = Path(__file__).parents[2] / 'devTool'
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='requires pseudo terminals')
+def test_benchmarkRunsWithoutSerialHardware():
+    result = subprocess.run([sys.executable, str(DEV_TOOL_DIR / 'benchmarkEndToEnd.py'), '--offscreen',
+                             '--ports', '2', '--mix', 'mixed', '--line-rate', '200', '--duration', '1', '--fail-on-loss'],
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert '2 ports, mix mixed' in result.stdout
+    assert 'displayed lines measured' in result.stdout
@@ -0,0 +1,115 @@
+from array import array
+from PySide6.QtCore import Qt
+
+from multiserialviewer.gui_viewer.plotCanvas import PlotCanvas, PlotSeries
+from multiserialviewer.gui_viewer.plotWidget import PlotWidget
+from multiserialviewer.application.watchTableModel import WatchTableModel, WatchEntryNumber, WatchEntryWord
+
+
+def createSeries(times: list[float], values: list[float]) -> PlotSeries:
+    series = PlotSeries()
+    series.addSamples(array('d', times), array('d', values))
+    return series
+
+
+def test_bucketsKeepFirstMinMaxLast():
+    series = createSeries([0.0, 0.1, 0.2, 0.3, 1.0, 1.5, 2.2], [5, -3, 9, 1, 2, 4, 7])
+    series.updateBuckets(1.0, 0.0)
+    assert list(series.bucketIndices) == [0, 1, 2]
+    assert list(series.firsts) == [5, 2, 7]
+    assert list(series.mins) == [-3, 2, 7]
+    assert list(series.maxs) == [9, 4, 7]
+    assert list(series.lasts) == [1, 4, 7]
+
+
+def test_bucketsAreUpdatedIncrementally():
+    times = [index * 0.01 for index in range(1000)]
+    values = [float((index * 37) % 101) for index in range(1000)]
+    incremental = createSeries(times[:500], values[:500])
+    incremental.updateBuckets(0.25, 0.0)
+    incremental.addSamples(array('d', times[500:]), array('d', values[500:]))
+    incremental.updateBuckets(0.25, 0.0)
+
+    complete = createSeries(times, values)
+    complete.updateBuckets(0.25, 0.0)
+    for name in ('bucketIndices', 'firsts', 'mins', 'maxs', 'lasts'):
+        assert getattr(incremental, name) == getattr(complete, name)
+
+
+def test_bucketsBeforeTheWindowAreDropped():
+    series = createSeries([float(second) for second in range(100)], [float(second) for second in range(100)])
+    series.updateBuckets(1.0, 89.5)
+    assert list(series.bucketIndices) == list(range(89, 100))
+    # wider buckets are merged
+    series.updateBuckets(2.0, 89.5)
+    assert list(series.bucketIndices) == list(range(44, 50))
+    assert list(series.mins) == [89.0, 90.0, 92.0, 94.0, 96.0, 98.0]
+    assert list(series.maxs) == [89.0, 91.0, 93.0, 95.0, 97.0, 99.0]
+    # the dropped buckets and narrower buckets need the samples again
+    assert not series.needsSamples(2.0, 90.0)
+    assert series.needsSamples(2.0, 80.0)
+    assert series.needsSamples(2.0, None)
+    assert series.needsSamples(1.0, 90.0)
+
+
+def test_samplesAreReplaced():
+    series = createSeries([float(second) for second in range(100)], [float(second) for second in range(100)])
+    series.updateBuckets(2.0, 89.5)
+    series.setSamples(array('d', [80.0, 81.0]), array('d', [1.0, 2.0]), 80.0)
+    assert not series.needsSamples(1.0, 80.0)
+    series.updateBuckets(1.0, 80.0)
+    assert list(series.bucketIndices) == [80, 81]
+    assert series.getBucketSeconds() == 1.0
+    assert (series.firstTime, series.lastTime) == (80.0, 81.0)
+
+
+def test_bucketsOfHiddenSeriesAreLimited():
+    series = createSeries([0.0], [0.0])
+    series.updateBuckets(1.0, 0.0)
+    count = 2 * PlotSeries.MAX_BUCKETS
+    series.addSamples(array('d', [float(second) for second in range(1, count)]), array('d', [1.0] * (count - 1)))
+    assert len(series.bucketIndices) <= PlotSeries.MAX_BUCKETS
+    assert series.getBucketSeconds() == 2.0
+
+
+def test_bucketWidthDependsOnPixelsOnly():
+    assert PlotCanvas.getBucketSeconds(10.0, 1000) == 2.0 ** -6
+    assert PlotCanvas.getBucketSeconds(3600.0, 500) == 8.0
+
+
+def test_plotWidget(qtbot):
+    model = WatchTableModel()
+    model.setRows((WatchEntryNumber('temp', r'(\d+)').createRow(),
+                   WatchEntryWord('state', 'on off', r'(\w+)').createRow(),
+                   WatchEntryNumber('speed', r'(\d+)').createRow()))
+    widget = PlotWidget(None)
+    qtbot.addWidget(widget)
+    widget.setWatchTableModel(model)
+    assert widget.widget.lw_watches.count() == 2
+    assert widget.canvas.visibleSeries == ['temp', 'speed']
+
+    requests = []
+    widget.canvas.signal_samplesRequested.connect(requests.append)
+    widget.addSamples({'temp': (array('d', [1.0, 2.0]), array('d', [3.0, 4.0]))})
+    assert widget.canvas.series['temp'].hasSamples()
+    widget.resize(400, 300)
+    widget.show()
+    qtbot.waitExposed(widget)
+    # drawn by the redraw timer
+    qtbot.waitUntil(lambda: len(widget.canvas.series['temp'].bucketIndices) == 2, timeout=1000)
+
+    assert requests == []
+
+    # a larger window than the default window (1 min) needs the samples of the dropped buckets
+    widget.addSamples({'temp': (array('d', [100.0]), array('d', [5.0]))})
+    qtbot.waitUntil(lambda: len(widget.canvas.series['temp'].bucketIndices) == 1, timeout=1000)
+    widget.widget.cb_timeWindow.setCurrentText('All')
+    qtbot.waitUntil(lambda: requests == [None], timeout=1000)
+    widget.setSamples({'temp': (array('d', [1.0, 2.0, 100.0]), array('d', [3.0, 4.0, 5.0]))})
+    qtbot.waitUntil(lambda: len(widget.canvas.series['temp'].bucketIndices) == 3, timeout=1000)
+
+    widget.widget.lw_watches.item(0).setCheckState(Qt.CheckState.Unchecked)
+    assert widget.canvas.visibleSeries == ['speed']
+
+    widget.clear()
+    assert not widget.canvas.series['temp'].hasSamples()
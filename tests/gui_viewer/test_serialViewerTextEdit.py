@@ -0,0 +1,88 @@
+from multiserialviewer.gui_viewer.serialViewerTextEdit import SerialViewerTextEdit
+from multiserialviewer.icons.iconSet import IconSet
+
+
+def createTextEdit(qtbot) -> SerialViewerTextEdit:
+    textEdit = SerialViewerTextEdit(None)
+    textEdit.setIconSet(IconSet('google', '434343'))
+    qtbot.addWidget(textEdit)
+    return textEdit
+
+
+def test_oldestLinesAreRemoved(qtbot):
+    textEdit = createTextEdit(qtbot)
+    textEdit.setScrollbackLimit(100)
+
+    for index in range(1000):
+        textEdit.appendData(f'line {index}\n', scrollToBottom=True)
+
+    document = textEdit.document()
+    assert 100 <= document.blockCount() <= 110
+    assert document.lastBlock().previous().text() == 'line 999'
+
+
+def test_removedLinesAreEmitted(qtbot):
+    textEdit = createTextEdit(qtbot)
+    textEdit.setScrollbackLimit(100, emitRemovedText=True)
+    removedText = []
+    textEdit.signal_textRemoved.connect(removedText.append)
+
+    lines = [f'line {index}\n' for index in range(1000)]
+    for line in lines:
+        textEdit.appendData(line, scrollToBottom=False)
+
+    assert ''.join(removedText) + textEdit.toPlainText() == ''.join(lines)
+
+
+def test_removedLinesAreNotEmittedWhenDisabled(qtbot):
+    textEdit = createTextEdit(qtbot)
+    textEdit.setScrollbackLimit(100)
+
+    with qtbot.assertNotEmitted(textEdit.signal_textRemoved):
+        for index in range(1000):
+            textEdit.appendData(f'line {index}\n', scrollToBottom=False)
+
+
+def test_messageIsRemovedAsAWhole(qtbot):
+    textEdit = createTextEdit(qtbot)
+    textEdit.setScrollbackLimit(10)
+
+    textEdit.appendStartMessage('Opened ttyUSB0', scrollToBottom=True)
+    for index in range(20):
+        textEdit.appendData(f'line {index}\n', scrollToBottom=True)
+        text = textEdit.toPlainText()
+        # either the whole message (timestamp and text) is displayed or nothing of it
+        assert ('Opened ttyUSB0' in text) == (':\n' in text)
+
+    text = textEdit.toPlainText()
+    assert 'Opened ttyUSB0' not in text
+    assert text.startswith('line ')
+
+
+def test_oldestLinesAreRemovedByCharacterLimit(qtbot):
+    textEdit = createTextEdit(qtbot)
+    textEdit.setScrollbackLimit(0, maxCharacters=10000)
+
+    for index in range(1000):
+        textEdit.appendData(f'line {index:04}' + 'x' * 90 + '\n', scrollToBottom=True)
+
+    document = textEdit.document()
+    assert 10000 - 100 <= document.characterCount() <= 11000
+    # only whole lines are removed
+    assert document.firstBlock().text().startswith('line ')
+    assert document.lastBlock().previous().text().startswith('line 0999')
+
+
+def test_lineWithoutLineBreakIsCut(qtbot):
+    textEdit = createTextEdit(qtbot)
+    textEdit.setScrollbackLimit(100, maxCharacters=10000, emitRemovedText=True)
+    removedText = []
+    textEdit.signal_textRemoved.connect(removedText.append)
+
+    chunks = [f'{index:04}' * 25 for index in range(1000)]
+    for chunk in chunks:
+        textEdit.appendData(chunk, scrollToBottom=True)
+
+    assert textEdit.document().blockCount() == 1
+    assert textEdit.document().characterCount() <= 11000
+    assert ''.join(removedText) + textEdit.toPlainText() == ''.join(chunks)
@@ -0,0 +1,45 @@
+import pytest
+
+from multiserialviewer.gui_viewer.textStagingBuffer import TextStagingBuffer
+
+
+def test_textIsMerged(qtbot):
+    buffer = TextStagingBuffer()
+
+    with qtbot.waitSignal(buffer.signal_dataPending, timeout=300):
+        buffer.appendText('abc')
+    with qtbot.assertNotEmitted(buffer.signal_dataPending):
+        buffer.appendText('\ndef')
+        buffer.appendText('ghi')
+    assert buffer.takeAll() == (False, 'abc\ndefghi', 3)
+    assert buffer.takeAll() == (False, '', 0)
+
+
+def test_deleteLastLineOfStagedText():
+    buffer = TextStagingBuffer()
+
+    buffer.appendText('abc\r\nde')
+    buffer.appendText('f')
+    buffer.deleteLastLine()
+    buffer.appendText('xyz')
+    assert buffer.takeAll() == (False, 'abc\r\nxyz', 4)
+
+
+def test_deleteLastLineEndingWithCarriageReturn():
+    buffer = TextStagingBuffer()
+
+    buffer.appendText('abc\n')
+    buffer.appendText('def\rgh')
+    buffer.appendText('i')
+    buffer.deleteLastLine()
+    assert buffer.takeAll() == (False, 'abc\ndef\r', 4)
+
+
+def test_deleteLastLineOfDisplayedText():
+    buffer = TextStagingBuffer()
+
+    buffer.appendText('abc')
+    buffer.deleteLastLine()
+    buffer.deleteLastLine()
+    buffer.appendText('xyz')
+    assert buffer.takeAll() == (True, 'xyz', 4)
@@ -0,0 +1,67 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from multiserialviewer.settings.settings import Settings
+from multiserialviewer.settings.serialViewerSettings import SerialViewerSettings
+from multiserialviewer.settings.counterSettings import CounterSettings
+from multiserialviewer.settings.watchSettings import WatchSettings
+
+
+def test_noWidgetsAreImported():
+    code = ('import sys\n'
+            'import multiserialviewer.headless.__main__\n'
+            'print([name for name in sys.modules if name.startswith(("PySide6.QtWidgets", "PySide6.QtGui"))])\n')
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, timeout=60)
+    assert result.stdout.strip() == '[]'
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='requires a pseudo terminal')
+def test_captureToFiles(tmp_path):
+    pty = pytest.importorskip('pty')
+    tty = pytest.importorskip('tty')
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    portName = os.ttyname(slave)
+
+    configDir = tmp_path / 'config'
+    outputDir = tmp_path / 'output'
+    configDir.mkdir()
+    outputDir.mkdir()
+    settings = Settings(str(configDir))
+    serialViewerSettings = SerialViewerSettings()
+    serialViewerSettings.connection.portName = portName
+    serialViewerSettings.connection.baudrate = 115200
+    serialViewerSettings.counters = [CounterSettings('ERROR')]
+    serialViewerSettings.watches = [WatchSettings('temp', '', WatchSettings.VariableType.number, r'(\d+)')]
+    settings.serialViewer.entries.append(serialViewerSettings)
+    settings.saveSettings()
+
+    environment = dict(os.environ, XDG_STATE_HOME=str(tmp_path / 'state'))
+    process = subprocess.Popen([sys.executable, '-m', 'multiserialviewer.headless',
+                                '--config-dir', str(configDir), '--output-dir', str(outputDir)], env=environment)
+    fileBaseName = portName.strip('/').replace('/', '_')
+    valuesFile = outputDir / f'{fileBaseName}_values.log'
+    try:
+        deadline = time.monotonic() + 20
+        while not (valuesFile.exists() and 'Opened' in valuesFile.read_text()) and time.monotonic() < deadline:
+            time.sleep(0.1)
+        os.write(master, b'temp: 21\nERROR\ntemp: 22\nERROR\nend\n')
+        time.sleep(1)
+        process.send_signal(signal.SIGINT)
+        assert process.wait(timeout=20) == 0
+    finally:
+        if process.poll() is None:
+            process.kill()
+        os.close(slave)
+        os.close(master)
+
+    assert (outputDir / f'{fileBaseName}.log').read_text() == 'temp: 21\nERROR\ntemp: 22\nERROR\nend\n'
+    values = valuesFile.read_text()
+    assert 'watch temp = 21\n' in values
+    assert 'watch temp = 22\n' in values
+    assert 'counter ERROR = 2\n' in values
@@ -0,0 +1,48 @@
+from multiserialviewer.serial_data.deadlineScheduler import DeadlineScheduler
+
+
+def test_functionsAreCalledInOrderOfDeadline(qtbot):
+    scheduler = DeadlineScheduler()
+    calls = []
+
+    scheduler.schedule(lambda: calls.append('late'), 60)
+    scheduler.schedule(lambda: calls.append('early'), 20)
+    qtbot.waitUntil(lambda: len(calls) == 2, timeout=500)
+    assert calls == ['early', 'late']
+
+
+def test_rescheduleDelaysCall(qtbot):
+    scheduler = DeadlineScheduler()
+    calls = []
+    function = lambda: calls.append('called')
+
+    scheduler.schedule(function, 100)
+    qtbot.wait(60)
+    scheduler.schedule(function, 100)
+    qtbot.wait(60)
+    assert calls == []
+    assert scheduler.isScheduled(function)
+    qtbot.waitUntil(lambda: calls == ['called'], timeout=500)
+    assert not scheduler.isScheduled(function)
+
+
+def test_rescheduleWithEarlierDeadline(qtbot):
+    scheduler = DeadlineScheduler()
+    calls = []
+    function = lambda: calls.append('called')
+
+    scheduler.schedule(function, 5000)
+    scheduler.schedule(function, 10)
+    qtbot.waitUntil(lambda: calls == ['called'], timeout=500)
+
+
+def test_canceledFunctionIsNotCalled(qtbot):
+    scheduler = DeadlineScheduler()
+    calls = []
+    function = lambda: calls.append('called')
+
+    scheduler.schedule(function, 20)
+    scheduler.cancel(function)
+    qtbot.wait(100)
+    assert calls == []
+    assert not scheduler.isScheduled(function)
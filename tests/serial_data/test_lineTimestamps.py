@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from PySide6.QtSerialPort import QSerialPort
+
+from multiserialviewer.serial_data.lineTimestamps import LineTimestamps
+from multiserialviewer.serial_data.serialDataStatistics import Translator
+from multiserialviewer.settings.serialConnectionSettings import SerialConnectionSettings
+
+
+def test_frameDuration():
+    settings = SerialConnectionSettings()
+    settings.baudrate = 115200
+    assert Translator.frameDurationNs(settings) == round(10 * 1e9 / 115200)
+
+    settings.parity = QSerialPort.Parity.EvenParity
+    settings.stopBits = QSerialPort.StopBits.TwoStop
+    assert Translator.frameDurationNs(settings) == round(12 * 1e9 / 115200)
+
+
+def test_lineStartsAreEstimatedFromBytePosition():
+    # 'ab\n' 'cd\n' 'ef' received at 1000000 ns, 100 ns per byte
+    timestamps = LineTimestamps.estimate(b'ab\ncd\nef', datetime.now(), 1000000, 100, True)
+
+    assert list(timestamps.lineStarts) == [0, 3, 6]
+    assert list(timestamps.startTimesNs) == [1000000 - 700, 1000000 - 400, 1000000 - 100]
+    assert timestamps.chunkSize == 8
+
+
+def test_continuedLineAndPreviousRead():
+    timestamps = LineTimestamps.estimate(b'end of line\nnext\n', datetime.now(), 1000000, 100, False,
+                                         previousRxTimeNs=999900)
+
+    # the continued line is not contained, nothing was received before the previous read
+    assert list(timestamps.lineStarts) == [12]
+    assert list(timestamps.startTimesNs) == [999900]
+
+
+def test_carriageReturnEndsLine():
+    # like SerialDataProcessor, '\r' and '\n' end a line
+    timestamps = LineTimestamps.estimate(b'ab\rcd\r\nef', datetime.now(), 1000000, 100, False)
+
+    assert list(timestamps.lineStarts) == [3, 6, 7]
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from PySide6.QtCore import QByteArray
+
+from multiserialviewer.serial_data.rawDataRecorder import RawDataRecorder, RawDataFile
+
+
+def test_recordedChunksCanBeRead(qtbot, tmp_path):
+    recorder = RawDataRecorder(str(tmp_path), 'dev_ttyUSB0')
+    recorder.setEnabled(True)
+    startTime = datetime(2024, 5, 17, 10, 30, 0, 123456)
+    chunks = [(startTime + timedelta(milliseconds=index), bytes([index, 0, 255]) * index) for index in range(50)]
+
+    for rxTime, data in chunks:
+        recorder.handleRawData(rxTime, QByteArray(data))
+    recorder.close()
+
+    assert Path(recorder.getFilePath()).name.startswith('dev_ttyUSB0_')
+    assert list(RawDataFile.readRecords(recorder.getFilePath())) == chunks
+
+
+def test_dataIsNotRecordedWhenDisabled(qtbot, tmp_path):
+    recorder = RawDataRecorder(str(tmp_path), 'port')
+    recorder.handleRawData(datetime.now(), QByteArray(b'data'))
+    recorder.close()
+
+    assert recorder.getFilePath() is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_newFileWhenFileIsFull(qtbot, tmp_path, monkeypatch):
+    monkeypatch.setattr(RawDataRecorder, 'MAX_FILE_SIZE', 100)
+    recorder = RawDataRecorder(str(tmp_path), 'port')
+    recorder.setEnabled(True)
+    rxTime = datetime(2024, 5, 17, 10, 30)
+
+    for index in range(10):
+        recorder.handleRawData(rxTime, QByteArray(b'x' * 40))
+    recorder.close()
+
+    files = sorted(tmp_path.iterdir())
+    assert len(files) == 5
+    assert sum(len(list(RawDataFile.readRecords(str(file)))) for file in files) == 10
+
+
+def test_pendingDataIsLimited(qtbot, tmp_path, monkeypatch):
+    monkeypatch.setattr(RawDataRecorder, 'MAX_PENDING_BYTES', 1000)
+    recorder = RawDataRecorder(str(tmp_path), 'port')
+    recorder.setEnabled(True)
+
+    with qtbot.waitSignal(recorder.signal_errorOccurred, timeout=100):
+        for index in range(20):
+            recorder.handleRawData(datetime.now(), QByteArray(b'x' * 88))
+    recorder.close()
+
+    # 10 records of 100 bytes (header and data) fit into the pending buffer
+    assert len(list(RawDataFile.readRecords(recorder.getFilePath()))) == 10
+    assert recorder.getDroppedBytes() == 10 * 88
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+import time
+
+import pytest
+from PySide6.QtCore import QByteArray, QThread, Qt
+
+from multiserialviewer.serial_data.rawDataRecorder import RawDataRecorder
+from multiserialviewer.serial_data.rawDataReplaySource import RawDataReplaySource
+from multiserialviewer.settings.serialConnectionSettings import SerialConnectionSettings
+
+
+START_TIME = datetime(2024, 5, 17, 10, 30)
+
+
+@pytest.fixture
+def recording(qtbot, tmp_path) -> tuple[str, list[tuple[datetime, bytes]]]:
+    # 20 chunks within 380 ms
+    chunks = [(START_TIME + timedelta(milliseconds=20 * index), f'line {index}\n'.encode()) for index in range(20)]
+    recorder = RawDataRecorder(str(tmp_path), 'port')
+    recorder.setEnabled(True)
+    for rxTime, data in chunks:
+        recorder.handleRawData(rxTime, QByteArray(data))
+    recorder.close()
+    return recorder.getFilePath(), chunks
+
+
+def replay(qtbot, filePath: str, speed: float) -> tuple[list[tuple[datetime, bytes]], float]:
+    source = RawDataReplaySource(SerialConnectionSettings(filePath), filePath, speed)
+    thread = QThread()
+    source.moveToThread(thread)
+    thread.start()
+    received = []
+    source.signal_rawDataAvailable.connect(lambda rxTime, data: received.append((rxTime, bytes(data))),
+                                           type=Qt.ConnectionType.DirectConnection)
+
+    startTime = time.monotonic()
+    assert source.openPort() == (True, 'NoError')
+    qtbot.waitUntil(source.isFinished, timeout=5000)
+    duration = time.monotonic() - startTime
+    source.closePort()
+    assert not source.portIsOpen()
+    thread.quit()
+    thread.wait()
+    return received, duration
+
+
+def test_replayWithRecordedTiming(qtbot, recording):
+    filePath, chunks = recording
+    received, duration = replay(qtbot, filePath, 1.0)
+    assert received == chunks
+    assert duration >= 0.38
+
+
+def test_replayFaster(qtbot, recording):
+    filePath, chunks = recording
+    received, duration = replay(qtbot, filePath, 4.0)
+    assert received == chunks
+    assert 0.095 <= duration < 0.38
+
+
+def test_replayAsFastAsPossible(qtbot, recording):
+    filePath, chunks = recording
+    received, duration = replay(qtbot, filePath, RawDataReplaySource.AS_FAST_AS_POSSIBLE)
+    assert received == chunks
+    assert duration < 0.2
+
+
+def test_replayIsPausedWhileChunksArePending(qtbot, recording):
+    filePath, chunks = recording
+    source = RawDataReplaySource(SerialConnectionSettings(filePath), filePath, RawDataReplaySource.AS_FAST_AS_POSSIBLE)
+    source.setMaxPendingChunks(4)
+    received = []
+    source.signal_rawDataAvailable.connect(lambda rxTime, data: received.append((rxTime, bytes(data))))
+
+    assert source.openPort() == (True, 'NoError')
+    qtbot.wait(50)
+    assert len(received) == 4 and source.getPendingChunkCount() == 4
+
+    # continued when half of the pending chunks are processed
+    source.handleChunkProcessed()
+    qtbot.wait(50)
+    assert len(received) == 4
+    source.handleChunkProcessed()
+    qtbot.waitUntil(lambda: len(received) == 6, timeout=1000)
+
+    while not source.isFinished():
+        source.handleChunkProcessed()
+        qtbot.wait(1)
+    assert received == chunks
+    source.closePort()
+
+
+def test_openNonExistingFile(qtbot, tmp_path):
+    filePath = str(tmp_path / 'missing.msvraw')
+    source = RawDataReplaySource(SerialConnectionSettings(filePath), filePath)
+    assert source.openPort() == (False, 'DeviceNotFoundError')
+    assert not source.portIsOpen()
@@ -0,0 +1,148 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from PySide6.QtCore import QByteArray
+
+from multiserialviewer.serial_data.serialDataProcessor import SerialDataProcessor
+from multiserialviewer.serial_data.lineTimestamps import LineTimestamps
+from multiserialviewer.settings.applicationSettings import ApplicationSettings
+
+
+class ByteLoopProcessor:
+    """ Byte by byte implementation of SerialDataProcessor.handleRawData (previous version). """
+
+    def __init__(self, convertToHex: bool, backspaceDeletesLastLine: bool, insertTimestamp: bool, timestampFormat: str):
+        self.convertToHex = convertToHex
+        self.backspaceDeletesLastLine = backspaceDeletesLastLine
+        self.insertTimestamp = insertTimestamp
+        self.timestampFormat = timestampFormat
+        self.lastReceivedChar = None
+        self.output = []
+
+    def handleRawData(self, rxTime: datetime, data: bytes):
+        nonPrintableCharsCount = 0
+        asciiData = ''
+        for b in data:
+            if self.insertTimestamp:
+                if self.lastReceivedChar in (0x0D, 0x0A):
+                    asciiData += rxTime.strftime(self.timestampFormat)
+                self.lastReceivedChar = b
+
+            if 32 <= b <= 126 or b in (0x0D, 0x0A):
+                asciiData += chr(b)
+            elif self.backspaceDeletesLastLine and b == 0x08:
+                if len(asciiData) > 0:
+                    self.output.append(('text', asciiData))
+                    asciiData = ''
+                self.output.append(('deleteLine',))
+            elif self.convertToHex:
+                nonPrintableCharsCount += 1
+                asciiData += f'[{b:02X}]'
+
+        if len(asciiData) > 0:
+            self.output.append(('text', asciiData))
+        if nonPrintableCharsCount > 0:
+            self.output.append(('nonPrintable', nonPrintableCharsCount))
+
+
+def createProcessor(convertToHex: bool, backspaceDeletesLastLine: bool, insertTimestamp: bool, timestampFormat: str):
+    processor = SerialDataProcessor()
+    processor.setConvertNonPrintableCharsToHex(convertToHex)
+    processor.setBackspaceDeletesLastLine(backspaceDeletesLastLine)
+    processor.setShowTimestampAtLineStart(insertTimestamp, timestampFormat)
+
+    output = []
+    processor.signal_asciiDataAvailable.connect(lambda text: output.append(('text', text)))
+    processor.signal_deleteLine.connect(lambda: output.append(('deleteLine',)))
+    processor.signal_numberOfNonPrintableChars.connect(lambda count: output.append(('nonPrintable', count)))
+    return processor, output
+
+
+@pytest.mark.parametrize('convertToHex', [False, True])
+@pytest.mark.parametrize('backspaceDeletesLastLine', [False, True])
+@pytest.mark.parametrize('insertTimestamp', [False, True])
+def test_outputIsIdenticalToByteLoop(convertToHex, backspaceDeletesLastLine, insertTimestamp):
+    rng = random.Random(4711)
+    alphabet = b'abc: 123\r\n\b\x00\x7f\xff'
+    timestampFormat = '[%H:%M:%S.%f] '
+
+    processor, output = createProcessor(convertToHex, backspaceDeletesLastLine, insertTimestamp, timestampFormat)
+    reference = ByteLoopProcessor(convertToHex, backspaceDeletesLastLine, insertTimestamp, timestampFormat)
+
+    for _ in range(500):
+        rxTime = datetime.now()
+        chunk = bytes(rng.choice(alphabet) for _ in range(rng.randint(1, 40)))
+        processor.handleRawData(rxTime, QByteArray(chunk))
+        reference.handleRawData(rxTime, chunk)
+
+    assert output == reference.output
+
+
+def test_timestampAfterEveryLinebreak():
+    rxTime = datetime(2024, 1, 2, 3, 4, 5)
+    processor, output = createProcessor(False, False, True, '%H:%M ')
+
+    processor.handleRawData(rxTime, QByteArray(b'first\r\nsecond\n'))
+    processor.handleRawData(rxTime, QByteArray(b'third'))
+    assert output == [('text', 'first\r03:04 \n03:04 second\n'), ('text', '03:04 third')]
+
+
+def test_backspaceSplitsOutput():
+    processor, output = createProcessor(True, True, False, '')
+
+    processor.handleRawData(datetime.now(), QByteArray(b'abc\bdef\x01\b\b'))
+    assert output == [('text', 'abc'), ('deleteLine',), ('text', 'def[01]'), ('deleteLine',), ('deleteLine',),
+                      ('nonPrintable', 1)]
+
+
+@pytest.mark.parametrize('timestampFormat', ['[%H:%M:%S.%f] ', '[%H:%M:%S] '])
+def test_cachedTimestampChangesWithRxTime(timestampFormat):
+    rng = random.Random(815)
+    processor, output = createProcessor(False, False, True, timestampFormat)
+    reference = ByteLoopProcessor(False, False, True, timestampFormat)
+
+    rxTime = datetime(2024, 1, 2, 3, 4, 5)
+    for _ in range(500):
+        # several chunks with the same rx time, then crossing second boundaries
+        rxTime += timedelta(microseconds=rng.choice([0, 0, 1, 300000]))
+        chunk = bytes(rng.choice(b'ab\r\n') for _ in range(rng.randint(1, 10)))
+        processor.handleRawData(rxTime, QByteArray(chunk))
+        reference.handleRawData(rxTime, chunk)
+
+    assert output == reference.output
+
+
+def test_elapsedMsSinceCaptureStart():
+    processor, output = createProcessor(False, False, True, '')
+    processor.setShowTimestampAtLineStart(True, '', ApplicationSettings.TimestampMode.elapsedMs)
+    startTime = datetime(2024, 1, 2, 3, 4, 5)
+
+    processor.handleRawData(startTime, QByteArray(b'first\n'))
+    processor.handleRawData(startTime + timedelta(microseconds=1500), QByteArray(b'second\n'))
+    processor.restartElapsedTime()
+    processor.handleRawData(startTime + timedelta(seconds=2), QByteArray(b'third\n'))
+    assert output == [('text', 'first\n'), ('text', '[     1.500] second\n'), ('text', '[     0.000] third\n')]
+
+
+def test_lineTimestampsAreInserted():
+    processor, output = createProcessor(False, True, True, '%S.%f ')
+    rxTime = datetime(2024, 1, 2, 3, 4, 5, 900000)
+    # 'a\r' 'b\b' 'c\n' 'd' received at rxTime, 100 ms per byte
+    data = b'a\rb\bc\nd'
+    processor.handleRawData(rxTime - timedelta(seconds=1), QByteArray(b'\n'))
+    output.clear()
+    processor.handleLineTimestamps(LineTimestamps.estimate(data, rxTime, 10 ** 9, 10 ** 8, True))
+    processor.handleRawData(rxTime, QByteArray(data))
+
+    assert output == [('text', '05.300000 a\r05.500000 b'), ('deleteLine',), ('text', 'c\n05.900000 d')]
+
+
+def test_lineTimestampsOfOtherChunkAreIgnored():
+    processor, output = createProcessor(False, False, True, '%S ')
+    rxTime = datetime(2024, 1, 2, 3, 4, 5)
+    processor.handleLineTimestamps(LineTimestamps.estimate(b'a\nb', rxTime - timedelta(seconds=1), 10 ** 9,
+                                                           10 ** 8, True))
+    processor.handleRawData(rxTime, QByteArray(b'a\nb'))
+
+    assert output == [('text', 'a\n05 b')]
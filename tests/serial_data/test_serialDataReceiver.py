@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+
+import pytest
+from PySide6.QtCore import QThread, Qt
+
+from multiserialviewer.serial_data.serialDataReceiver import SerialDataReceiver
+from multiserialviewer.settings.serialConnectionSettings import SerialConnectionSettings
+
+
+@pytest.fixture
+def pseudoTerminal():
+    pty = pytest.importorskip('pty')
+    tty = pytest.importorskip('tty')
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    yield master, os.ttyname(slave)
+    os.close(slave)
+    os.close(master)
+
+
+@pytest.fixture
+def receiverThread():
+    thread = QThread()
+    thread.start()
+    yield thread
+    thread.quit()
+    thread.wait()
+
+
+def createReceiver(portName: str) -> SerialDataReceiver:
+    settings = SerialConnectionSettings()
+    settings.portName = portName
+    return SerialDataReceiver(settings)
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='requires a pseudo terminal')
+def test_dataIsReadWhileGuiThreadIsBusy(qtbot, pseudoTerminal, receiverThread):
+    master, portName = pseudoTerminal
+    receiver = createReceiver(portName)
+    receiver.moveToThread(receiverThread)
+    received = []
+    receiver.signal_rawDataAvailable.connect(lambda rxTime, data: received.append((rxTime, bytes(data))),
+                                             type=Qt.ConnectionType.DirectConnection)
+
+    assert receiver.openPort() == (True, 'NoError')
+    assert receiver.portIsOpen()
+
+    writeTime = time.time()
+    os.write(master, b'data')
+    time.sleep(0.3)  # the GUI thread is busy (e.g. painting)
+
+    assert [data for _, data in received] == [b'data']
+    assert received[0][0].timestamp() - writeTime < 0.15
+
+    receiver.closePort()
+    assert not receiver.portIsOpen()
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='requires a pseudo terminal')
+def test_lineTimestamps(qtbot, pseudoTerminal, receiverThread):
+    master, portName = pseudoTerminal
+    receiver = createReceiver(portName)
+    receiver.setLineTimestampsEnabled(True)
+    receiver.moveToThread(receiverThread)
+    received = []
+    receiver.signal_lineTimestampsAvailable.connect(received.append, type=Qt.ConnectionType.DirectConnection)
+
+    assert receiver.openPort() == (True, 'NoError')
+    writeTimeNs = time.perf_counter_ns()
+    os.write(master, b'first\nsecond\n')
+    qtbot.waitUntil(lambda: sum(timestamps.chunkSize for timestamps in received) == 13)
+    os.write(master, b'third')
+    qtbot.waitUntil(lambda: sum(timestamps.chunkSize for timestamps in received) == 18)
+    receiver.closePort()
+
+    startTimesNs = [t for timestamps in received for t in timestamps.startTimesNs]
+    assert len(startTimesNs) == 3
+    assert writeTimeNs - 100000000 < startTimesNs[0] <= startTimesNs[1] < startTimesNs[2]
+
+
+def test_openNonExistingPort(qtbot, receiverThread):
+    receiver = createReceiver('doesNotExist')
+    receiver.moveToThread(receiverThread)
+
+    opened, msg = receiver.openPort()
+    assert not opened
+    assert msg != 'NoError'
+    assert not receiver.portIsOpen()
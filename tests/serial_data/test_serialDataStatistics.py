@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+
+import pytest
+from PySide6.QtCore import QByteArray
+
+from multiserialviewer.serial_data.serialDataStatistics import SerialDataStatistics
+from multiserialviewer.settings.serialConnectionSettings import SerialConnectionSettings
+
+
+def createStatistics() -> SerialDataStatistics:
+    settings = SerialConnectionSettings()
+    settings.baudrate = 115200
+    return SerialDataStatistics(settings)
+
+
+def test_throughputOfSlidingWindows():
+    statistics = createStatistics()
+    now = datetime.now()
+    # 1000 bytes per second during the last 30 seconds
+    for seconds in range(30, -1, -1):
+        statistics.handleRawData(now - timedelta(seconds=seconds), QByteArray(b'x' * 1000))
+
+    oneSecond, tenSeconds, sixtySeconds = statistics.getThroughput()
+    assert (oneSecond.windowSeconds, tenSeconds.windowSeconds, sixtySeconds.windowSeconds) == (1, 10, 60)
+    assert oneSecond.bytesPerSecond == 1000
+    assert tenSeconds.bytesPerSecond == 1000
+    # the capture started 30 seconds ago (and the first chunk was received within 0.1 seconds)
+    assert sixtySeconds.bytesPerSecond == pytest.approx(31000 / 30, rel=0.01)
+    # 10 bits per byte (start, 8 data and stop bit)
+    assert oneSecond.usagePercent == pytest.approx(100 * 1000 * 10 / 115200, abs=0.01)
+    assert statistics.getMaxUsage() == oneSecond.usagePercent
+    assert statistics.getReceivedBytes() == 31000
+
+    statistics.reset()
+    assert statistics.getThroughput()[0].bytesPerSecond == 0
+    assert statistics.getReceivedBytes() == 0
+
+
+def test_outdatedChunksAreRemoved(monkeypatch):
+    monkeypatch.setattr(SerialDataStatistics, 'TRIM_MIN_CHUNKS', 10)
+    statistics = createStatistics()
+    now = datetime.now()
+    for milliseconds in range(200000, -1, -100):
+        statistics.handleRawData(now - timedelta(milliseconds=milliseconds), QByteArray(b'x' * 10))
+
+    # the removed chunks are still counted
+    assert statistics.getReceivedBytes() == 20010
+    assert statistics.getThroughput()[2].bytesPerSecond == pytest.approx(100, rel=0.01)
+
+
+def test_resetAcceptsEarlierRxTimes():
+    statistics = createStatistics()
+    now = datetime.now()
+    statistics.handleRawData(now, QByteArray(b'x' * 1000))
+    statistics.reset()
+
+    # e.g. a replay, which is started again: 100 bytes per second during the last 11 seconds of the recording
+    for seconds in range(11, 0, -1):
+        statistics.handleRawData(now - timedelta(hours=1, seconds=seconds), QByteArray(b'x' * 100))
+
+    oneSecond, tenSeconds, _ = statistics.getThroughput()
+    assert oneSecond.bytesPerSecond == 100
+    assert tenSeconds.bytesPerSecond == 1000 / 10
+    assert statistics.getMaxUsage() == pytest.approx(100 * 100 * 10 / 115200, abs=0.01)
+
+
+def test_windowIsLimitedToTheCapture(monkeypatch):
+    statistics = createStatistics()
+    now = datetime.now()
+    monotonic = 1000.0
+    monkeypatch.setattr('time.monotonic', lambda: monotonic)
+    # 1000 bytes per second for 5 seconds, the first chunk was received within 1000 * 10 / 115200 seconds
+    for seconds in range(5, -1, -1):
+        statistics.handleRawData(now - timedelta(seconds=seconds), QByteArray(b'x' * 1000))
+    monotonic += 0.5
+
+    captureSeconds = 5.5 + 1000 * 10 / 115200
+    oneSecond, tenSeconds, sixtySeconds = statistics.getThroughput()
+    assert oneSecond.bytesPerSecond == 1000
+    assert tenSeconds.bytesPerSecond == pytest.approx(6000 / captureSeconds, rel=1e-4)
+    assert sixtySeconds.bytesPerSecond == pytest.approx(6000 / captureSeconds, rel=1e-4)
+    assert sixtySeconds.usagePercent == pytest.approx(100 * 6000 * 10 / 115200 / captureSeconds, rel=1e-4)
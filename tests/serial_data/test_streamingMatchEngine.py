@@ -0,0 +1,194 @@
+import random
+import re
+
+import pytest
+
+from multiserialviewer.serial_data.streamingMatchEngine import StreamingMatchEngine
+
+
+class BufferPerPatternExtractor:
+    """ Previous implementation of StreamingTextExtractor (one buffer per pattern), without QTimer. """
+
+    def __init__(self, name: str, pattern: str, output: list):
+        self.name = name
+        self.regex = re.compile(pattern)
+        self.buffer = ''
+        self.timerActive = False
+        self.output = output
+
+    def processBytesFromStream(self, asciiString: str):
+        self.timerActive = False
+        self.buffer += asciiString
+
+        lastPos = 0
+        for match in self.regex.finditer(self.buffer):
+            if (len(self.buffer) - match.end(0)) > 5:
+                self.output.append((self.name, [*match.groups()]))
+                lastPos = match.end(0)
+            else:
+                self.timerActive = True
+                break
+        if lastPos > 0:
+            self.buffer = self.buffer[lastPos:]
+
+        if len(self.buffer) > 5000:
+            self.buffer = self.buffer[2000:]
+
+    def processTimeout(self):
+        if self.timerActive:
+            self.timerActive = False
+            lastPos = 0
+            for match in self.regex.finditer(self.buffer):
+                self.output.append((self.name, [*match.groups()]))
+                lastPos = match.end(0)
+            if lastPos > 0:
+                self.buffer = self.buffer[lastPos:]
+
+
+PATTERNS = [('temp', r'temp[\s:=]+(-?\d+(?:\.\d+)?)'),
+            ('tempInteger', r'temp=(\d+)'),
+            ('state', r'state[\s:=]+(on|off)'),
+            ('rare', r'(\d+)rare'),
+            ('ERROR', r'ERROR'),
+            ('digits', r'\d+'),
+            ('bounded', r'[A-Z]{3}\d'),
+            ('boundedWithLiteral', r'ERROR\d{0,2}'),
+            ('lineStart', r'^v(\d)'),
+            ('lookbehind', r'(?<=x)y+'),
+            ('never', r'does not occur')]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_outputIsIdenticalToBufferPerPattern(seed):
+    rng = random.Random(seed)
+    words = ['temp: ', 'temp=', '-12.5', '3', 'state ', 'on', 'off', 'ERR', 'OR', '\n', 'v7', 'xyy', ' ', 'abc', 'Q']
+
+    output = []
+    engine = StreamingMatchEngine()
+    for name, pattern in PATTERNS:
+        engine.addPattern(name, pattern).signal_textExtracted.connect(lambda n, groups: output.append((n, groups)))
+    referenceOutput = []
+    reference = [BufferPerPatternExtractor(name, pattern, referenceOutput) for name, pattern in PATTERNS]
+
+    for _ in range(2000):
+        if rng.random() < 0.1:
+            engine.processTimeout()
+            for extractor in reference:
+                extractor.processTimeout()
+        else:
+            chunk = ''.join(rng.choice(words) for _ in range(rng.randint(1, 20)))
+            if rng.random() < 0.01:
+                chunk += 'rare'
+            engine.processBytesFromStream(chunk)
+            for extractor in reference:
+                extractor.processBytesFromStream(chunk)
+
+    # the engine processes patterns one after another (like connected extractors)
+    assert sorted(output, key=lambda entry: entry[0]) == sorted(referenceOutput, key=lambda entry: entry[0])
+    assert len(output) > 0
+
+
+@pytest.mark.parametrize('chunkCount', [30, 200])
+def test_bufferOfDormantPatternIsTrimmed(chunkCount):
+    # the pattern does not match for a long time and its match reaches back to the start of its buffer
+    output = []
+    engine = StreamingMatchEngine()
+    engine.addPattern('rare', r'(?<!x)(x*)rare').signal_textExtracted.connect(lambda n, groups: output.append((n, groups)))
+    referenceOutput = []
+    reference = BufferPerPatternExtractor('rare', r'(?<!x)(x*)rare', referenceOutput)
+
+    for chunk in ['x' * 173] * chunkCount + ['rare and some more text']:
+        engine.processBytesFromStream(chunk)
+        reference.processBytesFromStream(chunk)
+
+    assert output == referenceOutput
+    assert len(output) == 1
+
+
+def test_patternsCanBeRemoved(qtbot):
+    engine = StreamingMatchEngine()
+    counter = engine.addPattern('counter', r'counter')
+    error = engine.addPattern('error', r'error')
+    engine.removePattern(counter)
+
+    with qtbot.waitSignal(error.signal_textExtracted, timeout=300) as signal_blocker:
+        engine.processBytesFromStream('counter error counter')
+    assert signal_blocker.args == ['error', []]
+    assert engine.patterns() == [error]
+
+
+def test_patternsCanBeAddedAndRemovedAtOnce(qtbot):
+    engine = StreamingMatchEngine()
+    counter, error, warning = engine.addPatterns([('counter', r'counter'), ('error', r'error'), ('warning', r'warn')])
+    engine.removePatterns([counter, warning])
+
+    with qtbot.waitSignal(error.signal_textExtracted, timeout=300) as signal_blocker:
+        engine.processBytesFromStream('counter warn error counter')
+    assert signal_blocker.args == ['error', []]
+    assert engine.patterns() == [error]
+
+
+@pytest.mark.parametrize('pattern, literal', [(r'temp[\s:=]+(\d+)', 'temp'),
+                                              (r'\d+ms', 'ms'),
+                                              (r'a(bc)d', 'abcd'),
+                                              (r'(ab)+c', 'c'),
+                                              (r'ab|cd', ''),
+                                              (r'(?i)abc', ''),
+                                              (r'a(?i:b)cd', 'cd'),
+                                              (r'[', '')])
+def test_requiredLiteral(pattern, literal):
+    assert StreamingMatchEngine.getRequiredLiteral(pattern) == literal
+
+
+def test_textWithoutMatchIsNotSearchedAgain():
+    engine = StreamingMatchEngine()
+    bounded = engine.addPattern('bounded', r'[A-Z]{3}\d')
+
+    engine.processBytesFromStream('abc ' * 100)
+    engine.processBytesFromStream('ABC')
+    assert bounded.firstPossibleMatchPos() == 403 - 3
+
+
+def test_failedAttemptsOfUnboundedPatternAreNotSearchedAgain(qtbot):
+    engine = StreamingMatchEngine()
+    temp = engine.addPattern('temp', r'temp[\s:=]+(\d+)')
+
+    engine.processBytesFromStream('temp: abc ' + 'x' * 100)
+    # the pattern is not searched until the next literal is received
+    assert temp.firstPossibleMatchPos() == 110
+    assert temp.dormant
+
+    engine.processBytesFromStream('temp: ')
+    assert temp.firstPossibleMatchPos() == 110
+    with qtbot.waitSignal(temp.signal_textExtracted, timeout=300) as signal_blocker:
+        engine.processBytesFromStream('12 and some more text')
+    assert signal_blocker.args == ['temp', ['12']]
+
+
+@pytest.mark.parametrize('pattern, text, incompleteMatchPos',
+                         [(r'temp[\s:=]+(\d+)', 'xx temp: abc temp: ', 13),
+                          (r'temp[\s:=]+(\d+)', 'temp: 12', 0),
+                          (r'state[\s:=]+(on|off)', 'state o', 0),
+                          (r'state[\s:=]+(on|off)', 'state x', 7),
+                          (r'(\d+)rare', 'a 12 b 3456', 7),
+                          (r'(ab)+c', 'xxababa', 2),
+                          (r'a.*b', 'a\nzz', 4),
+                          (r'abc$', 'x', None)])
+def test_incompleteMatchRegex(pattern, text, incompleteMatchPos):
+    regex = StreamingMatchEngine.getIncompleteMatchRegex(pattern)
+    assert (regex.search(text).start() if regex is not None else None) == incompleteMatchPos
+
+
+@pytest.mark.parametrize('pattern, dependsOnTextBeforeMatch, maxMatchLength',
+                         [(r'ERROR', False, 5),
+                          (r'[A-Z]{3}\d{1,2}', False, 5),
+                          (r'temp[\s:=]+(\d+)', False, None),
+                          (r'(a)\1', False, None),
+                          (r'ab(?=c)', False, None),
+                          (r'abc$', False, None),
+                          (r'^abc', True, None),
+                          (r'\babc', True, None),
+                          (r'(?<=x)abc', True, None)])
+def test_patternProperties(pattern, dependsOnTextBeforeMatch, maxMatchLength):
+    assert StreamingMatchEngine.dependsOnTextBeforeMatch(pattern) == dependsOnTextBeforeMatch
+    assert StreamingMatchEngine.getMaxMatchLength(pattern) == maxMatchLength
@@ -0,0 +1,48 @@
+from PySide6.QtCore import QThread, QObject, Signal
+
+from multiserialviewer.serial_data.textSpillWriter import TextSpillWriter
+
+
+class TextSource(QObject):
+    signal_textRemoved: Signal = Signal(str)
+
+
+def test_textIsAppendedInWriterThread(qtbot, tmp_path):
+    spillFilePath = tmp_path / 'ttyUSB0.log'
+    spillFilePath.write_text('old\n')
+    thread = QThread()
+    writer = TextSpillWriter(str(spillFilePath))
+    writer.moveToThread(thread)
+    thread.start()
+    writer.setEnabled(True)
+    source = TextSource()
+    source.signal_textRemoved.connect(writer.writeText)
+
+    for index in range(100):
+        source.signal_textRemoved.emit(f'line {index}\n')
+    writer.close()
+    thread.quit()
+    thread.wait()
+
+    assert spillFilePath.read_text() == 'old\n' + ''.join(f'line {index}\n' for index in range(100))
+
+
+def test_textIsNotWrittenWhenDisabled(qtbot, tmp_path):
+    writer = TextSpillWriter(str(tmp_path / 'port.log'))
+    writer.writeText('line\n')
+    writer.close()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failureIsReportedAndDisablesWriter(qtbot, tmp_path):
+    # a directory cannot be opened as file
+    writer = TextSpillWriter(str(tmp_path))
+    writer.setEnabled(True)
+
+    with qtbot.waitSignal(writer.signal_errorOccurred, timeout=100) as error:
+        writer.writeText('line\n')
+    assert str(tmp_path) in error.args[0]
+    assert not writer.isEnabled()
+    with qtbot.assertNotEmitted(writer.signal_errorOccurred):
+        writer.writeText('line\n')
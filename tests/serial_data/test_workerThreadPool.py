@@ -0,0 +1,69 @@
+from PySide6.QtCore import QThread, QObject, QCoreApplication
+
+from multiserialviewer.serial_data.streamingMatchEngine import StreamingMatchEngine
+from multiserialviewer.serial_data.workerThreadPool import WorkerThreadPool
+
+
+def test_portsAreDistributedOverWorkers(qtbot):
+    pool = WorkerThreadPool(threadCount=2)
+    workers = [pool.acquire(f'port{index}') for index in range(5)]
+
+    assert len(pool.getWorkers()) == 2
+    assert sorted(len(worker.portNames) for worker in pool.getWorkers()) == [2, 3]
+    assert workers[0] is not workers[1]
+
+    for index, worker in enumerate(workers):
+        pool.release(worker, f'port{index}')
+
+
+def test_callInThreadRunsInWorkerThread(qtbot):
+    pool = WorkerThreadPool(threadCount=1)
+    worker = pool.acquire('port')
+    threads = []
+
+    worker.callInThread(lambda: threads.append(QThread.currentThread()))
+    assert threads == [worker.workerThread]
+
+    pool.release(worker, 'port')
+
+
+def test_postToThreadRunsInWorkerThreadInOrder(qtbot):
+    pool = WorkerThreadPool(threadCount=1)
+    worker = pool.acquire('port')
+    calls = []
+
+    for index in range(3):
+        worker.postToThread(lambda index=index: calls.append((index, QThread.currentThread())))
+    # the posted functions are called before a function called later
+    worker.callInThread(lambda: None)
+    assert calls == [(index, worker.workerThread) for index in range(3)]
+
+    pool.release(worker, 'port')
+
+
+def test_detachMovesObjectsToMainThread(qtbot):
+    pool = WorkerThreadPool(threadCount=1)
+    worker = pool.acquire('port')
+    matchEngine = StreamingMatchEngine(worker.deadlineScheduler)
+    other = QObject()
+    for obj in (matchEngine, other):
+        obj.moveToThread(worker.workerThread)
+
+    worker.detach(matchEngine, [matchEngine, other])
+    assert matchEngine.thread() == other.thread() == QCoreApplication.instance().thread()
+
+    pool.release(worker, 'port')
+
+
+def test_workerWithoutPortsIsStoppedAndReused(qtbot):
+    pool = WorkerThreadPool(threadCount=2)
+    worker = pool.acquire('port1')
+    assert worker.workerThread.isRunning()
+
+    pool.release(worker, 'port1')
+    assert not worker.workerThread.isRunning()
+
+    assert pool.acquire('port2') is worker
+    assert worker.workerThread.isRunning()
+    assert len(pool.getWorkers()) == 1
+    pool.release(worker, 'port2')
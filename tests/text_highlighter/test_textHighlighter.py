@@ -0,0 +1,77 @@
+from PySide6.QtGui import QTextDocument, QColor
+
+from multiserialviewer.settings.textHighlighterSettings import TextHighlighterSettings
+from multiserialviewer.text_highlighter.textHighlighter import TextHighlighter
+
+
+def createSetting(pattern: str, color: str) -> TextHighlighterSettings:
+    setting = TextHighlighterSettings()
+    setting.pattern = pattern
+    setting.color_foreground = color
+    return setting
+
+
+def getForegroundColors(document: QTextDocument) -> list[tuple[str, str]]:
+    colors = []
+    for textFormat in document.firstBlock().layout().formats():
+        text = document.firstBlock().text()[textFormat.start:textFormat.start + textFormat.length]
+        colors.append((text, textFormat.format.foreground().color().name()))
+    return colors
+
+
+def test_laterRulesOverrideEarlierRules(qtbot):
+    document = QTextDocument('an ERROR occurred')
+    highlighter = TextHighlighter()
+    highlighter.setSettings([createSetting(r'ERROR \w+', 'red'), createSetting(r'ERROR', 'blue')])
+    highlighter.setDocument(document)
+    highlighter.rehighlight()
+
+    assert getForegroundColors(document) == [('ERROR', QColor('blue').name()), (' occurred', QColor('red').name())]
+
+
+def test_invalidPatternIsIgnored(qtbot):
+    document = QTextDocument('value [1]')
+    highlighter = TextHighlighter()
+    highlighter.setSettings([createSetting(r'[', 'red'), createSetting(r'\[\d\]', 'green')])
+    highlighter.setDocument(document)
+    highlighter.rehighlight()
+
+    assert getForegroundColors(document) == [('[1]', QColor('green').name())]
+
+
+def test_visibleBlocksAreRehighlightedFirst(qtbot):
+    document = QTextDocument('\n'.join(f'line {number} ERROR' for number in range(20000)))
+    highlighter = TextHighlighter()
+    highlighter.setDocument(document)
+    qtbot.wait(10)  # initial (delayed) highlighting without rules
+
+    progress = []
+    highlighter.signal_rehighlightProgress.connect(progress.append)
+    highlighter.setSettings([createSetting(r'ERROR', 'red')])
+    highlighter.rehighlightIncrementally(100, 110)
+
+    assert len(document.findBlockByNumber(105).layout().formats()) == 1
+    assert len(document.findBlockByNumber(0).layout().formats()) == 0
+    assert highlighter.isRehighlighting()
+
+    qtbot.waitUntil(lambda: not highlighter.isRehighlighting(), timeout=10000)
+    assert len(document.findBlockByNumber(0).layout().formats()) == 1
+    assert len(document.lastBlock().layout().formats()) == 1
+    assert progress[0] == 0 and progress[-1] == 100
+    assert progress == sorted(progress)
+
+
+def test_restartedRehighlightUsesNewSettings(qtbot):
+    document = QTextDocument('\n'.join(f'line {number} ERROR' for number in range(5000)))
+    highlighter = TextHighlighter()
+    highlighter.setDocument(document)
+
+    highlighter.setSettings([createSetting(r'ERROR', 'red')])
+    highlighter.rehighlightIncrementally()
+    highlighter.setSettings([createSetting(r'line', 'blue')])
+    highlighter.rehighlightIncrementally()
+
+    qtbot.waitUntil(lambda: not highlighter.isRehighlighting(), timeout=10000)
+    for blockNumber in [0, 2500, 4999]:
+        assert [(textFormat.start, textFormat.length)
+                for textFormat in document.findBlockByNumber(blockNumber).layout().formats()] == [(0, 4)]